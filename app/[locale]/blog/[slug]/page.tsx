@@ -16,6 +16,8 @@ import {
   determineArticleSeries,
 } from '@/lib/geo/schemaGenerator';
 import { generateHreflangAlternates, generateCanonicalUrl } from '@/lib/geo/hreflang';
+import { getHeroPlaceholder, getSocialCards } from '@/lib/heroImages';
+import { getHeroSrc } from '@/lib/heroAssets';
 import type { AISummary as AISummaryType, QAPair, Citation } from '@/types/geo';
 
 // Generate static params for all article pages
@@ -87,6 +89,12 @@ export async function generateMetadata({
   const decodedSlug = decodeURIComponent(slug);
   
   const t = await getTranslations({ locale, namespace: `blog.articles.${decodedSlug}` });
+  const cards = getSocialCards(decodedSlug).map(({ src, width, height }) => ({
+    url: src,
+    width,
+    height,
+    alt: t('title'),
+  }));
   
   return {
     title: t('title'),
@@ -100,7 +108,16 @@ export async function generateMetadata({
       locale: locale === 'zh' ? 'zh_CN' : 'en_US',
       publishedTime: t('date'),
       authors: [t('author')],
+      ...(cards.length > 0 && { images: cards }),
     },
+    ...(cards.length > 0 && {
+      twitter: {
+        card: 'summary_large_image',
+        title: t('title'),
+        description: t('excerpt'),
+        images: [cards[0].url],
+      },
+    }),
     alternates: {
       canonical: generateCanonicalUrl(locale, `blog/${slug}`),
       languages: generateHreflangAlternates({ path: `blog/${slug}` }),
@@ -121,6 +138,7 @@ export default async function BlogArticlePage({
   
   const t = await getTranslations({ locale, namespace: `blog.articles.${decodedSlug}` });
   const common = await getTranslations({ locale, namespace: 'blog' });
+  const heroPlaceholder = getHeroPlaceholder(decodedSlug);
 
   // Get article data
   const aiSummary = t.raw('aiSummary') as AISummaryType | undefined;
@@ -171,9 +189,6 @@ export default async function BlogArticlePage({
 
   return (
     <main className="min-h-screen bg-background text-foreground selection:bg-emerald-500/30 transition-colors duration-300">
-      {/* Preload hero image */}
-      <link rel="preload" as="image" href={`/blog-images/${decodedSlug}-hero.png`} type="image/png" />
-      
       <script
         type="application/ld+json"
         dangerouslySetInnerHTML={{ __html: JSON.stringify(articleJsonLd) }}
@@ -229,15 +244,19 @@ export default async function BlogArticlePage({
             </header>
 
             {/* Featured Image */}
-            <div className="relative h-96 rounded-2xl overflow-hidden mb-12 group bg-gradient-to-br from-blue-500/5 to-purple-500/5">
+            <div
+              className="relative h-96 rounded-2xl overflow-hidden mb-12 group bg-gradient-to-br from-blue-500/5 to-purple-500/5"
+              style={{ backgroundColor: heroPlaceholder.color }}
+            >
               <Image
-                src={`/blog-images/${decodedSlug}-hero.png`}
+                src={getHeroSrc(decodedSlug)}
                 alt={t('title')}
                 fill
+                sizes="(max-width: 896px) 100vw, 896px"
                 className="object-cover group-hover:scale-105 transition-transform duration-700"
                 priority
                 placeholder="blur"
-                blurDataURL="data:image/webp;base64,UklGRiQAAABXRUJQVlA4IBgAAAAwAQCdASoBAAEAAwA0JaQAA3AA/vuUAAA="
+                blurDataURL={heroPlaceholder.blurDataURL}
               />
               {/* 底部渐变遮罩 */}
               <div className="absolute bottom-0 left-0 right-0 h-32 bg-gradient-to-t from-background/80 to-transparent" />
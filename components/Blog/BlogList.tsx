@@ -6,6 +6,7 @@ import { Calendar, Clock, ArrowRight, Tag } from 'lucide-react';
 import Link from 'next/link';
 import Image from 'next/image';
 import { useMemo } from 'react';
+import { getHeroSrc } from '@/lib/heroAssets';
 
 export default function BlogList() {
   const t = useTranslations('blog');
@@ -117,9 +118,10 @@ export default function BlogList() {
                   {/* Featured Image Placeholder */}
                   <div className="relative h-48 overflow-hidden">
                     <Image
-                      src={`/blog-images/${article.id}-hero.png`}
+                      src={getHeroSrc(article.id)}
                       alt={t(`articles.${article.id}.title`)}
                       fill
+                      sizes="(max-width: 768px) 100vw, (max-width: 1024px) 50vw, 33vw"
                       className="object-cover group-hover:scale-110 transition-transform duration-500"
                     />
                     {/* 装饰性渐变遮罩 */}
@@ -0,0 +1,79 @@
+/**
+ * Hero Image Asset Manifest Tests
+ */
+
+jest.mock('@/data/hero-assets.json', () => ({
+  'defi-risk-management': {
+    locale: 'en',
+    hero: {
+      png: { '1920': '/blog-images/defi-risk-management-hero.0123456789ab.png' },
+      webp: { '960': '/blog-images/defi-risk-management-hero-960.bbbbbbbbbbbb.webp' },
+    },
+    cards: { og: '/blog-images/defi-risk-management-og.cccccccccccc.jpg' },
+  },
+}));
+
+import { getCardSrc, getHeroSrc } from '../heroAssets';
+
+describe('getHeroSrc', () => {
+  it('should return the hashed PNG master for a slug in the manifest', () => {
+    expect(getHeroSrc('defi-risk-management')).toBe(
+      '/blog-images/defi-risk-management-hero.0123456789ab.png'
+    );
+  });
+
+  it('should look up a format and width', () => {
+    expect(getHeroSrc('defi-risk-management', 'webp', 960)).toBe(
+      '/blog-images/defi-risk-management-hero-960.bbbbbbbbbbbb.webp'
+    );
+  });
+
+  it('should fall back to the PNG master for formats that are not published', () => {
+    expect(getHeroSrc('defi-risk-management', 'avif', 480)).toBe(
+      '/blog-images/defi-risk-management-hero.0123456789ab.png'
+    );
+    expect(getHeroSrc('no-such-article', 'webp')).toBe('/blog-images/no-such-article-hero.png');
+  });
+});
+
+describe('with an empty manifest', () => {
+  it('should point every image, including the JSON-LD one, at <slug>-hero.png', () => {
+    jest.isolateModules(() => {
+      jest.doMock('@/data/hero-assets.json', () => ({}));
+      const assets = require('../heroAssets');
+      const { generateEnhancedSchema } = require('../geo/schemaGenerator');
+
+      expect(assets.getHeroSrc('defi-risk-management')).toBe(
+        '/blog-images/defi-risk-management-hero.png'
+      );
+      expect(assets.getHeroSrc('defi-risk-management', 'webp', 1920)).toBe(
+        '/blog-images/defi-risk-management-hero.png'
+      );
+
+      const schema = generateEnhancedSchema({
+        slug: 'defi-risk-management',
+        title: 'DeFi Risk Management',
+        description: 'Managing risk in DeFi protocols',
+        category: 'Security',
+        keywords: 'DeFi, risk',
+        author: 'Matrix Lab',
+        datePublished: '2024-12-30',
+        locale: 'en',
+      });
+      expect(schema.image).toBe(
+        'https://develop.matrixlab.work/blog-images/defi-risk-management-hero.png'
+      );
+    });
+  });
+});
+
+describe('getCardSrc', () => {
+  it('should prefer the hashed card and fall back to the given src', () => {
+    expect(getCardSrc('defi-risk-management', 'og', '/blog-images/x-og.jpg')).toBe(
+      '/blog-images/defi-risk-management-og.cccccccccccc.jpg'
+    );
+    expect(getCardSrc('defi-risk-management', 'square', '/blog-images/x-square.jpg')).toBe(
+      '/blog-images/x-square.jpg'
+    );
+  });
+});
@@ -0,0 +1,36 @@
+/**
+ * Hero Image Placeholder Tests
+ */
+
+import heroPlaceholders from '@/data/hero-placeholders.json';
+import { DEFAULT_HERO_PLACEHOLDER, getHeroPlaceholder } from '../heroImages';
+
+describe('getHeroPlaceholder', () => {
+  it('should return the generated placeholder for a known slug', () => {
+    const placeholder = getHeroPlaceholder('web3-security-trends-2025');
+
+    expect(placeholder.blurDataURL).toMatch(/^data:image\/webp;base64,/);
+    expect(placeholder.color).toMatch(/^#[0-9a-f]{6}$/);
+    expect(placeholder).not.toBe(DEFAULT_HERO_PLACEHOLDER);
+  });
+
+  it('should look up Chinese slugs', () => {
+    const placeholder = getHeroPlaceholder('巨鲸的假动作链上数据是如何欺骗你的');
+
+    expect(placeholder).not.toBe(DEFAULT_HERO_PLACEHOLDER);
+  });
+
+  it('should fall back to the default placeholder for unknown slugs', () => {
+    expect(getHeroPlaceholder('no-such-article')).toBe(DEFAULT_HERO_PLACEHOLDER);
+  });
+
+  it('should have a 16:9 size and distinct blur data for every entry', () => {
+    const entries = Object.values(heroPlaceholders);
+    const blurs = new Set(entries.map((entry) => entry.blurDataURL));
+
+    for (const entry of entries) {
+      expect(entry.width * 9).toBe(entry.height * 16);
+    }
+    expect(blurs.size).toBeGreaterThan(1);
+  });
+});
@@ -21,6 +21,7 @@ import type {
   SchemaQuestion,
   SchemaCreativeWorkSeries,
 } from '@/types/geo';
+import { getHeroSrc } from '@/lib/heroAssets';
 
 /**
  * Options for generating enhanced schema
@@ -111,7 +112,7 @@ export function generateEnhancedSchema(
     '@type': 'BlogPosting',
     headline: title,
     description: description,
-    image: `${baseUrl}/blog-images/${slug}-hero.webp`,
+    image: `${baseUrl}${getHeroSrc(slug, 'webp')}`,
     datePublished: ensureISO8601(datePublished),
     dateModified: ensureISO8601(dateModified || datePublished),
     
@@ -0,0 +1,45 @@
+/**
+ * Hero image asset manifest
+ * Content-hashed file names written by `scripts/hero_batch.py --hashed`.
+ * A hashed name never changes its bytes, so nginx serves it as immutable;
+ * articles missing from the manifest fall back to the stable names.
+ */
+
+import heroAssets from '@/data/hero-assets.json';
+
+export type HeroFormat = 'png' | 'webp' | 'avif';
+
+export interface HeroAssetEntry {
+  locale: string | null;
+  // format -> width -> src
+  hero: Partial<Record<HeroFormat, Record<string, string>>>;
+  // social card name -> src
+  cards: Record<string, string>;
+}
+
+// Width of the PNG master and the largest WebP/AVIF rung
+export const HERO_WIDTH = 1920;
+
+const assets = heroAssets as Record<string, HeroAssetEntry>;
+
+export function getHeroAssets(slug: string): HeroAssetEntry | undefined {
+  return assets[slug];
+}
+
+/**
+ * Hero image URL: the hashed name when the manifest has one. Otherwise the
+ * PNG master, the one file every article has (`<slug>-hero.png`, or its
+ * hashed name); WebP/AVIF names are only used once they are published.
+ */
+export function getHeroSrc(slug: string, format: HeroFormat = 'png', width: number = HERO_WIDTH): string {
+  const hero = assets[slug]?.hero;
+  return (
+    hero?.[format]?.[String(width)] ??
+    hero?.png?.[String(HERO_WIDTH)] ??
+    `/blog-images/${slug}-hero.png`
+  );
+}
+
+export function getCardSrc(slug: string, card: string, fallback: string): string {
+  return assets[slug]?.cards[card] ?? fallback;
+}
@@ -0,0 +1,51 @@
+/**
+ * Hero image placeholders
+ * Blur-up thumbnails and average colours generated by scripts/hero_batch.py,
+ * read at build time so every article gets a placeholder that resembles its hero.
+ * Entries also list the article's social cards (og:image / twitter:image).
+ */
+
+import heroPlaceholders from '@/data/hero-placeholders.json';
+import { getCardSrc } from '@/lib/heroAssets';
+
+export interface SocialCard {
+  src: string;
+  width: number;
+  height: number;
+}
+
+export type SocialCardName = 'og' | 'square' | 'portrait';
+
+export interface HeroPlaceholder {
+  blurDataURL: string;
+  color: string;
+  width: number;
+  height: number;
+  cards?: Partial<Record<SocialCardName, SocialCard>>;
+}
+
+// Used for heroes that haven't been rendered yet (1×1 transparent WebP)
+export const DEFAULT_HERO_PLACEHOLDER: HeroPlaceholder = {
+  blurDataURL: 'data:image/webp;base64,UklGRiQAAABXRUJQVlA4IBgAAAAwAQCdASoBAAEAAwA0JaQAA3AA/vuUAAA=',
+  color: '#0f172a',
+  width: 1920,
+  height: 1080,
+};
+
+const placeholders = heroPlaceholders as Record<string, HeroPlaceholder>;
+
+export function getHeroPlaceholder(slug: string): HeroPlaceholder {
+  return placeholders[slug] ?? DEFAULT_HERO_PLACEHOLDER;
+}
+
+// Social cards in the order crawlers should prefer them (1200×630 first)
+const CARD_ORDER: SocialCardName[] = ['og', 'square', 'portrait'];
+
+// Cards point at their hashed names when the asset manifest has them
+export function getSocialCards(slug: string): SocialCard[] {
+  const cards = placeholders[slug]?.cards ?? {};
+  return CARD_ORDER.flatMap((name) => {
+    const card = cards[name];
+    return card ? [{ ...card, src: getCardSrc(slug, name, card.src) }] : [];
+  });
+}
@@ -0,0 +1,37 @@
+"""
+Shared setup for the hero script tests: import the scripts as modules and,
+where the CJK font isn't installed, lay text out with the English one so
+layouts and renders still run (CJK glyphs then measure as .notdef boxes).
+"""
+
+import json
+import os
+import sys
+
+import pytest
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SCRIPTS_DIR)
+
+import draw_text_mixed_fonts  # noqa: E402
+
+if not os.path.exists(draw_text_mixed_fonts.CHINESE_FONT):
+    draw_text_mixed_fonts.CHINESE_FONT = draw_text_mixed_fonts.ENGLISH_FONT
+
+from hero_renderer import SPEC_DIR  # noqa: E402
+
+
+@pytest.fixture
+def spec_dir(tmp_path):
+    """Writable copy of a few real specs; edit(slug, fn) changes one on disk"""
+    for name in ('benign-arbitrage-theory.json', 'defi-risk-management.json'):
+        with open(os.path.join(SPEC_DIR, name), encoding='utf-8') as f:
+            (tmp_path / name).write_text(f.read(), encoding='utf-8')
+    return tmp_path
+
+
+def edit_spec(spec_dir, slug, fn):
+    path = spec_dir / f'{slug}.json'
+    spec = json.loads(path.read_text(encoding='utf-8'))
+    fn(spec)
+    path.write_text(json.dumps(spec, ensure_ascii=False), encoding='utf-8')
@@ -0,0 +1,140 @@
+"""Advances, kerning, line breaking and fitting of mixed CJK/Latin text; the glyph atlas"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import draw_text_mixed_fonts as fonts
+from draw_text_mixed_fonts import (
+    ENGLISH_FONT, NO_BREAK_BEFORE, GlyphAtlas, break_lines, break_tokens, char_advance, fit_text,
+    line_width, load_font, pen_positions,
+)
+
+KERNED = 'AVATAR WAVE To Yo, LTA'
+
+
+@pytest.fixture(autouse=True)
+def fresh_caches():
+    fonts.clear_font_cache()
+    yield
+    fonts.clear_font_cache()
+
+
+@pytest.mark.parametrize('size', [20, 48, 72])
+def test_pen_positions_match_freetype(size):
+    font = load_font(ENGLISH_FONT, size)
+    positions, total = pen_positions(ENGLISH_FONT, size, KERNED)
+    assert total == font.getlength(KERNED)
+    for i, x in enumerate(positions):
+        # where FreeType puts character i: the kerned prefix minus its own advance
+        assert x == font.getlength(KERNED[:i + 1]) - char_advance(ENGLISH_FONT, size, KERNED[i])
+
+
+def test_advance_cache_is_per_character():
+    for n in range(1, len(KERNED) + 1):
+        fonts.get_advance(ENGLISH_FONT, 48, KERNED[:n])
+        fonts.text_mask(KERNED[:n], 48)
+    assert set(fonts._advances[(ENGLISH_FONT, 48)]) == set(KERNED)
+    assert fonts._kerning.cache_info().currsize <= len(KERNED) - 1
+
+
+# ---------------------------------------------------------------------------
+# Line breaking and fitting
+# ---------------------------------------------------------------------------
+
+def test_cjk_breaks_between_characters_and_keeps_closing_punctuation():
+    assert break_tokens('风险，管理。') == ['风', '险，', '管', '理。']
+    assert break_tokens('DeFi风险管理') == ['DeFi', '风', '险', '管', '理']
+
+
+def test_latin_breaks_between_words_and_after_hyphens():
+    assert break_tokens('Smart contract audit') == ['Smart ', 'contract ', 'audit']
+    assert break_tokens('cross-chain bridge') == ['cross-', 'chain ', 'bridge']
+
+
+@pytest.mark.parametrize('text', [
+    '良性套利论：当贪婪成为去中心化世界的稳定器，而非破坏者。',
+    '巨鲸的假动作（链上数据）是如何欺骗你的？',
+])
+def test_no_line_starts_with_closing_punctuation(text):
+    size = 48
+    max_width = line_width('良性套利论', size)
+    for width in (max_width, max_width * 1.5, max_width * 2.2):
+        lines = break_lines(text, size, width)
+        assert ''.join(lines) == text
+        assert all(line[0] not in NO_BREAK_BEFORE for line in lines)
+
+
+def test_lines_fit_the_width():
+    text = 'Managing liquidation risk across lending protocols and bridges'
+    size = 40
+    max_width = 500
+    lines = break_lines(text, size, max_width)
+    assert len(lines) > 1
+    assert ' '.join(lines) == text
+    assert all(line_width(line, size) <= max_width for line in lines)
+
+
+def test_word_wider_than_a_line_is_split_between_characters():
+    word = 'Supercalifragilisticexpialidocious'
+    size = 40
+    max_width = line_width(word, size) / 3
+    lines = break_lines(f'A {word} bridge', size, max_width)
+    assert ''.join(lines).replace(' ', '') == f'A{word}bridge'
+    assert len(lines) >= 4
+    assert all(line_width(line, size) <= max_width for line in lines)
+
+
+def test_fit_keeps_the_preferred_size_when_text_fits():
+    size, lines, fits = fit_text('Web3 Security', 1600, 72, min_size=40)
+    assert (size, lines, fits) == (72, ['Web3 Security'], True)
+
+
+def test_fit_shrinks_to_the_largest_size_that_fits():
+    text = 'DeFi Risk Management Strategies'
+    max_width = line_width(text, 60)
+    size, lines, fits = fit_text(text, max_width, 72, min_size=40)
+    assert fits and lines == [text]
+    assert 60 <= size < 72
+    assert line_width(text, size + 1) > max_width
+
+
+def test_fit_never_goes_below_the_minimum_size():
+    text = 'A title far too long for the width it is given at any allowed size'
+    size, lines, fits = fit_text(text, 300, 72, min_size=40, max_lines=2)
+    assert not fits
+    assert size == 40
+    assert lines == break_lines(text, 40, 300)
+
+
+def test_fit_uses_extra_lines_before_shrinking():
+    text = 'Cross-chain bridge security review'
+    max_width = line_width(text, 72) * 0.6
+    size, lines, fits = fit_text(text, max_width, 72, min_size=40, max_lines=2)
+    assert fits and size == 72 and len(lines) == 2
+
+
+def test_atlas_keeps_the_most_recently_used_glyphs():
+    atlas = GlyphAtlas(max_glyphs=3)
+    for char in 'abcd':
+        atlas.glyph(ENGLISH_FONT, 24, char)
+    atlas.glyph(ENGLISH_FONT, 24, 'b')
+    atlas.glyph(ENGLISH_FONT, 24, 'e')
+    assert [char for _, _, char in atlas.glyphs] == ['d', 'b', 'e']
+
+
+def test_parallel_atlas_saves_keep_every_glyph(tmp_path):
+    path = str(tmp_path / 'atlas.json')
+    chunks = ['abcdef', 'ghijkl', 'mnopqr', 'stuvwx']
+
+    def draw_and_save(chars):
+        atlas = GlyphAtlas()
+        for char in chars:
+            atlas.glyph(ENGLISH_FONT, 24, char)
+            atlas.save(path)
+
+    with ThreadPoolExecutor(len(chunks)) as pool:
+        list(pool.map(draw_and_save, chunks))
+    loaded = GlyphAtlas()
+    loaded.load(path)
+    assert sorted(char for _, _, char in loaded.glyphs) == sorted(''.join(chunks))
@@ -0,0 +1,34 @@
+"""Background cache keys: everything that changes the cached pixels changes the key"""
+
+import hero_backgrounds
+from hero_backgrounds import background_key
+from hero_renderer import load_spec
+
+PLATE = (1920, 1350)
+
+
+def _keys(spec):
+    return background_key(spec), background_key(spec, PLATE)
+
+
+def test_font_change_invalidates_backgrounds_that_draw_text(monkeypatch):
+    spec = load_spec('defi-risk-management')  # warning_triangles draw a "!"
+    before = _keys(spec)
+    monkeypatch.setattr(hero_backgrounds, 'font_hashes', lambda: ['changed', 'changed'])
+    after = _keys(spec)
+    assert after[0] != before[0]
+    # The triangles are a frame layer, drawn per card rather than into the plate
+    assert after[1] == before[1]
+
+
+def test_font_change_keeps_text_free_backgrounds(monkeypatch):
+    spec = load_spec('benign-arbitrage-theory')
+    before = _keys(spec)
+    monkeypatch.setattr(hero_backgrounds, 'font_hashes', lambda: ['changed', 'changed'])
+    assert _keys(spec) == before
+
+
+def test_text_does_not_change_the_key():
+    spec = load_spec('defi-risk-management')
+    retitled = dict(spec, text=dict(spec['text'], title='Another title'))
+    assert _keys(retitled) == _keys(spec)
@@ -0,0 +1,62 @@
+"""Batch pipeline: every job is reported, even when reporting fails, in every worker"""
+
+import pytest
+from PIL import Image
+
+from hero_batch import Pipeline, render_batch, render_chunk
+from hero_outputs import output_names
+from hero_renderer import load_spec
+
+
+def _rendered():
+    return Image.new('RGB', (64, 36), (15, 23, 42)), {}
+
+
+def test_pipeline_reports_every_job(tmp_path):
+    spec = load_spec('defi-risk-management')
+    done = []
+    pipeline = Pipeline(str(tmp_path), lambda spec, result, error: done.append((result, error)))
+    for _ in range(3):
+        pipeline.submit(spec, _rendered(), 0.0)
+    pipeline.close()
+    assert len(done) == 3
+    assert all(error is None and result[0] == 'defi-risk-management' for result, error in done)
+    assert (tmp_path / 'defi-risk-management-hero.png').exists()
+
+
+def test_failing_callback_is_raised_from_close(tmp_path):
+    spec = load_spec('defi-risk-management')
+    calls = []
+
+    def on_done(spec, result, error):
+        calls.append(spec['slug'])
+        raise RuntimeError('placeholder merge failed')
+
+    pipeline = Pipeline(str(tmp_path), on_done, depth=1)
+    # More jobs than both queues hold: submit() would block if the writer died
+    for _ in range(5):
+        pipeline.submit(spec, _rendered(), 0.0)
+    with pytest.raises(RuntimeError, match='placeholder merge failed'):
+        pipeline.close()
+    assert len(calls) == 5
+
+
+def test_chunk_renders_through_the_worker_pipeline(tmp_path):
+    spec = load_spec('defi-risk-management')
+    broken = dict(spec, slug='broken', layers=[{'type': 'core', 'color': 'no-such-colour'}])
+    done = render_chunk([broken, spec], str(tmp_path), background_cache=False)
+    assert [(spec['slug'], error is None) for spec, _, error in done] == \
+        [('broken', False), ('defi-risk-management', True)]
+    assert done[1][1][2] == len(output_names('defi-risk-management'))
+
+
+def test_batch_pipelines_in_every_worker(spec_dir, tmp_path):
+    out_dir = tmp_path / 'out'
+    results, skipped, failures = render_batch(
+        ['benign-arbitrage-theory', 'defi-risk-management'], str(spec_dir), str(out_dir),
+        jobs=2, placeholders_path=str(tmp_path / 'placeholders.json'), report=lambda line: None)
+    assert failures == [] and skipped == []
+    assert sorted(slug for slug, *_ in results) == ['benign-arbitrage-theory', 'defi-risk-management']
+    for slug, *_ in results:
+        for name in output_names(slug):
+            assert (out_dir / name).exists()
@@ -0,0 +1,86 @@
+"""Build cache: fingerprints, freshness and the per-directory manifest"""
+
+import copy
+import os
+
+import hero_cache
+from hero_cache import RenderCache, fingerprint, write_if_changed
+from hero_renderer import load_spec
+
+FILES = ['a-hero.png', 'a-og.jpg']
+
+
+def test_fingerprint_ignores_key_order():
+    spec = load_spec('defi-risk-management')
+    reordered = dict(reversed(list(spec.items())))
+    assert fingerprint(spec, {'q': 1, 'w': 2}) == fingerprint(reordered, {'w': 2, 'q': 1})
+
+
+def test_fingerprint_changes_with_every_input(monkeypatch):
+    spec = load_spec('defi-risk-management')
+    base = fingerprint(spec, {'quality': 85})
+
+    retitled = copy.deepcopy(spec)
+    retitled['text']['title'] += '!'
+    assert fingerprint(retitled, {'quality': 85}) != base
+    assert fingerprint(spec, {'quality': 90}) != base
+
+    monkeypatch.setattr(hero_cache, 'RENDERER_VERSION', hero_cache.RENDERER_VERSION + 1)
+    assert fingerprint(spec, {'quality': 85}) != base
+
+
+def _touch(directory, names):
+    for name in names:
+        (directory / name).write_bytes(b'x')
+
+
+def test_fresh_only_with_the_same_digest_and_every_file(tmp_path):
+    out = tmp_path / 'out'
+    out.mkdir()
+    cache = RenderCache(str(out), str(tmp_path / 'manifest.json'))
+    assert not cache.is_fresh(FILES, 'd1')
+
+    _touch(out, FILES)
+    cache.record(FILES, 'd1')
+    assert cache.is_fresh(FILES, 'd1')
+    assert not cache.is_fresh(FILES, 'd2')
+
+    os.remove(out / FILES[1])
+    assert not cache.is_fresh(FILES, 'd1')
+
+
+def test_manifest_keeps_a_section_per_output_dir(tmp_path):
+    manifest = str(tmp_path / 'manifest.json')
+    first, second = tmp_path / 'first', tmp_path / 'second'
+    for directory in (first, second):
+        directory.mkdir()
+        _touch(directory, FILES)
+
+    cache = RenderCache(str(first), manifest)
+    cache.record(FILES, 'd1')
+    cache.save()
+    cache = RenderCache(str(second), manifest)
+    cache.record(FILES, 'd2')
+    cache.save()
+
+    assert RenderCache(str(first), manifest).is_fresh(FILES, 'd1')
+    assert RenderCache(str(second), manifest).is_fresh(FILES, 'd2')
+    assert not RenderCache(str(second), manifest).is_fresh(FILES, 'd1')
+
+
+def test_save_removes_a_manifest_left_in_the_output_dir(tmp_path):
+    legacy = tmp_path / hero_cache.LEGACY_MANIFEST_NAME
+    legacy.write_text('{}')
+    cache = RenderCache(str(tmp_path), str(tmp_path / 'cache' / 'manifest.json'))
+    cache.record(FILES, 'd1')
+    cache.save()
+    assert not legacy.exists()
+
+
+def test_write_if_changed_keeps_unchanged_files(tmp_path):
+    path = str(tmp_path / 'a-hero.png')
+    assert write_if_changed(path, b'one')
+    os.utime(path, ns=(1, 1))
+    assert not write_if_changed(path, b'one')
+    assert os.stat(path).st_mtime_ns == 1
+    assert write_if_changed(path, b'two')
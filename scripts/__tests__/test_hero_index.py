@@ -0,0 +1,41 @@
+"""Placeholder duplicates: found by hash, served from one shared URL"""
+
+import shutil
+
+from PIL import Image
+
+from hero_index import ImageIndex, exact_groups, find_placeholders, share_urls
+
+
+def _images(tmp_path):
+    image_dir = tmp_path / 'images'
+    image_dir.mkdir()
+    Image.new('RGB', (96, 54), (59, 130, 246)).save(image_dir / 'drawn-hero.png')
+    shutil.copy(image_dir / 'drawn-hero.png', image_dir / 'copied-hero.png')
+    Image.new('RGB', (96, 54), (34, 211, 238)).save(image_dir / 'other-hero.png')
+    index = ImageIndex(str(tmp_path / 'index.json'))
+    assert index.update(str(image_dir)) == 3
+    return image_dir, index.entries
+
+
+def test_copies_without_a_spec_are_placeholders(tmp_path):
+    _, entries = _images(tmp_path)
+    assert exact_groups(entries) == [['copied-hero.png', 'drawn-hero.png']]
+    assert find_placeholders(entries, {'drawn', 'other'}) == {'copied': 'drawn-hero.png'}
+
+
+def test_duplicates_share_the_canonical_hashed_url(tmp_path):
+    image_dir, entries = _images(tmp_path)
+    assets = {'drawn': {'locale': 'en', 'hero': {}, 'cards': {'og': '/blog-images/drawn-og.x.jpg'}}}
+    changed = share_urls(exact_groups(entries), str(image_dir), entries, {'drawn'}, assets,
+                         messages_dir=str(tmp_path))
+
+    assert changed == ['copied', 'drawn']
+    src = assets['drawn']['hero']['png']['1920']
+    assert src.startswith('/blog-images/drawn-hero.') and src != '/blog-images/drawn-hero.png'
+    assert (image_dir / src.rsplit('/', 1)[1]).exists()
+    assert assets['copied'] == {'locale': None, 'hero': {'png': {'1920': src}}, 'cards': {}}
+    assert assets['drawn']['cards'] == {'og': '/blog-images/drawn-og.x.jpg'}
+    # Nothing left to change on a second run
+    assert share_urls(exact_groups(entries), str(image_dir), entries, {'drawn'}, assets,
+                      messages_dir=str(tmp_path)) == []
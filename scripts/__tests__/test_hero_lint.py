@@ -0,0 +1,41 @@
+"""Dry run: bad specs are reported as issues instead of failing mid-render"""
+
+import json
+
+import pytest
+
+from conftest import edit_spec
+from hero_lint import lint
+from hero_renderer import load_spec
+
+SLUG = 'defi-risk-management'
+
+
+def _spec_issues(report):
+    return [issue for issue in report['issues'] if issue['check'] == 'spec']
+
+
+@pytest.mark.parametrize('palette', [None, {}, {'cyan': [34, 211]}, {'cyan': 'blue'}])
+def test_bad_palette_is_a_spec_error(spec_dir, tmp_path, palette):
+    def change(spec):
+        if palette is None:
+            del spec['palette']
+        else:
+            spec['palette'] = palette
+
+    edit_spec(spec_dir, SLUG, change)
+    with pytest.raises(ValueError, match='palette'):
+        load_spec(SLUG, str(spec_dir))
+
+    report = lint([SLUG], str(spec_dir), str(tmp_path))
+    issues = _spec_issues(report)
+    assert not report['ok']
+    assert [issue['slug'] for issue in issues] == [SLUG]
+    assert 'palette' in issues[0]['message']
+
+
+def test_extending_spec_inherits_the_palette(spec_dir):
+    (spec_dir / 'child.json').write_text(json.dumps({
+        'slug': 'child', 'extends': SLUG, 'text': {'title': 'Child'},
+    }), encoding='utf-8')
+    assert load_spec('child', str(spec_dir))['palette'] == load_spec(SLUG, str(spec_dir))['palette']
@@ -0,0 +1,84 @@
+"""Published files: the width ladder derived from one master, and content-hashed names"""
+
+import io
+
+import pytest
+from PIL import Image
+
+import hero_outputs
+from hero_outputs import (
+    FORMATS, LADDER_WIDTHS, asset_entry, check_encoders, derive_outputs, is_hashed, output_names,
+    prune_hashed, publish_hashed,
+)
+
+SLUG = 'defi-risk-management'
+
+
+def _master():
+    return Image.new('RGB', (1920, 1080), (15, 23, 42))
+
+
+def test_ladder_is_derived_from_the_master():
+    outputs = derive_outputs(_master(), SLUG)
+    assert [name for name, _ in outputs] == output_names(SLUG, cards=())
+    sizes = {}
+    for name, data in outputs:
+        with Image.open(io.BytesIO(data)) as img:
+            sizes[name] = (img.format, img.size)
+    assert sizes[f'{SLUG}-hero.png'] == ('PNG', (1920, 1080))
+    for width in LADDER_WIDTHS:
+        for fmt in FORMATS:
+            assert sizes[f'{SLUG}-hero-{width}.{fmt}'] == \
+                (fmt.upper(), (width, round(1080 * width / 1920)))
+
+
+def test_formats_do_not_depend_on_the_pillow_build(monkeypatch):
+    names = output_names(SLUG)
+    monkeypatch.setattr(hero_outputs, 'HAS_AVIF', False)
+    assert output_names(SLUG) == names
+    with pytest.raises(RuntimeError, match='AVIF'):
+        check_encoders()
+    check_encoders(('webp',))
+
+
+def test_asset_entry_maps_format_and_width():
+    hashed = {f'{SLUG}-hero.png': f'{SLUG}-hero.0123456789ab.png',
+              f'{SLUG}-hero-960.webp': f'{SLUG}-hero-960.bbbbbbbbbbbb.webp'}
+    entry = asset_entry(SLUG, 'en', hashed)
+    assert entry['hero'] == {
+        'png': {'1920': f'/blog-images/{SLUG}-hero.0123456789ab.png'},
+        'webp': {'960': f'/blog-images/{SLUG}-hero-960.bbbbbbbbbbbb.webp'},
+    }
+    assert entry['cards'] == {}
+
+
+def test_hashed_names_keep_their_bytes(tmp_path):
+    (tmp_path / f'{SLUG}-hero.png').write_bytes(b'first')
+    (tmp_path / f'{SLUG}-og.jpg').write_bytes(b'card')
+    names = [f'{SLUG}-hero.png', f'{SLUG}-og.jpg', f'{SLUG}-square.jpg']
+
+    hashed, created = publish_hashed(str(tmp_path), names)
+    assert created == 2 and sorted(hashed) == names[:2]
+    first = hashed[f'{SLUG}-hero.png']
+    assert is_hashed(first) and first.startswith(f'{SLUG}-hero.') and first.endswith('.png')
+    assert publish_hashed(str(tmp_path), names) == (hashed, 0)
+
+    # A re-render replaces the stable name by rename; the hashed name keeps the old bytes
+    (tmp_path / 'new').write_bytes(b'second')
+    (tmp_path / 'new').replace(tmp_path / f'{SLUG}-hero.png')
+    rehashed, created = publish_hashed(str(tmp_path), names)
+    assert created == 1 and rehashed[f'{SLUG}-hero.png'] != first
+    assert (tmp_path / first).read_bytes() == b'first'
+
+
+def test_prune_removes_only_unreferenced_hashed_names(tmp_path):
+    (tmp_path / f'{SLUG}-hero.png').write_bytes(b'first')
+    old, _ = publish_hashed(str(tmp_path), [f'{SLUG}-hero.png'])
+    (tmp_path / 'new').write_bytes(b'second')
+    (tmp_path / 'new').replace(tmp_path / f'{SLUG}-hero.png')
+    new, _ = publish_hashed(str(tmp_path), [f'{SLUG}-hero.png'])
+    assets = {SLUG: asset_entry(SLUG, 'en', new)}
+
+    assert prune_hashed(str(tmp_path), assets) == [old[f'{SLUG}-hero.png']]
+    assert sorted(path.name for path in tmp_path.iterdir()) == \
+        sorted([f'{SLUG}-hero.png', new[f'{SLUG}-hero.png']])
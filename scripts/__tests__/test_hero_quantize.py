@@ -0,0 +1,39 @@
+"""PNG-8 fallback: seeded palette and the error it's scored by"""
+
+from PIL import Image
+
+from hero_quantize import build_palette, encode_png8, perceptual_error, seed_colors
+from hero_renderer import load_spec, render_hero
+
+SLUG = 'defi-risk-management'
+
+
+def _with_translucent_colour(spec):
+    spec = dict(spec)
+    spec['palette'] = dict(spec['palette'], glow=[255, 0, 0, 128])
+    return spec
+
+
+def test_seeds_are_rgb_even_for_rgba_palette_entries():
+    spec = _with_translucent_colour(load_spec(SLUG))
+    seeds = seed_colors(spec)
+    assert all(len(color) == 3 for color in seeds)
+    assert (255, 0, 0) in seeds
+
+    img = Image.new('RGB', (32, 32), (15, 23, 42))
+    flat = build_palette(img, seeds).getpalette()
+    assert [tuple(flat[i:i + 3]) for i in range(0, 3 * len(seeds), 3)] == seeds
+
+
+def test_rgba_palette_entry_keeps_png8_close_to_the_master():
+    spec = load_spec(SLUG)
+    img = render_hero(spec, scale=0.25)
+    _, plain = encode_png8(img, seed_colors(spec))
+    _, translucent = encode_png8(img, seed_colors(_with_translucent_colour(spec)))
+    assert perceptual_error(img, plain) < 1
+    assert perceptual_error(img, translucent) < 1
+
+
+def test_identical_images_have_no_error():
+    img = Image.new('RGB', (16, 16), (59, 130, 246))
+    assert perceptual_error(img, img.copy()) == 0
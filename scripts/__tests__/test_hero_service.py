@@ -0,0 +1,44 @@
+"""Service protocol: one JSON reply per request, nothing saved for bad ones"""
+
+import io
+import json
+
+from hero_service import serve
+
+
+def _serve(spec_dir, out_dir, tmp_path, *requests):
+    stdin = io.StringIO(''.join(json.dumps(request) + '\n' for request in requests))
+    stdout = io.StringIO()
+    serve(stdin, stdout, str(spec_dir), str(out_dir), str(tmp_path / 'placeholders.json'))
+    return [json.loads(line) for line in stdout.getvalue().splitlines()]
+
+
+def test_replies_with_the_hero_written_and_the_rest_pending(spec_dir, tmp_path):
+    out_dir = tmp_path / 'out'
+    request = {'id': 7, 'slug': 'svc', 'title': 'Service', 'extends': 'defi-risk-management'}
+    ready, first, second = _serve(spec_dir, out_dir, tmp_path, request, dict(request, id=8))
+
+    assert ready == {'ready': True}
+    assert first['id'] == 7 and first['ok'] and not first['cached']
+    assert [path.rsplit('/', 1)[1] for path in first['files']] == ['svc-hero.png']
+    assert first['pending']
+    # The second request waits for the first one's outputs, which are then fresh
+    assert second['id'] == 8 and second['ok'] and second['cached']
+    assert second['pending'] == []
+    for path in first['files'] + first['pending']:
+        assert (out_dir / path.rsplit('/', 1)[1]).exists()
+    assert json.loads((spec_dir / 'svc.json').read_text(encoding='utf-8'))['extends'] == \
+        'defi-risk-management'
+
+
+def test_invalid_request_is_an_error_reply_and_saves_nothing(spec_dir, tmp_path):
+    replies = _serve(spec_dir, tmp_path / 'out', tmp_path,
+                     {'id': 1, 'slug': 't2', 'title': 'Z', 'extends': 'nope'},
+                     {'id': 2, 'slug': 't3', 'title': 'Z', 'palette': {'cyan': [0, 0]}},
+                     {'id': 3, 'title': 'no slug'},
+                     'not an object')
+    assert [(reply['id'], reply['ok']) for reply in replies[1:]] == \
+        [(1, False), (2, False), (3, False), (None, False)]
+    assert 'palette' in replies[2]['error']
+    assert not (spec_dir / 't2.json').exists()
+    assert not (spec_dir / 't3.json').exists()
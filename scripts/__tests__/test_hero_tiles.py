@@ -0,0 +1,34 @@
+"""Tiled renders: stitched tiles match a single-canvas render"""
+
+import pytest
+from PIL import ImageChops
+
+from hero_renderer import BLUR_TILE, load_spec, render_hero
+from hero_tiles import render_tiled, tile_boxes
+
+SCALE = 0.5
+TILE = 4 * BLUR_TILE
+
+
+def test_tiles_cover_the_image_once():
+    boxes = tile_boxes((300, 170), 128)
+    assert boxes[0] == (0, 0, 128, 128) and boxes[-1] == (256, 128, 300, 170)
+    assert sum((right - left) * (bottom - top) for left, top, right, bottom in boxes) == 300 * 170
+
+
+@pytest.mark.parametrize('slug', ['defi-risk-management', 'web3-security-trends-2025'])
+def test_tiled_render_matches_a_single_canvas(slug):
+    spec = load_spec(slug)
+    single = render_hero(spec, scale=SCALE)
+    tiled = render_tiled(spec, scale=SCALE, jobs=1, tile=TILE)
+    assert tiled.size == single.size
+    # Wide lines starting outside a tile may shift by a pixel (see hero_tiles)
+    diff = ImageChops.difference(single, tiled).convert('L')
+    histogram = diff.histogram()
+    assert sum(histogram[5:]) == 0
+    assert sum(histogram[1:]) <= single.width * single.height // 1000
+
+
+def test_tile_size_must_follow_the_blur_grid():
+    with pytest.raises(ValueError, match='multiple'):
+        render_tiled(load_spec('defi-risk-management'), scale=SCALE, tile=TILE + 1)
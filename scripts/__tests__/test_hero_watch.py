@@ -0,0 +1,62 @@
+"""Watch mode: layer snapshots must redraw to the same pixels as a fresh render"""
+
+from PIL import ImageChops
+
+from conftest import edit_spec
+from hero_renderer import load_spec, render_background
+from hero_watch import LayerSnapshots
+
+SLUG = 'benign-arbitrage-theory'
+
+
+def _max_difference(a, b):
+    return max(high for _, high in ImageChops.difference(a, b).getextrema())
+
+
+def _render(snapshots, spec_dir):
+    spec = load_spec(SLUG, str(spec_dir))
+    background, drawn = snapshots.render(spec)
+    return background, drawn, render_background(spec)
+
+
+def test_first_render_matches_render_background(spec_dir):
+    background, drawn, expected = _render(LayerSnapshots(), spec_dir)
+    assert drawn == 6
+    assert _max_difference(background, expected) == 0
+
+
+def test_unchanged_spec_draws_nothing(spec_dir):
+    snapshots = LayerSnapshots()
+    _render(snapshots, spec_dir)
+    background, drawn, expected = _render(snapshots, spec_dir)
+    assert drawn == 0
+    assert _max_difference(background, expected) == 0
+
+
+def test_successive_edits_to_different_layers(spec_dir):
+    snapshots = LayerSnapshots()
+    _render(snapshots, spec_dir)
+
+    edit_spec(spec_dir, SLUG, lambda spec: spec['layers'][4].update(radius=60))
+    background, drawn, expected = _render(snapshots, spec_dir)
+    assert drawn == 2  # core and the corners above it
+    assert _max_difference(background, expected) == 0
+
+    edit_spec(spec_dir, SLUG, lambda spec: spec['layers'][5].update(size=100))
+    background, drawn, expected = _render(snapshots, spec_dir)
+    assert drawn == 1
+    assert _max_difference(background, expected) == 0
+
+    edit_spec(spec_dir, SLUG, lambda spec: spec['layers'][1].update(alpha=90))
+    background, drawn, expected = _render(snapshots, spec_dir)
+    assert drawn == 5
+    assert _max_difference(background, expected) == 0
+
+
+def test_palette_edit_redraws_everything(spec_dir):
+    snapshots = LayerSnapshots()
+    _render(snapshots, spec_dir)
+    edit_spec(spec_dir, SLUG, lambda spec: spec['palette'].update(gold=[250, 150, 20]))
+    background, drawn, expected = _render(snapshots, spec_dir)
+    assert drawn == 6
+    assert _max_difference(background, expected) == 0
@@ -7,7 +7,7 @@
  * - Proper data types (readTime as string)
  * - Automatic duplicate header removal
  * - Automatic slug mapping updates
- * - Automatic hero image creation
+ * - Automatic hero image creation (rendered by scripts/hero_service.py)
  * - Automatic GEO test configuration updates
  * - Automatic category mapping (Chinese → English)
  * - Automatic English title translation
@@ -19,7 +19,7 @@
 import fs from 'fs';
 import path from 'path';
 import readline from 'readline';
-import { execSync } from 'child_process';
+import { execSync, spawn, type ChildProcessWithoutNullStreams } from 'child_process';
 import { DeepSeekService } from '../lib/ai/deepseek';
 import { ContentValidator } from '../lib/geo/contentValidator';
 import { TerminologyManager, loadTerminologyDictionary } from '../lib/geo/terminology';
@@ -54,11 +54,98 @@ interface ArticleEntry {
   citations: any[];
 }
 
+interface HeroRenderRequest {
+  slug: string;
+  locale: 'zh' | 'en';
+  title: string;
+  subtitle?: string;
+  category?: string;
+  extends?: string;
+}
+
+interface HeroRenderResponse {
+  id: number;
+  ok: boolean;
+  slug?: string;
+  files?: string[];
+  // Cards and the optimized PNG, still being written when the reply is sent
+  pending?: string[];
+  ms?: number;
+  error?: string;
+}
+
+/**
+ * Client for the long-lived Python hero renderer (scripts/hero_service.py).
+ * The process is started once and reused for every article, so Pillow and
+ * the fonts are only loaded once per run.
+ */
+class HeroRenderClient {
+  private process: ChildProcessWithoutNullStreams;
+  private ready: Promise<void>;
+  private pending = new Map<number, (response: HeroRenderResponse) => void>();
+  private nextId = 1;
+  private exited = false;
+
+  constructor() {
+    this.process = spawn('python3', [path.join('scripts', 'hero_service.py')], {
+      cwd: process.cwd(),
+    });
+    this.process.stderr.on('data', (chunk) => process.stderr.write(`   ${chunk}`));
+
+    this.ready = new Promise((resolve, reject) => {
+      const lines = readline.createInterface({ input: this.process.stdout });
+      lines.on('line', (line) => {
+        let message: any;
+        try {
+          message = JSON.parse(line);
+        } catch {
+          return;
+        }
+        if (message.ready) {
+          resolve();
+          return;
+        }
+        const settle = this.pending.get(message.id);
+        this.pending.delete(message.id);
+        settle?.(message);
+      });
+
+      const fail = (error: string) => {
+        this.exited = true;
+        reject(new Error(error));
+        this.pending.forEach((settle, id) => settle({ id, ok: false, error }));
+        this.pending.clear();
+      };
+      this.process.on('error', (error) => fail(`hero service failed to start: ${error.message}`));
+      this.process.on('exit', (code) => fail(`hero service exited with code ${code}`));
+    });
+  }
+
+  async render(request: HeroRenderRequest): Promise<HeroRenderResponse> {
+    await this.ready;
+    if (this.exited) {
+      throw new Error('hero service is not running');
+    }
+    const id = this.nextId++;
+    return new Promise((resolve) => {
+      this.pending.set(id, resolve);
+      this.process.stdin.write(JSON.stringify({ id, ...request }) + '\n');
+    });
+  }
+
+  close(): void {
+    if (!this.exited) {
+      this.process.stdin.end();
+    }
+  }
+}
+
 class AIArticleCreatorV2 {
   private rl: readline.Interface;
   private ai: DeepSeekService;
   private validator: ContentValidator;
   private terminologyManager: TerminologyManager | null = null;
+  private heroRenderer: HeroRenderClient | null = null;
 
   constructor() {
     this.rl = readline.createInterface({
@@ -145,7 +232,7 @@ class AIArticleCreatorV2 {
         await this.saveArticle(langConfig, content, aiSummary, qaPairs, citations);
         
         // Step 12: Create hero image
-        await this.createHeroImage(langConfig);
+        await this.createHeroImage(langConfig, configs.find((c) => c !== langConfig));
       }
       
       // Step 10: Update slug mapping (after both versions created)
@@ -169,6 +256,7 @@ class AIArticleCreatorV2 {
       console.error('\n❌ Error:', error);
       throw error;
     } finally {
+      this.heroRenderer?.close();
       this.rl.close();
     }
   }
@@ -855,9 +943,33 @@ Return ONLY the English title, nothing else.`;
   }
 
   /**
-   * Create hero image (copy placeholder)
+   * Render the hero image with the article's own title. The other language's
+   * title becomes the subtitle, and the English hero extends the Chinese
+   * spec so both share the same art. Falls back to copying a placeholder if
+   * the renderer is unavailable.
    */
-  private async createHeroImage(config: ArticleConfig): Promise<void> {
+  private async createHeroImage(config: ArticleConfig, twin?: ArticleConfig): Promise<void> {
+    try {
+      this.heroRenderer ??= new HeroRenderClient();
+      const response = await this.heroRenderer.render({
+        slug: config.id,
+        locale: config.locale,
+        title: config.title,
+        subtitle: twin?.title,
+        category: this.mapCategoryToEnglish(config.category),
+        extends: config.locale === 'en' && twin ? twin.id : undefined,
+      });
+      if (!response.ok) {
+        throw new Error(response.error);
+      }
+      console.log(`   ✅ Hero image rendered: ${config.id}-hero.png (${config.locale}, ${response.ms}ms, ${response.pending?.length ?? 0} more files in the background)`);
+    } catch (error: any) {
+      console.warn(`   ⚠️  Hero render failed (${error.message}), using a placeholder`);
+      this.copyPlaceholderHero(config);
+    }
+  }
+
+  private copyPlaceholderHero(config: ArticleConfig): void {
     const imagesDir = path.join(process.cwd(), 'public', 'blog-images');
     const targetImage = path.join(imagesDir, `${config.id}-hero.png`);
     
@@ -921,6 +1033,7 @@ Return ONLY the English title, nothing else.`;
   }
 
   close(): void {
+    this.heroRenderer?.close();
     this.rl.close();
   }
 }
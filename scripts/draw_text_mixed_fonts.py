@@ -1,16 +1,195 @@
 #!/usr/bin/env python3
 """
 Helper function to draw text with mixed fonts (Chinese + English/Numbers)
+
+draw_text_mixed() draws through ImageDraw. draw_text_masked() builds one
+coverage mask per string from a persistent glyph atlas and composites it as
+both drop shadow and fill, so each glyph is rasterized once per build.
+
+fit_text() picks a font size and line breaks for a width limit from the
+same cached advance tables, without rendering anything. CJK text breaks
+between characters, Latin text between words.
+
+Advances are cached per character, kerning per character pair and atlas
+glyphs up to GLYPH_CACHE_SIZE, least recently used first out, so the caches
+stay bounded in long-lived processes (hero_service.py, hero_watch.py)
+however much text they lay out.
 """
 
-from PIL import ImageFont
+import base64
+import json
+import os
+import unicodedata
+import zlib
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import lru_cache
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+from PIL import Image, ImageDraw, ImageFilter, ImageFont
+
+from hero_trace import span
 
 CHINESE_FONT = "/usr/share/fonts/truetype/droid/DroidSansFallbackFull.ttf"
 ENGLISH_FONT = "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf"
 
+# Distinct (path, size) pairs kept loaded; a full hero batch uses well under this
+FONT_CACHE_SIZE = 32
+
+# Kerning adjustments kept, one per (font, size, character pair)
+KERNING_CACHE_SIZE = 1 << 16
+
+# (path, size) -> {char: advance width}; bounded by the character set
+_advances = {}
+
+
+@lru_cache(maxsize=FONT_CACHE_SIZE)
+def load_font(path, size):
+    """
+    Load a TrueType font once per process, keyed by (path, size).
+
+    Falls back to PIL's default bitmap font if the file can't be opened.
+    """
+    with span('font:load', cat='font', path=path, size=size):
+        try:
+            return ImageFont.truetype(path, size)
+        except (OSError, IOError):
+            return ImageFont.load_default()
+
+
+def _font_path_for(char):
+    """Chinese characters use the Chinese font, ASCII uses the English font"""
+    return ENGLISH_FONT if ord(char) < 128 else CHINESE_FONT
+
+
+def split_runs(text):
+    """
+    Split text into runs that share a font.
+
+    Returns a list of (font_path, run) tuples, e.g. "DeFi风险" ->
+    [(ENGLISH_FONT, "DeFi"), (CHINESE_FONT, "风险")].
+    """
+    runs = []
+    for char in text:
+        path = _font_path_for(char)
+        if runs and runs[-1][0] == path:
+            runs[-1][1].append(char)
+        else:
+            runs.append((path, [char]))
+    return [(path, ''.join(chars)) for path, chars in runs]
+
+
+def char_advance(path, size, char):
+    """
+    Horizontal advance of one character, from a per-(font, size) table so
+    each character is measured by FreeType only once per process
+    """
+    advances = _advances.get((path, size))
+    if advances is None:
+        advances = _advances[(path, size)] = {}
+    advance = advances.get(char)
+    if advance is None:
+        advance = advances[char] = load_font(path, size).getlength(char)
+    return advance
+
+
+@lru_cache(maxsize=KERNING_CACHE_SIZE)
+def _kerning(path, size, pair):
+    """Adjustment between two characters: their joint advance minus each alone"""
+    return (load_font(path, size).getlength(pair)
+            - char_advance(path, size, pair[0]) - char_advance(path, size, pair[1]))
+
+
+def pen_positions(path, size, run):
+    """
+    Pen x of each character of a run in one font, relative to the run's
+    start, and the run's total advance, kerning included
+    """
+    positions = []
+    pen = 0
+    for i, char in enumerate(run):
+        if i:
+            pen += _kerning(path, size, run[i - 1:i + 1])
+        positions.append(pen)
+        pen += char_advance(path, size, char)
+    return positions, pen
+
+
+def get_advance(path, size, run):
+    """Horizontal advance of a run (or single character) in one font, kerning included"""
+    return pen_positions(path, size, run)[1]
+
+
+def preload_fonts(sizes):
+    """Load both fonts at each size up front (e.g. once per worker process)"""
+    for size in sizes:
+        load_font(CHINESE_FONT, size)
+        load_font(ENGLISH_FONT, size)
+
+
+def clear_font_cache():
+    """Drop loaded fonts, glyph metrics and atlas glyphs (e.g. after fonts change on disk)"""
+    load_font.cache_clear()
+    _advances.clear()
+    _kerning.cache_clear()
+    _coverage.clear()
+    _atlas.glyphs.clear()
+
+
+# Size glyph coverage is checked at; any size works, small is fast
+GLYPH_CHECK_SIZE = 16
+# A codepoint no font maps, so its mask is the font's .notdef (tofu) box
+_UNMAPPED = '\U0010fffd'
+
+# (path, char) -> whether the font has a glyph for char
+_coverage = {}
+
+
+def font_available(path):
+    """Whether path loads as a TrueType font (rather than PIL's fallback)"""
+    return getattr(load_font(path, GLYPH_CHECK_SIZE), 'path', None) == path
+
+
+def _mask_signature(font, char):
+    mask = font.getmask(char)
+    return mask.size, bytes(mask)
+
+
+def has_glyph(path, char):
+    """
+    Whether the font at path draws char as something other than its
+    .notdef box. Cached per (font, character); nothing is rendered on a canvas.
+    """
+    key = (path, char)
+    found = _coverage.get(key)
+    if found is None:
+        font = load_font(path, GLYPH_CHECK_SIZE)
+        if char.isspace():
+            found = True
+        elif not font_available(path):
+            found = ord(char) < 128  # PIL's fallback font is ASCII only
+        else:
+            found = _mask_signature(font, char) != _mask_signature(font, _UNMAPPED)
+        _coverage[key] = found
+    return found
+
+
+def missing_glyphs(text):
+    """Characters of text (in order, once each) the mixed fonts would draw as tofu"""
+    missing = []
+    for char in dict.fromkeys(text):
+        if not has_glyph(_font_path_for(char), char):
+            missing.append(char)
+    return missing
+
+
 def draw_text_mixed(draw, pos, text, size, color, align='left'):
     """
-    Draw text using appropriate fonts for each character.
+    Draw text using appropriate fonts for each run of characters.
     Chinese characters use Chinese font, ASCII uses English font.
     
     Args:
@@ -24,49 +203,385 @@ def draw_text_mixed(draw, pos, text, size, color, align='left'):
     Returns:
         Final x position after drawing (useful for chaining)
     """
-    try:
-        font_cn = ImageFont.truetype(CHINESE_FONT, size)
-        font_en = ImageFont.truetype(ENGLISH_FONT, size)
-    except:
-        font_cn = font_en = ImageFont.load_default()
-    
-    # Calculate total width for alignment
-    if align != 'left':
-        total_width = 0
-        for char in text:
-            current_font = font_en if ord(char) < 128 else font_cn
-            bbox = draw.textbbox((0, 0), char, font=current_font)
-            total_width += (bbox[2] - bbox[0]) + 1
-    
+    runs = split_runs(text)
     x, y = pos
     
     # Adjust starting position for alignment
-    if align == 'center':
-        x -= total_width // 2
-    elif align == 'right':
-        x -= total_width
+    if align != 'left':
+        total_width = _runs_width(runs, size)
+        if align == 'center':
+            x -= total_width / 2
+        elif align == 'right':
+            x -= total_width
     
-    # Draw each character with appropriate font
-    for char in text:
-        current_font = font_en if ord(char) < 128 else font_cn
-        draw.text((x, y), char, font=current_font, fill=color)
-        bbox = draw.textbbox((x, y), char, font=current_font)
-        x = bbox[2] + 1
+    # Draw each run with its font in a single call
+    for path, run in runs:
+        draw.text((x, y), run, font=load_font(path, size), fill=color)
+        x += get_advance(path, size, run)
     
     return x
 
+def _runs_width(runs, size):
+    return sum(get_advance(path, size, run) for path, run in runs)
+
 def get_text_width(draw, text, size):
     """Calculate the width of text when rendered with mixed fonts"""
-    try:
-        font_cn = ImageFont.truetype(CHINESE_FONT, size)
-        font_en = ImageFont.truetype(ENGLISH_FONT, size)
-    except:
-        font_cn = font_en = ImageFont.load_default()
-    
-    total_width = 0
+    return _runs_width(split_runs(text), size)
+
+
+# ---------------------------------------------------------------------------
+# Layout: line breaking and auto-fit, from advances only (no rendering)
+# ---------------------------------------------------------------------------
+
+# CJK punctuation that must not start a line; it stays with the character before
+NO_BREAK_BEFORE = set('，。、：；！？）》」』】〕…·%,.:;!?)')
+
+
+def _is_wide(char):
+    return unicodedata.east_asian_width(char) in ('W', 'F')
+
+
+def break_tokens(text):
+    """
+    Split text into the units a line may break between: each CJK character
+    on its own (plus any closing punctuation after it), Latin words with
+    their trailing spaces, and word parts after a hyphen.
+    """
+    tokens = []
     for char in text:
-        current_font = font_en if ord(char) < 128 else font_cn
-        bbox = draw.textbbox((0, 0), char, font=current_font)
-        total_width += (bbox[2] - bbox[0]) + 1
-    
-    return total_width
+        if not tokens:
+            tokens.append(char)
+        elif char in NO_BREAK_BEFORE or char.isspace():
+            tokens[-1] += char
+        elif _is_wide(char):
+            tokens.append(char)
+        else:
+            last = tokens[-1][-1]
+            if _is_wide(last) or last.isspace() or last == '-':
+                tokens.append(char)
+            else:
+                tokens[-1] += char
+    return tokens
+
+
+def _token_width(token, size):
+    """Advance of one break token: its cached character advances plus kerning"""
+    return _runs_width(split_runs(token), size)
+
+
+def line_width(line, size):
+    """
+    Width of a laid-out line: the sum of its tokens' advances, ignoring
+    kerning across token boundaries, so only tokens are ever measured
+    """
+    return sum(_token_width(token, size) for token in break_tokens(line.rstrip()))
+
+
+def _split_word(word, size, max_width):
+    """Split a word wider than max_width between characters"""
+    pieces = ['']
+    width = 0
+    for char in word:
+        advance = char_advance(_font_path_for(char), size, char)
+        if pieces[-1] and width + advance > max_width:
+            pieces.append('')
+            width = 0
+        pieces[-1] += char
+        width += advance
+    return pieces
+
+
+def break_lines(text, size, max_width):
+    """
+    Greedily break text into lines no wider than max_width at size.
+
+    Latin words wider than a whole line are split between characters.
+    Returns the list of lines, without trailing spaces.
+    """
+    lines = []
+    line, width = '', 0
+    for token in break_tokens(text.strip()):
+        token_width = _token_width(token, size)
+        trimmed = _token_width(token.rstrip(), size) if token[-1].isspace() else token_width
+        if line and width + trimmed > max_width:
+            lines.append(line.rstrip())
+            line, width = '', 0
+        if not line and trimmed > max_width:
+            *full, token = _split_word(token, size, max_width)
+            lines.extend(full)
+            token_width = _token_width(token, size)
+        line += token
+        width += token_width
+    if line.strip():
+        lines.append(line.rstrip())
+    return lines
+
+
+def fit_text(text, max_width, size, min_size=None, max_lines=1):
+    """
+    Largest font size in [min_size, size] at which text breaks into at most
+    max_lines lines of at most max_width, found by binary search over sizes.
+
+    Only glyph advances are measured, so fitting needs no rendering.
+
+    Args:
+        text: Text string to lay out
+        max_width: Line width limit in pixels
+        size: Preferred (largest) font size
+        min_size: Smallest allowed font size (default: size)
+        max_lines: Most lines allowed
+
+    Returns:
+        (size, lines, fits): fits is False when even min_size needs more
+        lines than allowed; lines are then those at min_size
+    """
+    min_size = min(min_size or size, size)
+
+    def layout(candidate):
+        lines = break_lines(text, candidate, max_width)
+        ok = len(lines) <= max_lines and all(
+            line_width(line, candidate) <= max_width for line in lines)
+        return lines, ok
+
+    lines, ok = layout(size)
+    if ok:
+        return size, lines, True
+    best = None
+    low, high = min_size, size - 1
+    while low <= high:
+        middle = (low + high) // 2
+        candidate_lines, candidate_ok = layout(middle)
+        if candidate_ok:
+            best = (middle, candidate_lines)
+            low = middle + 1
+        else:
+            high = middle - 1
+    if best is None:
+        return min_size, layout(min_size)[0], False
+    return best[0], best[1], True
+
+
+# ---------------------------------------------------------------------------
+# Glyph atlas and mask-based text
+# ---------------------------------------------------------------------------
+
+ATLAS_VERSION = 1
+
+# Glyph masks an atlas keeps in memory and on disk; a few MB of CJK glyphs
+# at title sizes, far more than a full batch draws
+GLYPH_CACHE_SIZE = 8192
+
+
+def _font_stamp(path):
+    """(size, mtime) of a font file, to tell whether saved glyphs are stale"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+@contextmanager
+def _file_lock(path):
+    """Hold an exclusive lock on <path>.lock (no-op where fcntl is missing)"""
+    if fcntl is None:
+        yield
+        return
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(f'{path}.lock', 'a') as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+class GlyphAtlas:
+    """
+    Rasterized glyph masks keyed by (font path, size, character).
+
+    FreeType draws each glyph once, into an 'L' mask stored with its offset
+    from the pen position. save() and load() keep the atlas on disk, so CJK
+    glyphs shared by many heroes are rasterized once per build. Glyphs from
+    a font file that has changed since the save are dropped on load. At most
+    max_glyphs are kept, dropping the least recently used.
+
+    Args:
+        max_glyphs: Glyphs kept in memory and written by save()
+    """
+
+    def __init__(self, max_glyphs=GLYPH_CACHE_SIZE):
+        self.glyphs = OrderedDict()
+        self.max_glyphs = max_glyphs
+        self.added = 0  # glyphs rasterized since the last load/save
+        self.path = None
+
+    def glyph(self, path, size, char):
+        """(mask, left, top) for char; the mask's corner is at pen + (left, top)"""
+        key = (path, size, char)
+        entry = self.glyphs.get(key)
+        if entry is not None:
+            self.glyphs.move_to_end(key)
+            return entry
+        font = load_font(path, size)
+        left, top, right, bottom = font.getbbox(char)
+        mask = Image.new('L', (max(1, right - left), max(1, bottom - top)), 0)
+        ImageDraw.Draw(mask).text((-left, -top), char, font=font, fill=255)
+        entry = self.glyphs[key] = (mask, left, top)
+        self.added += 1
+        self._trim(self.glyphs)
+        return entry
+
+    def _trim(self, glyphs):
+        while len(glyphs) > self.max_glyphs:
+            glyphs.popitem(last=False)
+
+    def _merge(self, older, newer):
+        """older with newer's glyphs added as the most recently used, trimmed"""
+        for key, entry in newer.items():
+            older.pop(key, None)
+            older[key] = entry
+        self._trim(older)
+        return older
+
+    def _read(self, path):
+        try:
+            with open(path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return OrderedDict()
+        if data.get('version') != ATLAS_VERSION:
+            return OrderedDict()
+        fresh = {font: stamp for font, stamp in data.get('fonts', {}).items()
+                 if stamp == _font_stamp(font)}
+        glyphs = OrderedDict()
+        for font, size, char, left, top, width, height, pixels in data.get('glyphs', []):
+            if font in fresh:
+                mask = Image.frombytes('L', (width, height), zlib.decompress(base64.b64decode(pixels)))
+                glyphs[(font, size, char)] = (mask, left, top)
+        return glyphs
+
+    def load(self, path):
+        """Add glyphs saved at path (once per process and path)"""
+        if self.path == path:
+            return
+        # Saved glyphs count as older than any drawn in this process
+        self.glyphs = self._merge(self._read(path), self.glyphs)
+        self.path = path
+        self.added = 0
+
+    def save(self, path):
+        """
+        Write the atlas to path as JSON with zlib-compressed masks. Glyphs
+        another process saved there in the meantime are kept (up to
+        max_glyphs, this atlas's own first); a lock file serializes the
+        read-merge-write between processes.
+        """
+        with _file_lock(path):
+            self._write(path, self._merge(self._read(path), self.glyphs))
+        self.added = 0
+
+    def _write(self, path, glyphs):
+        data = {
+            'version': ATLAS_VERSION,
+            'fonts': {font: _font_stamp(font) for font, _, _ in glyphs},
+            'glyphs': [
+                [font, size, char, left, top, mask.width, mask.height,
+                 base64.b64encode(zlib.compress(mask.tobytes())).decode('ascii')]
+                for (font, size, char), (mask, left, top) in glyphs.items()
+            ],
+        }
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        temp = f'{path}.{os.getpid()}.tmp'
+        with open(temp, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(temp, path)
+
+
+_atlas = GlyphAtlas()
+
+
+def default_atlas():
+    """The process-wide glyph atlas"""
+    return _atlas
+
+
+def text_mask(text, size, atlas=None):
+    """
+    Coverage mask of text set in mixed fonts, assembled from atlas glyphs.
+
+    Glyphs are placed at the kerned pen positions draw_text_mixed() uses,
+    rounded to whole pixels.
+
+    Returns:
+        (mask, left, top, advance): the mask's corner relative to the pen
+        position, and the text's total advance width
+    """
+    atlas = atlas or _atlas
+    placed = []
+    pen = 0
+    for path, run in split_runs(text):
+        positions, advance = pen_positions(path, size, run)
+        for char, x in zip(run, positions):
+            glyph, left, top = atlas.glyph(path, size, char)
+            placed.append((glyph, round(pen + x) + left, top))
+        pen += advance
+
+    if not placed:
+        return Image.new('L', (1, 1), 0), 0, 0, pen
+    left = min(x for _, x, _ in placed)
+    top = min(y for _, _, y in placed)
+    right = max(x + glyph.width for glyph, x, _ in placed)
+    bottom = max(y + glyph.height for glyph, _, y in placed)
+    mask = Image.new('L', (right - left, bottom - top), 0)
+    for glyph, x, y in placed:
+        mask.paste(255, (x - left, y - top), glyph)
+    return mask, left, top, pen
+
+
+def _fill(img, pos, mask, color):
+    """Blend color (RGB or RGBA) into img through mask"""
+    if len(color) == 4 and color[3] < 255:
+        alpha = color[3]
+        mask = mask.point([value * alpha // 255 for value in range(256)])
+    img.paste(tuple(color[:3]), pos, mask)
+
+
+def draw_text_masked(img, pos, text, size, color, align='left', shadow=None, atlas=None):
+    """
+    Draw text from one atlas-built mask, optionally with a drop shadow made
+    from the same mask.
+
+    Args:
+        img: RGB PIL Image
+        pos: (x, y) pen position, as for draw_text_mixed()
+        text: Text string to draw
+        size: Font size
+        color: Text color (RGB tuple or RGBA tuple)
+        align: 'left', 'center', or 'right'
+        shadow: Optional (dx, dy, color, blur radius) drop shadow
+        atlas: GlyphAtlas to use (default: the process-wide one)
+
+    Returns:
+        Final x position after drawing (useful for chaining)
+    """
+    mask, left, top, advance = text_mask(text, size, atlas)
+    x, y = pos
+    if align == 'center':
+        x -= advance / 2
+    elif align == 'right':
+        x -= advance
+    origin = (round(x) + left, round(y) + top)
+
+    if shadow:
+        dx, dy, shadow_color, blur = shadow
+        if blur:
+            pad = int(blur * 3) + 1
+            padded = Image.new('L', (mask.width + 2 * pad, mask.height + 2 * pad), 0)
+            padded.paste(mask, (pad, pad))
+            _fill(img, (origin[0] + dx - pad, origin[1] + dy - pad),
+                  padded.filter(ImageFilter.GaussianBlur(blur)), shadow_color)
+        else:
+            _fill(img, (origin[0] + dx, origin[1] + dy), mask, shadow_color)
+    _fill(img, origin, mask, color)
+    return x + advance
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Cache of pre-rendered, text-free hero backgrounds.
+
+A hero is a background (orbs, motifs, depth blur) with text drawn on top.
+Heroes sharing a theme and palette, such as the zh/en twins of an article
+or a retitled article, have identical backgrounds. Backgrounds are cached by
+a hash of the inputs that affect their pixels, so those heroes only pay for
+the text pass.
+
+Social-card plates (see render_plate) are cached the same way, keyed by
+the same inputs plus the plate size, so a retitle re-cuts its cards from
+the cached plate too.
+
+Two tiers, both bounded by size and evicting the least recently used:
+
+- memory: per process, so a worker or the rendering service reuses a
+  background across jobs
+- disk: fast-compressed PNGs in .cache/hero-backgrounds/, shared by every
+  worker and kept between runs
+"""
+
+import hashlib
+import json
+import os
+from collections import OrderedDict
+
+from PIL import Image
+
+from hero_cache import font_hashes
+from hero_renderer import (
+    FRAME_LAYERS, HEIGHT, RENDERER_VERSION, REPO_ROOT, TEXT_LAYERS, WIDTH, render_background,
+    render_plate,
+)
+from hero_trace import span
+
+CACHE_DIR = os.path.join(REPO_ROOT, '.cache', 'hero-backgrounds')
+MEMORY_LIMIT = 64 * 1024 * 1024   # ~10 backgrounds at 1920x1080 RGB, or ~4 pairs with plates
+DISK_LIMIT = 256 * 1024 * 1024
+DISK_COMPRESS_LEVEL = 1           # decode speed matters more than size here
+
+# Spec fields that affect the background; text and slug don't
+BACKGROUND_FIELDS = ('background', 'palette', 'layers')
+
+
+def background_key(spec, plate=None):
+    """
+    Stable hash of everything that determines a spec's background pixels,
+    or with plate=(width, height), its social-card plate's. The font files
+    are part of it when a layer drawn into that image draws text.
+    """
+    payload = {field: spec.get(field) for field in BACKGROUND_FIELDS}
+    payload['renderer'] = RENDERER_VERSION
+    payload['size'] = [WIDTH, HEIGHT]
+    drawn = {layer.get('type') for layer in spec.get('layers', [])}
+    if plate is not None:
+        payload['plate'] = list(plate)
+        drawn -= FRAME_LAYERS  # drawn per card, not into the plate
+    if drawn & TEXT_LAYERS:
+        payload['fonts'] = font_hashes()
+    encoded = json.dumps(payload, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+class BackgroundCache:
+    """
+    Memory + disk LRU of rendered backgrounds.
+
+    Args:
+        cache_dir: Directory for the disk tier, or None for memory only
+        memory_limit: Bytes of decoded images kept in memory
+        disk_limit: Bytes of PNG files kept in cache_dir
+    """
+
+    def __init__(self, cache_dir=CACHE_DIR, memory_limit=MEMORY_LIMIT, disk_limit=DISK_LIMIT):
+        self.cache_dir = cache_dir
+        self.memory_limit = memory_limit
+        self.disk_limit = disk_limit
+        self.memory = OrderedDict()
+        self.memory_bytes = 0
+        self.hits = {'memory': 0, 'disk': 0, 'miss': 0}
+
+    def _disk_path(self, key):
+        return os.path.join(self.cache_dir, f'{key}.png')
+
+    def _remember(self, key, img):
+        size = len(img.getbands()) * img.width * img.height
+        if size > self.memory_limit:
+            return
+        if key in self.memory:
+            self.memory_bytes -= self.memory.pop(key)[1]
+        self.memory[key] = (img, size)
+        self.memory_bytes += size
+        while self.memory_bytes > self.memory_limit:
+            _, (_, evicted) = self.memory.popitem(last=False)
+            self.memory_bytes -= evicted
+
+    def get(self, key):
+        """Cached background for key, or None. The caller owns a copy."""
+        if key in self.memory:
+            self.memory.move_to_end(key)
+            self.hits['memory'] += 1
+            return self.memory[key][0].copy()
+
+        if self.cache_dir:
+            path = self._disk_path(key)
+            try:
+                with Image.open(path) as f:
+                    img = f.convert('RGB')
+                os.utime(path)  # mark as recently used for disk eviction
+            except OSError:
+                img = None
+            if img is not None:
+                self._remember(key, img)
+                self.hits['disk'] += 1
+                return img.copy()
+
+        self.hits['miss'] += 1
+        return None
+
+    def put(self, key, img):
+        """Store a background in memory and on disk"""
+        self._remember(key, img.copy())
+        if not self.cache_dir:
+            return
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._disk_path(key)
+        temp = f'{path}.{os.getpid()}.tmp'
+        img.save(temp, 'PNG', compress_level=DISK_COMPRESS_LEVEL)
+        os.replace(temp, path)  # atomic, so concurrent workers never read a partial file
+        self.evict_disk()
+
+    def evict_disk(self):
+        """Delete least recently used files until the disk tier fits its limit"""
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith('.png'):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.cache_dir, name))
+            except FileNotFoundError:
+                continue  # removed by another worker
+            entries.append((stat.st_mtime, stat.st_size, name))
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.disk_limit:
+                break
+            try:
+                os.remove(os.path.join(self.cache_dir, name))
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def background_for(self, spec):
+        """Background for spec, rendering and caching it on a miss"""
+        key = background_key(spec)
+        with span('background:lookup', cat='cache', slug=spec['slug']):
+            img = self.get(key)
+        if img is None:
+            img = render_background(spec)
+            with span('background:store', cat='cache', slug=spec['slug']):
+                self.put(key, img)
+        return img
+
+    def plate_for(self, spec, size):
+        """Social-card plate of size for spec, rendering and caching it on a miss"""
+        key = background_key(spec, size)
+        with span('plate:lookup', cat='cache', slug=spec['slug']):
+            img = self.get(key)
+        if img is None:
+            img = render_plate(spec, size)
+            with span('plate:store', cat='cache', slug=spec['slug']):
+                self.put(key, img)
+        return img
+
+
+_default_cache = None
+
+
+def default_cache():
+    """Process-wide cache using CACHE_DIR, created on first use"""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = BackgroundCache()
+    return _default_cache
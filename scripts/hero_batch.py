@@ -0,0 +1,528 @@
+#!/usr/bin/env python3
+"""
+Batch-render blog hero images across a pool of worker processes.
+
+Rendering is pure CPU, so specs are handed out in small chunks to a process
+pool sized to the core count. Workers load fonts once when they start. A
+failing job is reported and the rest of the batch carries on. Within each
+worker (or the one process, with a single job) encoding and writing run on
+their own threads behind bounded queues, overlapping the next render (see
+Pipeline). Every output is written to a temp file and renamed into place.
+
+Jobs whose inputs haven't changed since the last build are skipped (see
+hero_cache.py), so a no-op regeneration only hashes specs and fonts. Text-free
+backgrounds are shared between heroes with the same theme and palette (see
+hero_backgrounds.py), so a locale twin or a retitle only draws its text.
+Workers share one glyph atlas on disk (.cache/glyph-atlas.json), so each
+glyph is rasterized once per build rather than once per worker and run.
+With --hashed, every output also gets a content-hashed name and
+data/hero-assets.json maps each slug to them (see hero_outputs.py).
+
+Usage:
+    python3 scripts/hero_batch.py                  # every spec, all cores
+    python3 scripts/hero_batch.py defi-risk-management --jobs 1
+    python3 scripts/hero_batch.py --force          # ignore the build cache
+    python3 scripts/hero_batch.py --force --trace /tmp/heroes.json
+    python3 scripts/hero_batch.py --dry-run        # check specs only (hero_lint.py)
+    python3 scripts/hero_batch.py --draft 0.25     # quarter-size previews in .cache/hero-drafts
+    python3 scripts/hero_batch.py --hashed         # also publish hashed names + asset manifest
+"""
+
+import argparse
+import io
+import json
+import os
+import queue
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import hero_trace
+from draw_text_mixed_fonts import default_atlas, preload_fonts
+from hero_backgrounds import default_cache
+from hero_cache import RenderCache, fingerprint, write_atomic, write_if_changed
+from hero_lint import lint, print_summary
+from hero_outputs import (
+    ASSETS_PATH, CARDS, PLACEHOLDERS_PATH, PNG_MODE, PNG_MODES, asset_entry, card_entries,
+    check_encoders, derive_outputs, load_assets, load_placeholders, output_names,
+    output_settings, placeholder, prune_hashed, publish_hashed, save_assets, save_placeholders,
+)
+from hero_quantize import seed_colors
+from hero_renderer import (
+    CARD_SIZES, DEFAULT_TEXT_STYLE, OUTPUT_DIR, REPO_ROOT, SPEC_DIR, list_specs, load_spec,
+    plate_size, render_cards, render_hero, render_plate,
+)
+
+GLYPH_ATLAS_PATH = os.path.join(REPO_ROOT, '.cache', 'glyph-atlas.json')
+
+# Draft renders (--draft): every length scaled down, for composition checks
+# and CI smoke passes
+DRAFT_DIR = os.path.join(REPO_ROOT, '.cache', 'hero-drafts')
+DRAFT_SCALE = 0.25
+
+# Font sizes worth loading before the first job arrives
+PRELOAD_SIZES = sorted({
+    DEFAULT_TEXT_STYLE['title_size'],
+    DEFAULT_TEXT_STYLE['subtitle_size'],
+    DEFAULT_TEXT_STYLE['label_size'],
+})
+
+
+# Slowest span names listed after a traced batch
+TRACE_TOP = 8
+
+
+def _init_worker(trace_path=None, trace_memory=False):
+    if trace_path:
+        hero_trace.enable(trace_path, trace_memory)
+    preload_fonts(PRELOAD_SIZES)
+    default_atlas().load(GLYPH_ATLAS_PATH)
+
+
+def render_stage(spec, background_cache=True):
+    """
+    Render one spec's master image and its social cards (saving any new
+    atlas glyphs). Returns (master, card name -> image).
+    """
+    cache = default_cache() if background_cache else None
+    img = render_hero(spec, cache.background_for(spec) if cache else None)
+    return img, card_stage(spec, cache)
+
+
+def card_stage(spec, cache=None):
+    """
+    Render spec's social cards from a scene plate (from cache, a
+    BackgroundCache, when given) and save any new atlas glyphs. Returns
+    card name -> image.
+    """
+    cards = {}
+    if CARDS:
+        sizes = {card: CARD_SIZES[card] for card in CARDS}
+        size = plate_size(sizes.values())
+        plate = cache.plate_for(spec, size) if cache else render_plate(spec, size)
+        cards = render_cards(spec, sizes, plate)
+    atlas = default_atlas()
+    if atlas.added:
+        atlas.save(GLYPH_ATLAS_PATH)
+    return cards
+
+
+def encode_stage(spec, rendered, png_mode=PNG_MODE):
+    """
+    (filename, bytes) outputs, the placeholder entry and the PNG-8 stats
+    (empty for a truecolor PNG) for render_stage()'s images
+    """
+    img, cards = rendered
+    stats = {}
+    outputs = derive_outputs(img, spec['slug'], png_mode=png_mode,
+                             seeds=seed_colors(spec), stats=stats, cards=cards)
+    entry = placeholder(img)
+    if cards:
+        entry['cards'] = card_entries(spec['slug'], cards)
+    return outputs, entry, stats
+
+
+def write_stage(output_dir, outputs):
+    """Atomically write outputs whose bytes changed; returns how many were written"""
+    written = 0
+    for filename, data in outputs:
+        if write_if_changed(os.path.join(output_dir, filename), data):
+            written += 1
+    return written
+
+
+def publish_stage(specs, output_dir, assets_path=ASSETS_PATH):
+    """
+    Link each spec's outputs under content-hashed names and merge their
+    entries into the assets_path manifest. Returns how many hashed names
+    were created.
+    """
+    assets = load_assets(assets_path)
+    created = 0
+    for spec in specs:
+        hashed, linked = publish_hashed(output_dir, output_names(spec['slug']))
+        assets[spec['slug']] = asset_entry(spec['slug'], spec.get('locale'), hashed)
+        created += linked
+    save_assets(assets_path, assets)
+    return created
+
+
+# ---------------------------------------------------------------------------
+# In-process pipeline: render -> encode -> write on separate threads
+# ---------------------------------------------------------------------------
+
+# Images waiting to be encoded, and encoded heroes waiting to be written
+PIPELINE_DEPTH = 2
+# Most specs one pool task renders; a worker's pipeline overlaps renders
+# within a task, and smaller tasks balance the load and report sooner
+CHUNK_SIZE = 4
+
+_DONE = object()
+
+
+class Pipeline:
+    """
+    Encode and write stages on their own threads, fed by bounded queues.
+
+    The caller renders on its own thread and submit()s each master image.
+    Pillow's zlib/WebP/AVIF encoders release the GIL, so rendering the next
+    hero overlaps encoding this one, and writing overlaps both. submit()
+    blocks while the encode queue is full, so at most about 2 * depth + 2
+    heroes (masters or encoded files) are held in memory at once.
+
+    Args:
+        output_dir: Directory outputs are written to
+        on_done: Called from the writer thread, in submission order, with
+            (spec, result, error): result is (slug, seconds spent in the
+            three stages not counting queueing, files written, placeholder
+            entry, PNG-8 stats), or None if error is set. An exception it raises doesn't stop the writer;
+            the first one is re-raised by close()
+        depth: Capacity of each queue
+        png_mode: PNG fallback mode (see hero_outputs.PNG_MODES)
+    """
+
+    def __init__(self, output_dir, on_done, depth=PIPELINE_DEPTH, png_mode=PNG_MODE):
+        self.output_dir = output_dir
+        self.on_done = on_done
+        self.png_mode = png_mode
+        self.encode_queue = queue.Queue(depth)
+        self.write_queue = queue.Queue(depth)
+        self.callback_error = None
+        self.threads = [
+            threading.Thread(target=self._encode_loop, name='hero-encode', daemon=True),
+            threading.Thread(target=self._write_loop, name='hero-write', daemon=True),
+        ]
+        for thread in self.threads:
+            thread.start()
+
+    def submit(self, spec, rendered, seconds):
+        """Queue render_stage()'s images; seconds is how long rendering them took"""
+        self.encode_queue.put((spec, rendered, seconds))
+
+    def _encode_loop(self):
+        while True:
+            item = self.encode_queue.get()
+            if item is _DONE:
+                self.write_queue.put(_DONE)
+                return
+            spec, rendered, seconds = item
+            start = time.perf_counter()
+            try:
+                with hero_trace.span('job:encode', cat='job', slug=spec['slug']):
+                    outputs, entry, stats = encode_stage(spec, rendered, self.png_mode)
+                seconds += time.perf_counter() - start
+                self.write_queue.put((spec, seconds, outputs, entry, stats, None))
+            except Exception as error:
+                self.write_queue.put((spec, seconds, None, None, None, error))
+
+    def _write_loop(self):
+        while True:
+            item = self.write_queue.get()
+            if item is _DONE:
+                return
+            spec, seconds, outputs, entry, stats, error = item
+            result = None
+            if error is None:
+                start = time.perf_counter()
+                try:
+                    with hero_trace.span('job:write', cat='job', slug=spec['slug']):
+                        written = write_stage(self.output_dir, outputs)
+                    seconds += time.perf_counter() - start
+                    result = (spec['slug'], seconds, written, entry, stats)
+                except Exception as write_error:
+                    error = write_error
+            try:
+                self.on_done(spec, result, error)
+            except Exception as callback_error:
+                # Keep draining, or the encoder blocks on a full write queue
+                if self.callback_error is None:
+                    self.callback_error = callback_error
+
+    def close(self):
+        """
+        Wait until everything submitted has been written, then re-raise the
+        first exception on_done raised, if any
+        """
+        self.encode_queue.put(_DONE)
+        for thread in self.threads:
+            thread.join()
+        hero_trace.flush()
+        if self.callback_error is not None:
+            raise self.callback_error
+
+
+def render_pipelined(specs, output_dir, on_done, background_cache=True, png_mode=PNG_MODE):
+    """
+    Render specs in order on this thread through a Pipeline, so each render
+    overlaps encoding and writing the previous hero. on_done is called with
+    (spec, result, error) for every spec (see Pipeline); for a failed render
+    it's called from this thread.
+    """
+    pipeline = Pipeline(output_dir, on_done, png_mode=png_mode)
+    try:
+        for spec in specs:
+            start = time.perf_counter()
+            try:
+                with hero_trace.span('job:render', cat='job', slug=spec['slug']):
+                    rendered = render_stage(spec, background_cache)
+            except Exception as error:
+                on_done(spec, None, error)
+                continue
+            pipeline.submit(spec, rendered, time.perf_counter() - start)
+    finally:
+        pipeline.close()
+
+
+def render_chunk(specs, output_dir, background_cache=True, png_mode=PNG_MODE):
+    """
+    Pool task: render_pipelined() over specs. Returns the (spec, result,
+    error) on_done would have received for each spec.
+    """
+    done = []
+    render_pipelined(specs, output_dir, lambda *args: done.append(args),
+                     background_cache, png_mode)
+    hero_trace.flush()
+    return done
+
+
+def render_batch(slugs, spec_dir=SPEC_DIR, output_dir=OUTPUT_DIR, jobs=None,
+                 force=False, placeholders_path=PLACEHOLDERS_PATH, report=print,
+                 background_cache=True, trace=None, trace_memory=False,
+                 png_mode=PNG_MODE, assets_path=None):
+    """
+    Render every slug whose inputs changed, in parallel when jobs > 1.
+
+    Placeholders for rendered slugs are merged into the placeholders_path
+    sidecar. Returns (results, skipped, failures): results is a list of
+    (slug, seconds, files written, placeholder), skipped a list of
+    up-to-date slugs and failures a list of (slug, exception). One job
+    failing never aborts the others. background_cache=False renders every
+    background from scratch.
+
+    trace: path for a Chrome trace of every job (see hero_trace.py), with
+    tracemalloc allocation deltas if trace_memory is set.
+
+    png_mode: 'palette' or 'palette-dither' ships a PNG-8 fallback; each
+    job then reports the bytes saved and its ΔE (see hero_quantize.py).
+
+    assets_path: when set, the outputs of every rendered or up-to-date slug
+    get content-hashed names, recorded in this asset manifest.
+    """
+    if trace:
+        hero_trace.enable(trace, trace_memory, clean=True)
+    os.makedirs(output_dir, exist_ok=True)
+    cache = RenderCache(output_dir)
+    placeholders = load_placeholders(placeholders_path)
+    results, skipped, failures = [], [], []
+
+    def record_failure(slug, error):
+        failures.append((slug, error))
+        report(f"✗ {slug}: {error}")
+
+    pending, fresh = [], []
+    for slug in slugs:
+        try:
+            spec = load_spec(slug, spec_dir)
+        except Exception as error:
+            record_failure(slug, error)
+            continue
+        digest = fingerprint(spec, output_settings(png_mode))
+        filenames = output_names(spec['slug'])
+        if not force and spec['slug'] in placeholders and cache.is_fresh(filenames, digest):
+            skipped.append(slug)
+            fresh.append(spec)
+        else:
+            pending.append((spec, filenames, digest))
+
+    def record_success(result, filenames, digest):
+        results.append(result)
+        cache.record(filenames, digest)
+        slug, seconds, written, entry, stats = result
+        placeholders[slug] = entry
+        png8 = ''
+        if stats:
+            png8 = (f", PNG-8 {stats['bytes'] / 1024:.0f} KB, "
+                    f"saved {stats['saved'] / 1024:.0f} KB, ΔE {stats['delta_e']}")
+        report(f"✓ {slug} ({seconds:.2f}s, {written}/{len(filenames)} files written{png8})")
+
+    outputs_of = {spec['slug']: (filenames, digest) for spec, filenames, digest in pending}
+
+    def on_done(spec, result, error):
+        if error is None:
+            record_success(result, *outputs_of[spec['slug']])
+        else:
+            record_failure(spec['slug'], error)
+
+    jobs = min(jobs or os.cpu_count() or 1, len(pending)) or 1
+    try:
+        if jobs == 1:
+            if pending:
+                _init_worker(trace, trace_memory)
+            render_pipelined([spec for spec, _, _ in pending], output_dir, on_done,
+                             background_cache, png_mode)
+        else:
+            size = min(CHUNK_SIZE, -(-len(pending) // jobs))
+            chunks = [[spec for spec, _, _ in pending[i:i + size]]
+                      for i in range(0, len(pending), size)]
+            with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                                     initargs=(trace, trace_memory)) as pool:
+                futures = {
+                    pool.submit(render_chunk, chunk, output_dir, background_cache, png_mode): chunk
+                    for chunk in chunks
+                }
+                for future in as_completed(futures):
+                    try:
+                        done = future.result()
+                    except Exception as error:
+                        for spec in futures[future]:
+                            record_failure(spec['slug'], error)
+                        continue
+                    for spec, result, error in done:
+                        on_done(spec, result, error)
+        if assets_path:
+            rendered = {result[0] for result in results}
+            published = fresh + [spec for spec, _, _ in pending if spec['slug'] in rendered]
+            created = publish_stage(published, output_dir, assets_path)
+            report(f"✓ Hashed names: {created} new for {len(published)} slugs -> {assets_path}")
+    finally:
+        cache.save()
+        save_placeholders(placeholders_path, placeholders)
+        if trace:
+            trace_path, summary_path, summary = hero_trace.finish()
+            report(f"✓ Trace: {trace_path} (summary: {summary_path})")
+            for name, row in list(summary.items())[:TRACE_TOP]:
+                report(f"  {name:<20} {row['count']:>4} x {row['mean_ms']:>8.1f} ms "
+                       f"= {row['total_ms']:>9.1f} ms")
+    return results, skipped, failures
+
+
+def draft_job(spec, draft_dir, scale=DRAFT_SCALE):
+    """Render spec at scale to <draft_dir>/<slug>.png; returns (slug, seconds)"""
+    start = time.perf_counter()
+    with hero_trace.span('job:draft', cat='job', slug=spec['slug']):
+        img = render_hero(spec, scale=scale)
+        buffer = io.BytesIO()
+        img.save(buffer, 'PNG', compress_level=1)
+        write_atomic(os.path.join(draft_dir, f"{spec['slug']}.png"), buffer.getvalue())
+    return spec['slug'], time.perf_counter() - start
+
+
+def render_drafts(slugs, spec_dir=SPEC_DIR, draft_dir=DRAFT_DIR, scale=DRAFT_SCALE, jobs=None,
+                  report=print):
+    """
+    Render every slug at scale into draft_dir, in parallel when jobs > 1.
+
+    Drafts skip the build cache, the background cache, encoding, social
+    cards and placeholders: every spec is rendered, and only the hero PNG
+    is written. Returns (results, failures) as (slug, seconds) and
+    (slug, exception) lists.
+    """
+    os.makedirs(draft_dir, exist_ok=True)
+    results, failures = [], []
+    specs = []
+    for slug in slugs:
+        try:
+            specs.append(load_spec(slug, spec_dir))
+        except Exception as error:
+            failures.append((slug, error))
+            report(f"✗ {slug}: {error}")
+
+    def record(spec, job):
+        try:
+            slug, seconds = job()
+        except Exception as error:
+            failures.append((spec['slug'], error))
+            report(f"✗ {spec['slug']}: {error}")
+            return
+        results.append((slug, seconds))
+        report(f"✓ {slug} ({seconds * 1000:.0f} ms)")
+
+    jobs = min(jobs or os.cpu_count() or 1, len(specs)) or 1
+    if jobs == 1:
+        if specs:
+            _init_worker()
+        for spec in specs:
+            record(spec, lambda: draft_job(spec, draft_dir, scale))
+    else:
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker) as pool:
+            futures = {pool.submit(draft_job, spec, draft_dir, scale): spec for spec in specs}
+            for future in as_completed(futures):
+                record(futures[future], future.result)
+    return results, failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Render blog hero images from specs')
+    parser.add_argument('slugs', nargs='*', help='Specs to render (default: all)')
+    parser.add_argument('--specs', default=SPEC_DIR, help='Spec directory')
+    parser.add_argument('--out', default=OUTPUT_DIR, help='Output directory')
+    parser.add_argument('--jobs', '-j', type=int, default=None,
+                        help='Worker processes (default: one per core)')
+    parser.add_argument('--force', action='store_true',
+                        help='Re-render even if the build cache says nothing changed')
+    parser.add_argument('--placeholders', default=PLACEHOLDERS_PATH,
+                        help='Blur placeholder / colour sidecar JSON')
+    parser.add_argument('--no-background-cache', dest='background_cache', action='store_false',
+                        help='Render every background instead of reusing cached ones')
+    parser.add_argument('--trace', metavar='PATH',
+                        help='Write a Chrome trace (Perfetto) of every stage to PATH')
+    parser.add_argument('--trace-memory', action='store_true',
+                        help='Record tracemalloc allocation deltas in the trace')
+    parser.add_argument('--png', choices=PNG_MODES, default=PNG_MODE,
+                        help='PNG fallback: 24-bit, or PNG-8 with an optional ordered dither')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='Only check specs and layouts (see hero_lint.py); print the JSON report')
+    parser.add_argument('--draft', type=float, nargs='?', const=DRAFT_SCALE, metavar='SCALE',
+                        help=f'Render scaled-down drafts only (default scale {DRAFT_SCALE})')
+    parser.add_argument('--draft-out', default=DRAFT_DIR, help='Directory drafts are written to')
+    parser.add_argument('--hashed', action='store_true',
+                        help='Also publish content-hashed names and write the asset manifest')
+    parser.add_argument('--assets', default=ASSETS_PATH, help='Asset manifest JSON (with --hashed)')
+    parser.add_argument('--prune-hashed', action='store_true',
+                        help='Only remove hashed files the asset manifest no longer references')
+    args = parser.parse_args(argv)
+    if args.draft is not None and not 0 < args.draft <= 1:
+        parser.error('--draft scale must be in (0, 1]')
+
+    if args.dry_run:
+        report = lint(args.slugs, args.specs, args.out)
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+        print_summary(report)
+        return 0 if report['ok'] else 1
+
+    if args.prune_hashed:
+        removed = prune_hashed(args.out, load_assets(args.assets))
+        print(f"✓ Removed {len(removed)} superseded hashed files from {args.out}")
+        return 0
+
+    slugs = args.slugs or list_specs(args.specs)
+    start = time.perf_counter()
+    if args.draft is not None:
+        results, failures = render_drafts(slugs, args.specs, args.draft_out, args.draft, args.jobs)
+        print(f"\n{len(results)} drafts at {args.draft:g}x, {len(failures)} failed "
+              f"in {time.perf_counter() - start:.2f}s -> {args.draft_out}")
+        return 1 if failures else 0
+
+    try:
+        check_encoders()
+    except RuntimeError as error:
+        print(f"✗ {error}")
+        return 1
+    results, skipped, failures = render_batch(
+        slugs, args.specs, args.out, args.jobs, force=args.force,
+        placeholders_path=args.placeholders, background_cache=args.background_cache,
+        trace=args.trace, trace_memory=args.trace_memory, png_mode=args.png,
+        assets_path=args.assets if args.hashed else None)
+    elapsed = time.perf_counter() - start
+
+    print(f"\n{len(results)} rendered, {len(skipped)} up to date, "
+          f"{len(failures)} failed in {elapsed:.2f}s")
+    if results:
+        slowest = max(results, key=lambda result: result[1])
+        print(f"Slowest: {slowest[0]} ({slowest[1]:.2f}s)")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
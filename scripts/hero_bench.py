@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Stage-level benchmark for the hero renderer.
+
+Renders a fixed corpus (every theme in data/hero-specs plus long CJK and
+English titles on each theme) and times each stage on its own:
+
+    orbs     gradient orb layers (draw_gradient_circle)
+    motifs   every other layer
+    blur     the depth blur
+    text     title, subtitle and label (draw_text_masked)
+    encode   PNG fallback plus the WebP/AVIF ladder
+
+Timing runs use perf_counter with tracemalloc off. A separate pass under
+tracemalloc records each stage's peak Python/NumPy allocation. Pillow's own
+image buffers are not visible to tracemalloc.
+
+Results are written as JSON. With a baseline, any stage whose mean grows by
+more than the threshold fails the run (exit status 1).
+
+Usage:
+    python3 scripts/hero_bench.py              # compare against the baseline if present
+    python3 scripts/hero_bench.py --runs 10 --update-baseline
+    python3 scripts/hero_bench.py --stages orbs text --threshold 0.1
+"""
+
+import argparse
+import json
+import math
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+import PIL
+from PIL import ImageDraw
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from hero_batch import _init_worker
+from hero_outputs import derive_outputs
+from hero_renderer import (
+    REPO_ROOT, SPEC_DIR, Canvas, depth_blur, draw_layer, draw_text, list_specs, load_spec,
+)
+
+BENCH_DIR = os.path.join(REPO_ROOT, '.cache', 'hero-bench')
+RESULTS_PATH = os.path.join(BENCH_DIR, 'latest.json')
+BASELINE_PATH = os.path.join(BENCH_DIR, 'baseline.json')
+
+STAGES = ('orbs', 'motifs', 'blur', 'text', 'encode')
+DEFAULT_RUNS = 5
+DEFAULT_THRESHOLD = 0.25   # fail when a stage's mean is 25% slower than baseline
+NOISE_FLOOR_MS = 2.0       # ignore regressions smaller than this in absolute terms
+
+LONG_TITLES = {
+    'long-zh': '从零开始的智能合约安全审计：重入攻击、整数溢出、'
+               '权限控制与预言机操纵的系统化防御实践',
+    'long-en': 'A Practical Field Guide to Smart Contract Security Audits: Reentrancy, '
+               'Oracle Manipulation and Access Control',
+}
+
+
+def build_corpus(spec_dir=SPEC_DIR):
+    """(name, spec) pairs: every spec plus a long-title variant per theme"""
+    corpus = []
+    for slug in list_specs(spec_dir):
+        spec = load_spec(slug, spec_dir)
+        corpus.append((slug, spec))
+    # Only specs with their own art are themes; locale twins reuse one
+    themes = [
+        (slug, spec) for slug, spec in corpus
+        if not _extends(slug, spec_dir)
+    ]
+    for slug, spec in themes:
+        for variant, title in LONG_TITLES.items():
+            long_spec = dict(spec, slug=f'{slug}-{variant}')
+            long_spec['text'] = dict(spec.get('text', {}), title=title)
+            corpus.append((long_spec['slug'], long_spec))
+    return corpus
+
+
+def _extends(slug, spec_dir):
+    with open(os.path.join(spec_dir, f'{slug}.json'), encoding='utf-8') as f:
+        return 'extends' in json.load(f)
+
+
+def render_stages(spec, clock, encode=True):
+    """
+    Run the render pipeline for one spec, calling clock(stage) around each
+    stage. clock(stage) returns a context manager.
+    """
+    canvas = Canvas(spec)
+    layers = spec.get('layers', [])
+    with clock('orbs'):
+        for layer in layers:
+            if layer['type'] == 'orbs':
+                draw_layer(canvas, layer)
+    with clock('motifs'):
+        for layer in layers:
+            if layer['type'] != 'orbs':
+                draw_layer(canvas, layer)
+    with clock('blur'):
+        canvas.img = depth_blur(canvas.img, canvas.dirty)
+    with clock('text'):
+        canvas.draw = ImageDraw.Draw(canvas.img, 'RGBA')
+        draw_text(canvas, spec.get('text', {}))
+    if encode:
+        with clock('encode'):
+            derive_outputs(canvas.img, spec['slug'])
+
+
+class _Timer:
+    """clock() for timing runs: appends elapsed ms per stage"""
+
+    def __init__(self, samples):
+        self.samples = samples
+        self.stage = None
+
+    def __call__(self, stage):
+        self.stage = stage
+        return self
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc):
+        self.samples[self.stage].append((time.perf_counter() - self.start) * 1000)
+
+
+class _MemoryProbe:
+    """clock() for the tracemalloc pass: keeps each stage's peak bytes"""
+
+    def __init__(self, peaks):
+        self.peaks = peaks
+        self.stage = None
+
+    def __call__(self, stage):
+        self.stage = stage
+        return self
+
+    def __enter__(self):
+        tracemalloc.reset_peak()
+        self.base = tracemalloc.get_traced_memory()[0]
+
+    def __exit__(self, *exc):
+        peak = tracemalloc.get_traced_memory()[1] - self.base
+        self.peaks[self.stage] = max(self.peaks.get(self.stage, 0), peak)
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a non-empty list"""
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def run_benchmark(corpus, runs=DEFAULT_RUNS, stages=STAGES, report=print):
+    """
+    Benchmark the corpus and return the results dict.
+
+    One untimed warm-up pass loads fonts and fills the gradient geometry
+    caches, so the timings reflect steady-state batch rendering. Encoding,
+    the last and slowest stage, is skipped unless 'encode' is in stages.
+    """
+    _init_worker()
+    encode = 'encode' in stages
+    samples = {stage: [] for stage in STAGES}
+    for _, spec in corpus:
+        render_stages(spec, _Timer({stage: [] for stage in STAGES}), encode)
+
+    timer = _Timer(samples)
+    for run in range(runs):
+        for _, spec in corpus:
+            render_stages(spec, timer, encode)
+        report(f"  run {run + 1}/{runs}")
+
+    peaks = {}
+    tracemalloc.start()
+    try:
+        probe = _MemoryProbe(peaks)
+        for _, spec in corpus:
+            render_stages(spec, probe, encode)
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'meta': {
+            'date': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'pillow': PIL.__version__,
+            'numpy': np.__version__ if np is not None else None,
+            'machine': platform.machine(),
+            'cpus': os.cpu_count(),
+            'runs': runs,
+            'corpus': [name for name, _ in corpus],
+        },
+        'stages': {
+            stage: {
+                'mean_ms': round(sum(samples[stage]) / len(samples[stage]), 3),
+                'p95_ms': round(percentile(samples[stage], 95), 3),
+                'samples': len(samples[stage]),
+                'peak_kb': round(peaks.get(stage, 0) / 1024, 1),
+            }
+            for stage in stages
+        },
+    }
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """(stage, baseline mean, current mean) for every stage that regressed"""
+    regressions = []
+    for stage, current in results['stages'].items():
+        previous = baseline.get('stages', {}).get(stage)
+        if previous is None:
+            continue
+        before, after = previous['mean_ms'], current['mean_ms']
+        if after > before * (1 + threshold) and after - before > NOISE_FLOOR_MS:
+            regressions.append((stage, before, after))
+    return regressions
+
+
+def _save(path, results):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+        f.write('\n')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark hero rendering stage by stage')
+    parser.add_argument('--specs', default=SPEC_DIR, help='Spec directory')
+    parser.add_argument('--runs', type=int, default=DEFAULT_RUNS, help='Timed passes over the corpus')
+    parser.add_argument('--stages', nargs='+', choices=STAGES, default=list(STAGES),
+                        help='Stages to report and compare (without encode, encoding is skipped)')
+    parser.add_argument('--output', default=RESULTS_PATH, help='Where to write results JSON')
+    parser.add_argument('--baseline', default=BASELINE_PATH, help='Baseline results JSON')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='Allowed slowdown of a stage mean, as a fraction')
+    parser.add_argument('--update-baseline', action='store_true',
+                        help='Store these results as the new baseline')
+    args = parser.parse_args(argv)
+
+    corpus = build_corpus(args.specs)
+    print(f"Benchmarking {len(corpus)} heroes x {args.runs} runs")
+    results = run_benchmark(corpus, args.runs, args.stages)
+    _save(args.output, results)
+
+    print(f"\n{'stage':<8} {'mean ms':>9} {'p95 ms':>9} {'peak KB':>9}")
+    for stage, row in results['stages'].items():
+        print(f"{stage:<8} {row['mean_ms']:>9.1f} {row['p95_ms']:>9.1f} {row['peak_kb']:>9.0f}")
+    print(f"\n✓ Results: {args.output}")
+
+    if args.update_baseline:
+        _save(args.baseline, results)
+        print(f"✓ Baseline updated: {args.baseline}")
+        return 0
+
+    try:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+    except FileNotFoundError:
+        print("No baseline yet; run with --update-baseline to store one")
+        return 0
+
+    regressions = compare(results, baseline, args.threshold)
+    for stage, before, after in regressions:
+        print(f"✗ {stage} regressed: {before:.1f} ms -> {after:.1f} ms "
+              f"(+{(after / before - 1) * 100:.0f}%)")
+    if not regressions:
+        print(f"✓ No stage slower than baseline by more than {args.threshold:.0%}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Incremental build cache for hero rendering.
+
+Each output file is recorded in a manifest under .cache/ (with the other
+build state, out of the served public/ tree) together with a fingerprint of
+everything that affects its pixels: the resolved spec (text, palette,
+layers), the renderer version and the font files. A job whose fingerprint
+matches the manifest, and whose output still exists, is skipped.
+Re-rendered outputs are only written when their bytes actually change, so
+unchanged files keep their mtime and CDN caches stay valid.
+"""
+
+import hashlib
+import json
+import os
+import threading
+
+from draw_text_mixed_fonts import CHINESE_FONT, ENGLISH_FONT
+from hero_renderer import RENDERER_VERSION, REPO_ROOT
+
+MANIFEST_PATH = os.path.join(REPO_ROOT, '.cache', 'hero-manifest.json')
+# Where earlier builds kept the manifest, inside the (publicly served) output directory
+LEGACY_MANIFEST_NAME = '.hero-manifest.json'
+
+_font_hashes = {}
+
+
+def file_hash(path):
+    """sha256 of a file's contents, or 'missing' if it doesn't exist"""
+    digest = hashlib.sha256()
+    try:
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+    except FileNotFoundError:
+        return 'missing'
+    return digest.hexdigest()
+
+
+def font_hashes():
+    """Hashes of both text fonts, computed once per process"""
+    for path in (CHINESE_FONT, ENGLISH_FONT):
+        if path not in _font_hashes:
+            _font_hashes[path] = file_hash(path)
+    return [_font_hashes[CHINESE_FONT], _font_hashes[ENGLISH_FONT]]
+
+
+def fingerprint(spec, extra=None):
+    """
+    Stable hash of a resolved spec plus renderer version and fonts.
+
+    extra: anything else that changes the output (e.g. encoder settings).
+    """
+    payload = {
+        'spec': spec,
+        'renderer': RENDERER_VERSION,
+        'fonts': font_hashes(),
+        'extra': extra,
+    }
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+def write_atomic(path, data):
+    """
+    Write bytes to a temp file beside path and rename it into place, so
+    readers (nginx, another worker) see the old file or the new one, never
+    a partial write
+    """
+    temp = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    try:
+        with open(temp, 'wb') as f:
+            f.write(data)
+        os.replace(temp, path)
+    except BaseException:
+        if os.path.exists(temp):
+            os.remove(temp)
+        raise
+
+
+def write_if_changed(path, data):
+    """Atomically write bytes to path unless the file already holds exactly them"""
+    try:
+        with open(path, 'rb') as f:
+            if f.read() == data:
+                return False
+    except FileNotFoundError:
+        pass
+    write_atomic(path, data)
+    return True
+
+
+def _dir_key(output_dir):
+    """Manifest key for an output directory: relative to the repo when inside it"""
+    path = os.path.abspath(output_dir)
+    relative = os.path.relpath(path, REPO_ROOT)
+    return path if relative.startswith('..') else relative
+
+
+class RenderCache:
+    """
+    Manifest of output filename -> input fingerprint for one output
+    directory. The manifest file holds a section per output directory.
+
+    Args:
+        output_dir: Directory the outputs are written to
+        path: Manifest JSON
+    """
+
+    def __init__(self, output_dir, path=MANIFEST_PATH):
+        self.output_dir = output_dir
+        self.path = path
+        self.key = _dir_key(output_dir)
+        self.entries = self._read().get(self.key, {})
+        self.dirty = False
+
+    def _read(self):
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def is_fresh(self, filenames, digest):
+        """True if every file was last built from digest and is still on disk"""
+        return all(
+            self.entries.get(filename) == digest
+            and os.path.exists(os.path.join(self.output_dir, filename))
+            for filename in filenames
+        )
+
+    def record(self, filenames, digest):
+        for filename in filenames:
+            if self.entries.get(filename) != digest:
+                self.entries[filename] = digest
+                self.dirty = True
+
+    def save(self):
+        if not self.dirty:
+            return
+        # Other output directories' sections are kept as they are on disk
+        sections = self._read()
+        sections[self.key] = self.entries
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        data = json.dumps(sections, ensure_ascii=False, indent=2, sort_keys=True) + '\n'
+        write_atomic(self.path, data.encode('utf-8'))
+        self.dirty = False
+        legacy = os.path.join(self.output_dir, LEGACY_MANIFEST_NAME)
+        if os.path.exists(legacy):
+            os.remove(legacy)
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Display list for the translucent primitives motif layers stack up.
+
+Glows are stacks of nested translucent shapes in one colour: concentric
+discs for nodes, pans and the core, expanded polygons for the shield.
+Blending each shape straight into the 8-bit canvas costs a full blend per
+shape and rounds after every one. A DisplayList records each stack with its
+bounding box instead. composite() then:
+
+- rasterizes each stack in bulk into one index mask, where a pixel holds the
+  number of shapes covering it;
+- maps that count through a per-stack table of premultiplied colour and
+  transmittance;
+- accumulates the stacks in float, cluster by cluster, over only the
+  regions they touch;
+- blends each cluster onto the canvas and converts it to 8 bits once.
+
+Without NumPy, composite() draws the recorded shapes one by one with
+ImageDraw, as before.
+"""
+
+import math
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from PIL import Image, ImageDraw
+
+
+def _draw_disc(draw, dx, dy, shape, fill):
+    x, y, r = shape
+    draw.ellipse([x - r - dx, y - r - dy, x + r - dx, y + r - dy], fill=fill)
+
+
+def _draw_polygon(draw, dx, dy, shape, fill):
+    draw.polygon([(x - dx, y - dy) for x, y in shape], fill=fill)
+
+
+# kind -> function drawing one shape at an offset, used for masks and the fallback
+RASTERIZERS = {
+    'disc': _draw_disc,
+    'polygon': _draw_polygon,
+}
+
+
+def _overlaps(a, b):
+    return a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]
+
+
+def _union(a, b):
+    return min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3])
+
+
+class Stack:
+    """
+    Nested translucent shapes in one colour, added outermost first.
+
+    Each shape must lie inside the previous one (as glow rings do), so the
+    shapes covering a pixel are always the first k. Up to 255 shapes.
+    """
+
+    def __init__(self, color, origin=(0, 0)):
+        self.color = color[:3]
+        self.origin = origin
+        self.shapes = []
+        self.bbox = None
+
+    def _add(self, kind, shape, alpha, bbox):
+        if alpha <= 0:
+            return
+        self.shapes.append((kind, shape, alpha))
+        bbox = (math.floor(bbox[0]) - 1, math.floor(bbox[1]) - 1,
+                math.ceil(bbox[2]) + 2, math.ceil(bbox[3]) + 2)
+        self.bbox = bbox if self.bbox is None else _union(self.bbox, bbox)
+
+    def disc(self, x, y, r, alpha):
+        """Filled circle of radius r at (x, y), alpha 0-255"""
+        if r > 0:
+            x, y = x - self.origin[0], y - self.origin[1]
+            self._add('disc', (x, y, r), alpha, (x - r, y - r, x + r, y + r))
+
+    def polygon(self, points, alpha):
+        """Filled polygon, alpha 0-255"""
+        dx, dy = self.origin
+        points = [(x - dx, y - dy) for x, y in points]
+        xs = [x for x, _ in points]
+        ys = [y for _, y in points]
+        self._add('polygon', points, alpha, (min(xs), min(ys), max(xs), max(ys)))
+
+    def table(self):
+        """
+        (transmittance, premultiplied colour) arrays indexed by how many
+        shapes cover a pixel
+        """
+        count = len(self.shapes)
+        transmittance = np.ones(count + 1, dtype=np.float32)
+        color = np.zeros((count + 1, 3), dtype=np.float32)
+        rgb = np.asarray(self.color, dtype=np.float32)
+        for k, (_, _, alpha) in enumerate(self.shapes, 1):
+            a = alpha / 255
+            transmittance[k] = transmittance[k - 1] * (1 - a)
+            color[k] = color[k - 1] * (1 - a) + rgb * a
+        return transmittance, color
+
+
+class DisplayList:
+    """
+    Glow stacks recorded for one composite() into an image.
+
+    Args:
+        img: RGB image composite() blends into
+        dirty: Optional list the box of every composited cluster is appended to
+        origin: Canvas position of img's top-left pixel; shapes are given in
+            canvas coordinates and shifted by -origin
+    """
+
+    def __init__(self, img, dirty=None, origin=(0, 0)):
+        self.img = img
+        self.dirty = dirty
+        self.origin = origin
+        self.stacks = []
+
+    def stack(self, color):
+        """Start a new stack of nested shapes in color; returns the Stack"""
+        stack = Stack(color, self.origin)
+        self.stacks.append(stack)
+        return stack
+
+    def _clusters(self):
+        """Group stacks (in order) into clusters whose bounding boxes overlap"""
+        clusters = []
+        for stack in self.stacks:
+            if not stack.shapes:
+                continue
+            bbox = stack.bbox
+            members = [stack]
+            for cluster in [c for c in clusters if _overlaps(c[0], bbox)]:
+                clusters.remove(cluster)
+                bbox = _union(bbox, cluster[0])
+                members = cluster[1] + members
+            clusters.append((bbox, members))
+        return clusters
+
+    def composite(self):
+        """Blend every recorded stack, in order, into the image and clear the list"""
+        if np is None:
+            draw = ImageDraw.Draw(self.img, 'RGBA')
+            for stack in self.stacks:
+                if self.dirty is not None and stack.shapes:
+                    self.dirty.append(stack.bbox)
+                for kind, shape, alpha in stack.shapes:
+                    RASTERIZERS[kind](draw, 0, 0, shape, stack.color + (alpha,))
+            self.stacks = []
+            return
+
+        for bbox, members in self._clusters():
+            left, top = max(0, bbox[0]), max(0, bbox[1])
+            right, bottom = min(self.img.width, bbox[2]), min(self.img.height, bbox[3])
+            if left >= right or top >= bottom:
+                continue
+            box = (left, top, right, bottom)
+            if self.dirty is not None:
+                self.dirty.append(box)
+            dst = np.asarray(self.img.crop(box), dtype=np.float32)
+            if len(members) == 1:
+                # The common case: one glow on its own needs no accumulation
+                color, t = _coverage(members[0], box)
+                out = color + dst * t
+            else:
+                # Premultiplied colour and remaining transmittance of the cluster
+                acc = np.zeros_like(dst)
+                acc_t = np.ones(dst.shape[:2] + (1,), dtype=np.float32)
+                for stack in members:
+                    x0, y0 = max(left, stack.bbox[0]), max(top, stack.bbox[1])
+                    x1, y1 = min(right, stack.bbox[2]), min(bottom, stack.bbox[3])
+                    if x0 >= x1 or y0 >= y1:
+                        continue
+                    color, t = _coverage(stack, (x0, y0, x1, y1))
+                    region = (slice(y0 - top, y1 - top), slice(x0 - left, x1 - left))
+                    acc[region] = color + acc[region] * t
+                    acc_t[region] *= t
+                out = acc + dst * acc_t
+            out += 0.5
+            self.img.paste(Image.fromarray(out.astype(np.uint8)), box)
+        self.stacks = []
+
+
+def _coverage(stack, box):
+    """
+    Premultiplied colour (h, w, 3) and transmittance (h, w, 1) of a stack
+    over box, from one index mask of how many shapes cover each pixel
+    """
+    x0, y0, x1, y1 = box
+    mask = Image.new('L', (x1 - x0, y1 - y0), 0)
+    draw = ImageDraw.Draw(mask)
+    for k, (kind, shape, _) in enumerate(stack.shapes, 1):
+        RASTERIZERS[kind](draw, x0, y0, shape, k)
+    index = np.asarray(mask)
+    transmittance, color = stack.table()
+    return color[index], transmittance[index][:, :, None]
@@ -0,0 +1,390 @@
+#!/usr/bin/env python3
+"""
+Content-hash and perceptual-hash index of public/blog-images.
+
+When the hero renderer is unavailable, the article pipeline copies an
+existing hero as a placeholder (copyPlaceholderHero in
+ai-create-article-v2.ts). Those copies are byte-identical files under
+different slugs, so browsers and the CDN download and cache each of them
+separately, and the articles keep someone else's art.
+
+Every image in the folder is indexed with:
+
+    sha256   content hash: byte-identical files
+    dhash    64-bit difference hash of a 9x8 grayscale thumbnail: the same
+             picture re-encoded, resized or with small edits. Distinct heroes
+             differ in 15+ bits; NEAR_DISTANCE or fewer counts as the same
+
+The index lives in .cache/hero-image-index.json and is keyed by file name
+with its size, mtime and inode, so a re-check only hashes files that changed.
+
+A slug is on placeholder art when its <slug>-hero.png matches another
+slug's hero and it has no spec in data/hero-specs (the renderer never drew
+it). --queue writes a spec for each one, titled from messages/<locale>.json
+with the category's template art (as hero_service.py does), so the next
+hero_batch.py run renders it.
+
+--collapse serves each set of byte-identical files from one URL until then:
+the group's canonical copy gets a content-hashed name (as with
+hero_batch.py --hashed), and every slug in the group points at it in
+data/hero-assets.json, so pages, browsers and the CDN fetch those bytes once.
+The copies are also hard-linked together, which only saves local disk: git
+and deploys don't keep links. Rendering a slug and publishing it with
+hero_batch.py --hashed replaces its entry with its own art.
+
+Content-hashed names (hero_batch.py --hashed) are links to the outputs
+they were published from and are left out of the index.
+
+Usage:
+    python3 scripts/hero_index.py                 # update the index, report duplicates
+    python3 scripts/hero_index.py --queue         # write specs for placeholder slugs
+    python3 scripts/hero_index.py --collapse      # one shared URL (and stored file) per duplicate
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+
+from PIL import Image
+
+from hero_cache import file_hash, write_atomic
+from hero_outputs import (
+    ASSETS_PATH, asset_entry, is_hashed, load_assets, publish_hashed, save_assets,
+)
+from hero_renderer import OUTPUT_DIR, REPO_ROOT, SPEC_DIR, list_specs
+from hero_service import build_spec, save_spec
+
+INDEX_PATH = os.path.join(REPO_ROOT, '.cache', 'hero-image-index.json')
+MESSAGES_DIR = os.path.join(REPO_ROOT, 'messages')
+INDEX_VERSION = 1  # bump when the entry format changes
+
+IMAGE_EXTENSIONS = ('.png', '.webp', '.avif', '.jpg', '.jpeg')
+HASH_SIZE = 8       # dHash grid: HASH_SIZE ** 2 bits
+NEAR_DISTANCE = 6   # differing dHash bits still counted as the same picture
+
+# <slug>-hero.png, <slug>-hero-<w>.webp, <slug>-hero-3840.png (hero_tiles), <slug>-og.jpg, ...
+OUTPUT_NAME = re.compile(r'^(?P<slug>.+)-(?:hero(?:-\d+)?|og|square|portrait)\.[a-z]+$')
+
+# Category names used in messages/*.json -> hero_service categories, as in
+# the article pipeline's mapCategoryToEnglish
+CATEGORY_NAMES = {
+    '安全': 'security',
+    '教程': 'tutorial',
+    '研究': 'research',
+    '分析': 'analysis',
+}
+
+
+def slug_of(name):
+    """Slug an output file belongs to, or None for other images"""
+    match = OUTPUT_NAME.match(name)
+    return match.group('slug') if match else None
+
+
+def dhash(img, size=HASH_SIZE):
+    """Difference hash: one bit per pixel, set where it's brighter than its right neighbour"""
+    thumb = img.convert('L').resize((size + 1, size), Image.LANCZOS)
+    pixels = thumb.tobytes()
+    value = 0
+    for y in range(size):
+        row = pixels[y * (size + 1):(y + 1) * (size + 1)]
+        for x in range(size):
+            value = (value << 1) | (row[x] > row[x + 1])
+    return value
+
+
+def hamming(a, b):
+    return (a ^ b).bit_count()
+
+
+class ImageIndex:
+    """
+    sha256 and dHash of every image in a directory, refreshed incrementally.
+
+    Args:
+        path: Index JSON file
+    """
+
+    def __init__(self, path=INDEX_PATH):
+        self.path = path
+        self.entries = {}
+        try:
+            with open(path, encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == INDEX_VERSION:
+                self.entries = data['entries']
+        except (OSError, ValueError):
+            pass
+
+    def update(self, image_dir):
+        """
+        Index every image in image_dir, hashing only new or changed files.
+        Returns how many files were hashed.
+        """
+        entries = {}
+        hashed = 0
+        for entry in os.scandir(image_dir):
+            if not entry.name.lower().endswith(IMAGE_EXTENSIONS) or not entry.is_file():
+                continue
+            if is_hashed(entry.name):
+                continue  # hashed links to outputs (hero_batch.py --hashed), not copies
+            stat = entry.stat()
+            known = self.entries.get(entry.name)
+            if (known and known['size'] == stat.st_size and known['mtime_ns'] == stat.st_mtime_ns
+                    and known['inode'] == stat.st_ino):
+                entries[entry.name] = known
+                continue
+            try:
+                with Image.open(entry.path) as img:
+                    width, height = img.size
+                    digest = dhash(img)
+            except OSError as error:
+                print(f"✗ {entry.name}: {error}", file=sys.stderr)
+                continue
+            entries[entry.name] = {
+                'size': stat.st_size,
+                'mtime_ns': stat.st_mtime_ns,
+                'inode': stat.st_ino,
+                'sha256': file_hash(entry.path),
+                'dhash': f'{digest:0{HASH_SIZE ** 2 // 4}x}',
+                'width': width,
+                'height': height,
+            }
+            hashed += 1
+        self.entries = entries
+        return hashed
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        payload = json.dumps({'version': INDEX_VERSION, 'entries': self.entries},
+                             ensure_ascii=False, indent=2, sort_keys=True)
+        write_atomic(self.path, (payload + '\n').encode('utf-8'))
+
+
+def _canonical(names, entries, spec_slugs):
+    """The copy to keep: a rendered hero first, then the oldest, then by name"""
+    return min(names, key=lambda name: (slug_of(name) not in spec_slugs,
+                                        entries[name]['mtime_ns'], name))
+
+
+def stored_twice(groups, entries):
+    """Bytes taken by copies that aren't hard links to an earlier one"""
+    return sum(
+        entries[names[0]]['size'] * (len({entries[name]['inode'] for name in names}) - 1)
+        for names in groups
+    )
+
+
+def exact_groups(entries):
+    """Lists of two or more names with the same sha256"""
+    by_hash = {}
+    for name in sorted(entries):
+        by_hash.setdefault(entries[name]['sha256'], []).append(name)
+    return [names for names in by_hash.values() if len(names) > 1]
+
+
+def near_pairs(entries, names=None):
+    """
+    (a, b, distance) for images of different slugs and the same size whose
+    dHashes are within NEAR_DISTANCE bits but whose bytes differ. Each set
+    of byte-identical files is represented by its first name.
+    """
+    representatives = {}
+    for name in sorted(names if names is not None else entries):
+        representatives.setdefault(entries[name]['sha256'], name)
+    names = sorted(representatives.values())
+    hashes = {name: int(entries[name]['dhash'], 16) for name in names}
+    pairs = []
+    for i, a in enumerate(names):
+        for b in names[i + 1:]:
+            ea, eb = entries[a], entries[b]
+            if (ea['width'], ea['height']) != (eb['width'], eb['height']) or slug_of(a) == slug_of(b):
+                continue
+            distance = hamming(hashes[a], hashes[b])
+            if distance <= NEAR_DISTANCE:
+                pairs.append((a, b, distance))
+    return pairs
+
+
+def find_placeholders(entries, spec_slugs):
+    """
+    {slug: name of the hero it copies} for every <slug>-hero.png that
+    matches another slug's hero and has no spec
+    """
+    heroes = {name: entries[name] for name in entries if name.endswith('-hero.png')}
+    copies = {}
+    for names in exact_groups(heroes):
+        for name in names:
+            copies[name] = set(names)
+    matches = {}
+    for name in heroes:
+        matches[name] = set(copies.get(name, {name}))
+    for a, b, _ in near_pairs(heroes):
+        group = copies.get(a, {a}) | copies.get(b, {b})
+        for name in group:
+            matches[name] |= group
+
+    placeholders = {}
+    for name, group in matches.items():
+        source = _canonical(group, entries, spec_slugs)
+        slug = slug_of(name)
+        if name != source and slug not in spec_slugs:
+            placeholders[slug] = source
+    return placeholders
+
+
+def article_text(slug, messages_dir=MESSAGES_DIR):
+    """(locale, title, category) for slug from messages/<locale>.json, or None"""
+    found = {}
+    for locale in ('en', 'zh'):
+        try:
+            with open(os.path.join(messages_dir, f'{locale}.json'), encoding='utf-8') as f:
+                article = json.load(f).get('blog', {}).get('articles', {}).get(slug)
+        except (OSError, ValueError):
+            continue
+        if article and article.get('title'):
+            found[locale] = article
+    # English slugs are listed in both files; their hero is drawn in English
+    locale = 'en' if 'en' in found and slug.isascii() else 'zh' if 'zh' in found else None
+    if locale is None:
+        locale = next(iter(found), None)
+    if locale is None:
+        return None
+    article = found[locale]
+    category = article.get('category', '').lower()
+    return locale, article['title'], CATEGORY_NAMES.get(category, category)
+
+
+def queue_placeholders(slugs, spec_dir=SPEC_DIR, messages_dir=MESSAGES_DIR):
+    """
+    Write a spec for each slug so hero_batch.py renders it. Returns
+    (queued slugs, slugs with no title in the messages files).
+    """
+    queued, untitled = [], []
+    for slug in sorted(slugs):
+        text = article_text(slug, messages_dir)
+        if text is None:
+            untitled.append(slug)
+            continue
+        locale, title, category = text
+        save_spec(build_spec({'slug': slug, 'locale': locale, 'title': title,
+                              'category': category}), spec_dir)
+        queued.append(slug)
+    return queued, untitled
+
+
+def collapse(groups, image_dir, entries, spec_slugs):
+    """
+    Hard-link every file in each group to its canonical copy, so identical
+    images take one stored object, and point their index entries at it.
+    Renderer writes replace files by rename, so re-rendering one of them
+    later only unlinks that name. Returns (files linked, bytes freed).
+    """
+    linked = freed = 0
+    for names in groups:
+        canonical = _canonical(names, entries, spec_slugs)
+        source = os.path.join(image_dir, canonical)
+        for name in names:
+            path = os.path.join(image_dir, name)
+            if os.path.samefile(path, source):
+                continue
+            temp = f'{path}.{os.getpid()}.link'
+            os.link(source, temp)
+            os.replace(temp, path)  # atomic: readers see the old or the linked file
+            freed += entries[name]['size']
+            entries[name] = dict(entries[canonical])
+            linked += 1
+    return linked, freed
+
+
+def share_urls(groups, image_dir, entries, spec_slugs, assets, messages_dir=MESSAGES_DIR):
+    """
+    Point every slug with a file in one of groups at the content-hashed name
+    of the group's canonical copy, in the asset manifest dict assets, so all
+    of them load the same URL. Returns the slugs whose entries changed.
+    """
+    shared = {}
+    for names in groups:
+        canonical = _canonical(names, entries, spec_slugs)
+        hashed, _ = publish_hashed(image_dir, [canonical])
+        for name in names:
+            if slug_of(name) is not None:
+                shared.setdefault(slug_of(name), {})[name] = hashed[canonical]
+
+    changed = []
+    for slug, hashed in sorted(shared.items()):
+        entry = assets.get(slug)
+        if entry is None:
+            text = article_text(slug, messages_dir)
+            entry = {'locale': text[0] if text else None, 'hero': {}, 'cards': {}}
+        update = asset_entry(slug, entry['locale'], hashed)
+        merged = dict(entry, hero={fmt: dict(srcs) for fmt, srcs in entry['hero'].items()},
+                      cards=dict(entry['cards'], **update['cards']))
+        for fmt, srcs in update['hero'].items():
+            merged['hero'].setdefault(fmt, {}).update(srcs)
+        if merged != assets.get(slug):
+            assets[slug] = merged
+            changed.append(slug)
+    return changed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Index blog images and find placeholder duplicates')
+    parser.add_argument('--images', default=OUTPUT_DIR, help='Image directory')
+    parser.add_argument('--specs', default=SPEC_DIR, help='Spec directory')
+    parser.add_argument('--index', default=INDEX_PATH, help='Index JSON')
+    parser.add_argument('--queue', action='store_true',
+                        help='Write specs for placeholder slugs so hero_batch.py renders them')
+    parser.add_argument('--collapse', action='store_true',
+                        help='Serve byte-identical images from one hashed URL (and stored copy)')
+    parser.add_argument('--assets', default=ASSETS_PATH, help='Asset manifest JSON (with --collapse)')
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    index = ImageIndex(args.index)
+    hashed = index.update(args.images)
+    index.save()
+    entries = index.entries
+    spec_slugs = set(list_specs(args.specs))
+    print(f"✓ Indexed {len(entries)} images ({hashed} hashed) in "
+          f"{(time.perf_counter() - start) * 1000:.0f} ms")
+
+    groups = exact_groups(entries)
+    for names in groups:
+        size = entries[names[0]]['size']
+        print(f"  {len(names)} identical ({size / 1024:.0f} KB each): {', '.join(names)}")
+    for a, b, distance in near_pairs(entries):
+        print(f"  near-identical ({distance} bits): {a}, {b}")
+    wasted = stored_twice(groups, entries)
+    if wasted:
+        print(f"  {wasted / 1024:.0f} KB stored more than once")
+
+    placeholders = find_placeholders(entries, spec_slugs)
+    for slug, source in sorted(placeholders.items()):
+        print(f"! {slug}: placeholder art (copy of {source})")
+
+    if args.queue and placeholders:
+        queued, untitled = queue_placeholders(placeholders, args.specs)
+        for slug in untitled:
+            print(f"✗ {slug}: no title in {MESSAGES_DIR}; not queued")
+        if queued:
+            print(f"✓ Queued {len(queued)} specs; render them with:\n"
+                  f"  python3 scripts/hero_batch.py {' '.join(queued)}")
+
+    if args.collapse and groups:
+        assets = load_assets(args.assets)
+        shared = share_urls(groups, args.images, entries, spec_slugs, assets)
+        save_assets(args.assets, assets)
+        print(f"✓ {len(shared)} slugs now share one URL per identical image -> {args.assets}")
+        if wasted:
+            linked, freed = collapse(groups, args.images, entries, spec_slugs)
+            index.save()
+            print(f"✓ Collapsed {linked} copies, {freed / 1024:.0f} KB of local disk freed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Dry run for hero rendering: validate every spec and its text layout without
+rasterizing anything.
+
+Only spec loading, glyph metrics and layout run (see text_layout() and
+missing_glyphs()), so a full check takes well under a second. Checks:
+
+    spec        the spec fails to load (bad JSON, unknown extends or layer)
+    overflow    a text block doesn't fit even at its minimum size, on the
+                hero or on any social card
+    shrunk      a text block only fits below its preferred size (warning)
+    glyphs      characters the fonts would draw as tofu
+    font        a font file doesn't load, so every glyph in it would be missing
+    output-dir  the output directory is missing or not writable
+    collision   two specs would write the same output file
+
+The report is JSON: {"ok", "specs", "errors", "warnings", "issues": [...]},
+one issue per problem with "slug", "check", "severity" and "message".
+Exit status is 1 if any issue is an error.
+
+Usage:
+    python3 scripts/hero_lint.py                   # every spec, report on stdout
+    python3 scripts/hero_lint.py my-article --report /tmp/lint.json
+    python3 scripts/hero_batch.py --dry-run        # same checks from the batch CLI
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+from draw_text_mixed_fonts import CHINESE_FONT, ENGLISH_FONT, font_available, missing_glyphs
+from hero_outputs import CARDS, output_names
+from hero_renderer import (
+    CARD_SIZES, MARGIN, OUTPUT_DIR, SPEC_DIR, TEXT_BLOCKS, WIDTH, card_window, list_specs,
+    load_spec, text_layout, text_style,
+)
+
+SEVERITY = {
+    'spec': 'error',
+    'overflow': 'error',
+    'shrunk': 'warning',
+    'glyphs': 'error',
+    'output-dir': 'error',
+    'collision': 'error',
+    'font': 'error',
+}
+
+
+def _issue(slug, check, message, **details):
+    return {'slug': slug, 'check': check, 'severity': SEVERITY[check],
+            'message': message, **details}
+
+
+def check_fonts():
+    """Issues for font files that don't load (everything would be tofu)"""
+    return [
+        _issue(None, 'font', f"font not found: {path}", path=path)
+        for path in (ENGLISH_FONT, CHINESE_FONT) if not font_available(path)
+    ]
+
+
+def check_output_dir(output_dir):
+    if not os.path.isdir(output_dir):
+        return [_issue(None, 'output-dir', f"output directory does not exist: {output_dir}",
+                       path=output_dir)]
+    if not os.access(output_dir, os.W_OK):
+        return [_issue(None, 'output-dir', f"output directory is not writable: {output_dir}",
+                       path=output_dir)]
+    return []
+
+
+def check_text(spec, width=WIDTH, margin=MARGIN):
+    """Overflow, shrink and missing-glyph issues for one spec's text blocks"""
+    slug = spec['slug']
+    text = spec.get('text', {})
+    issues = []
+    style = text_style(text)
+    for block, (size, lines, fits) in text_layout(text, width, margin).items():
+        if not fits:
+            issues.append(_issue(slug, 'overflow',
+                                 f"{block} does not fit {width - 2 * margin}px at {size}px",
+                                 block=block, size=size, lines=lines))
+        elif size < style[f'{block}_size']:
+            issues.append(_issue(slug, 'shrunk',
+                                 f"{block} shrunk from {style[f'{block}_size']}px to {size}px",
+                                 block=block, size=size, lines=lines))
+    for card in CARDS:
+        card_width = CARD_SIZES[card][0]
+        scale = card_width / card_window(CARD_SIZES[card])[0]
+        card_margin = max(1, round(margin * scale))
+        for block, (size, lines, fits) in text_layout(text, card_width, card_margin, scale).items():
+            if not fits:
+                issues.append(_issue(slug, 'overflow',
+                                     f"{block} does not fit the {card} card at {size}px",
+                                     block=block, card=card, size=size, lines=lines))
+    for block in TEXT_BLOCKS:
+        missing = missing_glyphs(text.get(block) or '')
+        if missing:
+            issues.append(_issue(slug, 'glyphs',
+                                 f"{block} has characters the fonts lack: {''.join(missing)}",
+                                 block=block, chars=missing))
+    return issues
+
+
+def check_collisions(specs):
+    """Issues for output files claimed by more than one spec (by spec file name)"""
+    owners = {}
+    for name, spec in specs:
+        for filename in output_names(spec['slug']):
+            # Case-insensitive filesystems and URLs would collide too
+            owners.setdefault(filename.lower(), []).append(name)
+    issues = []
+    reported = set()
+    for filename, names in owners.items():
+        names = tuple(sorted(set(names)))
+        if len(names) > 1 and names not in reported:
+            reported.add(names)
+            issues.append(_issue(names[0], 'collision',
+                                 f"{', '.join(names)} write the same files (e.g. {filename})",
+                                 slugs=list(names), file=filename))
+    return issues
+
+
+def lint(slugs=None, spec_dir=SPEC_DIR, output_dir=OUTPUT_DIR):
+    """
+    Check specs without rendering them and return the report dict.
+
+    Collisions are always checked against every spec in spec_dir, since a
+    new spec can collide with one that isn't being linted.
+    """
+    start = time.perf_counter()
+    all_slugs = list_specs(spec_dir)
+    selected = set(slugs or all_slugs)
+    issues = check_fonts() + check_output_dir(output_dir)
+
+    specs = []
+    for slug in all_slugs:
+        try:
+            specs.append((slug, load_spec(slug, spec_dir)))
+        except (OSError, ValueError, KeyError, RecursionError) as error:
+            if slug in selected:
+                issues.append(_issue(slug, 'spec', f'{type(error).__name__}: {error}'))
+    for slug in sorted(selected - set(all_slugs)):
+        issues.append(_issue(slug, 'spec', f"no spec named {slug} in {spec_dir}"))
+
+    for slug, spec in specs:
+        if slug in selected:
+            issues.extend(check_text(spec))
+    issues.extend(
+        issue for issue in check_collisions(specs)
+        if selected.intersection(issue['slugs'])
+    )
+
+    errors = sum(issue['severity'] == 'error' for issue in issues)
+    return {
+        'ok': errors == 0,
+        'specs': len(selected),
+        'errors': errors,
+        'warnings': len(issues) - errors,
+        'ms': round((time.perf_counter() - start) * 1000, 1),
+        'issues': issues,
+    }
+
+
+def print_summary(report, out=sys.stderr):
+    for issue in report['issues']:
+        mark = '✗' if issue['severity'] == 'error' else '!'
+        where = f"{issue['slug']}: " if issue['slug'] else ''
+        print(f"{mark} {where}[{issue['check']}] {issue['message']}", file=out)
+    print(f"{report['specs']} specs checked in {report['ms']:.0f} ms: "
+          f"{report['errors']} errors, {report['warnings']} warnings", file=out)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Check hero specs and layouts without rendering')
+    parser.add_argument('slugs', nargs='*', help='Specs to check (default: all)')
+    parser.add_argument('--specs', default=SPEC_DIR, help='Spec directory')
+    parser.add_argument('--out', default=OUTPUT_DIR, help='Output directory the batch would write to')
+    parser.add_argument('--report', default='-', help="Where to write the JSON report ('-' for stdout)")
+    args = parser.parse_args(argv)
+
+    report = lint(args.slugs, args.specs, args.out)
+    payload = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.report == '-':
+        print(payload)
+    else:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            f.write(payload + '\n')
+    print_summary(report)
+    return 0 if report['ok'] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
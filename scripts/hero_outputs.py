@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+"""
+Derive every published file for a hero from one in-memory master render.
+
+The master (1920px) is saved as an optimized PNG fallback under the existing
+<slug>-hero.png name, and resampled to a width ladder in WebP and AVIF:
+
+    <slug>-hero.png
+    <slug>-hero-480.webp   <slug>-hero-480.avif
+    ...
+    <slug>-hero-1920.webp  <slug>-hero-1920.avif
+
+Nothing is re-rendered for the smaller sizes. Every machine writes the same
+files: FORMATS is fixed, and check_encoders() stops a build whose Pillow
+can't encode one of them instead of leaving the format out. The same master
+also yields a tiny blur-up placeholder and average colour per slug,
+collected in data/hero-placeholders.json for the Next.js pages.
+
+Social cards (hero_renderer.render_cards) are saved as JPEG, which every
+crawler accepts:
+
+    <slug>-og.jpg   <slug>-square.jpg   <slug>-portrait.jpg
+
+Those names are stable, so a re-render changes the bytes behind a URL that
+browsers, next/image and nginx may have cached. publish_hashed() also
+links each file under a content-hashed name,
+
+    <slug>-hero.<hash>.png   <slug>-hero-480.<hash>.webp   <slug>-og.<hash>.jpg
+
+whose bytes never change, and data/hero-assets.json maps slug, format and
+width to them (see asset_entry) for the pages, so nginx can serve hashed
+names as immutable for a year.
+"""
+
+import base64
+import io
+import json
+import os
+import re
+
+from PIL import Image, features
+
+from hero_cache import file_hash, write_atomic, write_if_changed
+from hero_quantize import encode_png8, png8_stats
+from hero_renderer import CARD_SIZES, OUTPUT_DIR, REPO_ROOT, WIDTH
+from hero_trace import span
+
+PLACEHOLDERS_PATH = os.path.join(REPO_ROOT, 'data', 'hero-placeholders.json')
+ASSETS_PATH = os.path.join(REPO_ROOT, 'data', 'hero-assets.json')
+
+LADDER_WIDTHS = (480, 960, 1440, 1920)
+WEBP_QUALITY = 82
+AVIF_QUALITY = 60
+FORMATS = ('webp', 'avif')
+PLACEHOLDER_WIDTH = 32
+PLACEHOLDER_QUALITY = 50
+CARD_QUALITY = 85
+CARDS = tuple(CARD_SIZES)
+
+# Content-hashed copies: <name>.<first HASH_LENGTH hex digits of sha256>.<ext>
+HASH_LENGTH = 12
+HASHED_NAME = re.compile(r'^.+\.[0-9a-f]{%d}\.[a-z]+$' % HASH_LENGTH)
+
+# PNG fallback: 24-bit, or palette-quantized (see hero_quantize.py)
+PNG_MODES = ('truecolor', 'palette', 'palette-dither')
+PNG_MODE = 'truecolor'
+
+# AVIF needs Pillow built with libavif (11.2+) or the pillow-avif-plugin package
+try:
+    if not features.check('avif'):
+        import pillow_avif  # noqa: F401  (registers the AVIF plugin)
+    HAS_AVIF = True
+except ImportError:
+    HAS_AVIF = False
+
+
+def check_encoders(formats=FORMATS):
+    """Raise RuntimeError if this Pillow can't encode one of formats"""
+    if 'avif' in formats and not HAS_AVIF:
+        raise RuntimeError("AVIF output needs Pillow 11.2+ built with libavif "
+                           "(or pip install pillow-avif-plugin)")
+
+
+def encode(img, fmt):
+    """Encode an image as bytes in 'png', 'webp', 'avif' or 'jpeg'"""
+    buffer = io.BytesIO()
+    with span(f'encode:{fmt}', cat='encode', width=img.width):
+        _save(img, buffer, fmt)
+    return buffer.getvalue()
+
+
+def _save(img, buffer, fmt):
+    if fmt == 'png':
+        img.save(buffer, 'PNG', optimize=True)
+    elif fmt == 'webp':
+        img.save(buffer, 'WEBP', quality=WEBP_QUALITY, method=4)
+    elif fmt == 'avif':
+        check_encoders(('avif',))
+        img.save(buffer, 'AVIF', quality=AVIF_QUALITY)
+    elif fmt == 'jpeg':
+        img.save(buffer, 'JPEG', quality=CARD_QUALITY, optimize=True)
+    else:
+        raise ValueError(f"unsupported output format '{fmt}'")
+
+
+def resize_to_width(img, width):
+    """Downscale keeping the aspect ratio; the master is returned as-is"""
+    if width >= img.width:
+        return img
+    height = round(img.height * width / img.width)
+    with span('resize', cat='encode', width=width):
+        return img.resize((width, height), Image.LANCZOS, reducing_gap=3.0)
+
+
+def card_name(slug, card):
+    return f'{slug}-{card}.jpg'
+
+
+def output_names(slug, widths=LADDER_WIDTHS, formats=FORMATS, cards=CARDS):
+    """Filenames derive_outputs() will produce for slug, PNG fallback first, cards last"""
+    names = [f'{slug}-hero.png']
+    for width in widths:
+        for fmt in formats:
+            names.append(f'{slug}-hero-{width}.{fmt}')
+    names.extend(card_name(slug, card) for card in cards)
+    return names
+
+
+def card_entries(slug, cards=CARDS):
+    """Sidecar entries for the pages' og:image tags: card -> {src, width, height}"""
+    return {
+        card: {
+            'src': f'/blog-images/{card_name(slug, card)}',
+            'width': CARD_SIZES[card][0],
+            'height': CARD_SIZES[card][1],
+        }
+        for card in cards
+    }
+
+
+def hashed_name(filename, digest):
+    """<slug>-hero-480.webp -> <slug>-hero-480.<hash>.webp"""
+    stem, ext = filename.rsplit('.', 1)
+    return f'{stem}.{digest[:HASH_LENGTH]}.{ext}'
+
+
+def is_hashed(name):
+    return HASHED_NAME.match(name) is not None
+
+
+def publish_hashed(output_dir, filenames):
+    """
+    Give each existing file in output_dir a content-hashed name, hard-linked
+    to it (copied where links aren't supported). Renders replace the stable
+    names by rename, so a hashed name keeps its bytes for as long as it
+    exists.
+
+    Returns ({filename: hashed name}, number of hashed names created).
+    """
+    hashed, created = {}, 0
+    for filename in filenames:
+        path = os.path.join(output_dir, filename)
+        digest = file_hash(path)
+        if digest == 'missing':
+            continue
+        name = hashed_name(filename, digest)
+        hashed[filename] = name
+        target = os.path.join(output_dir, name)
+        if os.path.exists(target):
+            continue
+        temp = f'{target}.{os.getpid()}.link'
+        try:
+            os.link(path, temp)
+            os.replace(temp, target)
+        except OSError:
+            with open(path, 'rb') as f:
+                write_atomic(target, f.read())
+        created += 1
+    return hashed, created
+
+
+def asset_entry(slug, locale, hashed, widths=LADDER_WIDTHS, formats=FORMATS, cards=CARDS):
+    """
+    Manifest entry for slug from publish_hashed()'s names:
+
+        {'locale': 'en',
+         'hero': {'png': {'1920': src}, 'webp': {'480': src, ...}, ...},
+         'cards': {'og': src, ...}}
+
+    Files that don't exist are left out, so pages fall back to stable names.
+    """
+    def src(filename):
+        return f'/blog-images/{hashed[filename]}'
+
+    hero = {}
+    if f'{slug}-hero.png' in hashed:
+        hero['png'] = {str(WIDTH): src(f'{slug}-hero.png')}
+    for fmt in formats:
+        for width in widths:
+            filename = f'{slug}-hero-{width}.{fmt}'
+            if filename in hashed:
+                hero.setdefault(fmt, {})[str(width)] = src(filename)
+    return {
+        'locale': locale,
+        'hero': hero,
+        'cards': {card: src(card_name(slug, card)) for card in cards
+                  if card_name(slug, card) in hashed},
+    }
+
+
+def prune_hashed(output_dir, assets):
+    """
+    Remove hashed files the manifest no longer references. Run it once
+    pages built from the current manifest are live, as earlier builds still
+    link the superseded names. Returns the names removed.
+    """
+    referenced = {
+        os.path.basename(src)
+        for entry in assets.values()
+        for srcs in list(entry['hero'].values()) + [entry['cards']]
+        for src in srcs.values()
+    }
+    removed = []
+    for name in sorted(os.listdir(output_dir)):
+        if is_hashed(name) and name not in referenced:
+            os.remove(os.path.join(output_dir, name))
+            removed.append(name)
+    return removed
+
+
+def encode_fallback(img, png_mode=PNG_MODE, seeds=()):
+    """
+    PNG fallback bytes in png_mode, plus PNG-8 stats (bytes saved against
+    the 24-bit PNG and ΔE, see hero_quantize.png8_stats) or None for
+    'truecolor'. seeds are the spec's exact colours (seed_colors()).
+    """
+    png = encode(img, 'png')
+    if png_mode == 'truecolor':
+        return png, None
+    if png_mode not in PNG_MODES:
+        raise ValueError(f"unsupported PNG mode '{png_mode}'")
+    data, quantized = encode_png8(img, list(seeds), dither=png_mode == 'palette-dither')
+    return data, png8_stats(img, data, quantized, len(png))
+
+
+def derive_outputs(img, slug, widths=LADDER_WIDTHS, formats=FORMATS,
+                   png_mode=PNG_MODE, seeds=(), stats=None, cards=None):
+    """
+    Encode the PNG fallback, the responsive ladder and the social cards from
+    a master image.
+
+    Args:
+        png_mode: One of PNG_MODES for the fallback
+        seeds: Exact colours for the PNG-8 palette
+        stats: Optional dict that receives the PNG-8 stats
+        cards: Optional card name -> image (see render_cards), encoded last
+
+    Returns a list of (filename, bytes) in output_names() order.
+    """
+    png, png_stats = encode_fallback(img, png_mode, seeds)
+    if stats is not None and png_stats:
+        stats.update(png_stats)
+    outputs = [(f'{slug}-hero.png', png)]
+    for width in widths:
+        resized = resize_to_width(img, width)
+        for fmt in formats:
+            outputs.append((f'{slug}-hero-{width}.{fmt}', encode(resized, fmt)))
+    for card, card_img in (cards or {}).items():
+        outputs.append((card_name(slug, card), encode(card_img, 'jpeg')))
+    return outputs
+
+
+def placeholder(img, width=PLACEHOLDER_WIDTH):
+    """
+    Blur-up placeholder for next/image plus the image's average colour.
+
+    Returns {'blurDataURL', 'color', 'width', 'height'}; width/height are the
+    master's, so pages can reserve the right aspect ratio.
+    """
+    thumb = resize_to_width(img.convert('RGB'), width)
+    buffer = io.BytesIO()
+    thumb.save(buffer, 'WEBP', quality=PLACEHOLDER_QUALITY)
+    average = thumb.resize((1, 1), Image.BOX).getpixel((0, 0))
+    return {
+        'blurDataURL': 'data:image/webp;base64,' + base64.b64encode(buffer.getvalue()).decode('ascii'),
+        'color': '#{:02x}{:02x}{:02x}'.format(*average[:3]),
+        'width': img.width,
+        'height': img.height,
+    }
+
+
+def load_placeholders(path):
+    """slug -> placeholder entries from the JSON sidecar ({} if missing)"""
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def save_placeholders(path, entries):
+    """Write the sidecar (sorted by slug) only if its content changed"""
+    data = json.dumps(entries, ensure_ascii=False, indent=2, sort_keys=True) + '\n'
+    return write_if_changed(path, data.encode('utf-8'))
+
+
+def load_assets(path):
+    """slug -> asset manifest entries ({} if missing)"""
+    return load_placeholders(path)
+
+
+def save_assets(path, entries):
+    """Write the asset manifest (sorted by slug) only if its content changed"""
+    return save_placeholders(path, entries)
+
+
+def output_settings(png_mode=PNG_MODE):
+    """Everything about encoding that should invalidate the build cache"""
+    settings = {
+        'widths': list(LADDER_WIDTHS),
+        'formats': list(FORMATS),
+        'webp_quality': WEBP_QUALITY,
+        'avif_quality': AVIF_QUALITY,
+        'placeholder': [PLACEHOLDER_WIDTH, PLACEHOLDER_QUALITY],
+        'cards': {card: list(CARD_SIZES[card]) for card in CARDS},
+        'card_quality': CARD_QUALITY,
+    }
+    if png_mode != 'truecolor':
+        # Only when set, so existing truecolor builds stay fresh
+        settings['png'] = png_mode
+    return settings
+
+
+def backfill_placeholders(image_dir, path):
+    """
+    Add sidecar entries for existing <slug>-hero.png files that have none
+    (e.g. heroes not yet produced by the renderer). Returns the slugs added.
+    """
+    entries = load_placeholders(path)
+    added = []
+    for name in sorted(os.listdir(image_dir)):
+        if not name.endswith('-hero.png'):
+            continue
+        slug = name[:-len('-hero.png')]
+        if slug in entries:
+            continue
+        with Image.open(os.path.join(image_dir, name)) as img:
+            entries[slug] = placeholder(img)
+        added.append(slug)
+    save_placeholders(path, entries)
+    return added
+
+
+if __name__ == "__main__":
+    for slug in backfill_placeholders(OUTPUT_DIR, PLACEHOLDERS_PATH):
+        print(f"✓ Placeholder: {slug}")
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Palette-quantized (PNG-8) encoding for hero PNG fallbacks.
+
+Heroes are mostly a dark flat background, a few accent colours and soft
+orb gradients, so 256 colours are close to lossless for them. The palette
+is seeded with the spec's own colours (background, named palette, white and
+gray), so flat areas and motif strokes map exactly. The remaining entries
+come from an adaptive median-cut palette of the image.
+
+Gradients can band with 256 colours. An ordered (Bayer) dither spreads the
+error in a fixed pattern: unlike error diffusion it doesn't ripple across
+flat areas, so the PNG still compresses well.
+
+The error score is the mean CIE76 ΔE between the master and the quantized
+image, after a 1px blur of both so dither patterns count the way the eye
+averages them.
+
+Usage:
+    python3 scripts/hero_quantize.py                 # report for every spec's current PNG
+    python3 scripts/hero_quantize.py my-article --dither
+"""
+
+import argparse
+import io
+import os
+import sys
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from PIL import Image, ImageFilter
+
+from hero_renderer import BASE_PALETTE, OUTPUT_DIR, SPEC_DIR, list_specs, load_spec
+from hero_trace import span
+
+PALETTE_SIZE = 256
+DITHER_STRENGTH = 8     # peak-to-peak ordered-dither offset, in 8-bit levels
+ERROR_BLUR = 1          # px; blur applied before scoring so dither averages out
+
+# 4x4 Bayer matrix; thresholds in [0, 16)
+BAYER_4 = (
+    (0, 8, 2, 10),
+    (12, 4, 14, 6),
+    (3, 11, 1, 9),
+    (15, 7, 13, 5),
+)
+
+
+def seed_colors(spec):
+    """Colours every hero of this spec uses exactly: background, palette, white and gray"""
+    seeds = [tuple(spec.get('background', (15, 23, 42)))]
+    # Palette entries may carry an alpha; the PNG-8 palette holds RGB triples
+    seeds += [tuple(color[:3]) for color in spec.get('palette', {}).values()]
+    seeds += [BASE_PALETTE['white'], BASE_PALETTE['gray']]
+    return list(dict.fromkeys(seeds))
+
+
+def build_palette(img, seeds, size=PALETTE_SIZE):
+    """'P' image holding the seed colours followed by an adaptive palette"""
+    seeds = seeds[:size]
+    adaptive = img.quantize(colors=max(1, size - len(seeds)), method=Image.Quantize.MEDIANCUT)
+    flat = adaptive.getpalette()[:3 * len(adaptive.getcolors())]
+    colors = list(dict.fromkeys(seeds + [tuple(flat[i:i + 3]) for i in range(0, len(flat), 3)]))
+    palette = Image.new('P', (1, 1))
+    palette.putpalette([value for color in colors[:size] for value in color])
+    return palette
+
+
+def _ordered_dither(img, strength=DITHER_STRENGTH):
+    """img with a tiled Bayer offset added, ready for nearest-colour mapping"""
+    pixels = np.asarray(img, dtype=np.int16)
+    bayer = np.asarray(BAYER_4, dtype=np.int16)
+    height, width = pixels.shape[:2]
+    tiled = np.tile(bayer, (height // 4 + 1, width // 4 + 1))[:height, :width]
+    offset = (tiled * strength) // 16 - strength // 2
+    pixels = np.clip(pixels + offset[:, :, None], 0, 255).astype(np.uint8)
+    return Image.fromarray(pixels)
+
+
+def quantize(img, seeds, dither=False, size=PALETTE_SIZE):
+    """
+    Map an RGB image onto a seeded adaptive palette.
+
+    Args:
+        img: RGB master
+        seeds: Colours to include exactly (see seed_colors)
+        dither: Apply ordered dithering (Floyd-Steinberg without NumPy)
+        size: Palette size, up to 256
+
+    Returns the 'P' image.
+    """
+    with span('quantize', cat='encode', dither=dither):
+        palette = build_palette(img, seeds, size)
+        if dither and np is not None:
+            return _ordered_dither(img).quantize(palette=palette, dither=Image.Dither.NONE)
+        return img.quantize(
+            palette=palette,
+            dither=Image.Dither.FLOYDSTEINBERG if dither else Image.Dither.NONE)
+
+
+def _lab(img):
+    """CIE L*a*b* (D65) array of an RGB image"""
+    rgb = np.asarray(img, dtype=np.float32) / 255
+    linear = np.where(rgb <= 0.04045, rgb / 12.92, ((rgb + 0.055) / 1.055) ** 2.4)
+    xyz = linear @ np.array([
+        [0.4124 / 0.9505, 0.2126, 0.0193 / 1.089],
+        [0.3576 / 0.9505, 0.7152, 0.1192 / 1.089],
+        [0.1805 / 0.9505, 0.0722, 0.9505 / 1.089],
+    ], dtype=np.float32)
+    f = np.where(xyz > 0.008856, np.cbrt(xyz), 7.787 * xyz + 16 / 116)
+    return np.stack([
+        116 * f[..., 1] - 16,
+        500 * (f[..., 0] - f[..., 1]),
+        200 * (f[..., 1] - f[..., 2]),
+    ], axis=-1)
+
+
+def perceptual_error(reference, candidate):
+    """
+    Mean CIE76 ΔE between two images after a light blur, or None without
+    NumPy. Below ~1 is invisible; 2-3 is visible only side by side.
+    """
+    if np is None:
+        return None
+    blur = ImageFilter.GaussianBlur(ERROR_BLUR)
+    a = _lab(reference.convert('RGB').filter(blur))
+    b = _lab(candidate.convert('RGB').filter(blur))
+    return float(np.sqrt(((a - b) ** 2).sum(axis=-1)).mean())
+
+
+def encode_png8(img, seeds, dither=False):
+    """PNG-8 bytes of img quantized onto its seeded palette, plus the 'P' image"""
+    quantized = quantize(img, seeds, dither)
+    buffer = io.BytesIO()
+    with span('encode:png8', cat='encode', width=img.width):
+        quantized.save(buffer, 'PNG', optimize=True)
+    return buffer.getvalue(), quantized
+
+
+def png8_stats(img, data, quantized, truecolor_bytes):
+    """{'bytes', 'truecolor_bytes', 'saved', 'delta_e'} for a PNG-8 encode"""
+    error = perceptual_error(img, quantized)
+    return {
+        'bytes': len(data),
+        'truecolor_bytes': truecolor_bytes,
+        'saved': truecolor_bytes - len(data),
+        'delta_e': round(error, 3) if error is not None else None,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Report PNG-8 size and error for each hero's current PNG")
+    parser.add_argument('slugs', nargs='*', help='Specs to check (default: all)')
+    parser.add_argument('--specs', default=SPEC_DIR, help='Spec directory')
+    parser.add_argument('--images', default=OUTPUT_DIR, help='Directory holding <slug>-hero.png')
+    parser.add_argument('--dither', action='store_true', help='Use ordered dithering')
+    args = parser.parse_args(argv)
+
+    total_before = total_after = 0
+    for slug in args.slugs or list_specs(args.specs):
+        path = os.path.join(args.images, f'{slug}-hero.png')
+        if not os.path.exists(path):
+            print(f"✗ {slug}: no {path}")
+            continue
+        spec = load_spec(slug, args.specs)
+        with Image.open(path) as f:
+            img = f.convert('RGB')
+        data, quantized = encode_png8(img, seed_colors(spec), args.dither)
+        stats = png8_stats(img, data, quantized, os.path.getsize(path))
+        total_before += stats['truecolor_bytes']
+        total_after += stats['bytes']
+        print(f"✓ {slug}: {stats['truecolor_bytes'] / 1024:.0f} KB -> {stats['bytes'] / 1024:.0f} KB "
+              f"({stats['truecolor_bytes'] / max(1, stats['bytes']):.1f}x), ΔE {stats['delta_e']}")
+    if total_after:
+        print(f"\nTotal: {total_before / 1024:.0f} KB -> {total_after / 1024:.0f} KB "
+              f"({total_before / total_after:.1f}x)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
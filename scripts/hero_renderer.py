@@ -0,0 +1,914 @@
+#!/usr/bin/env python3
+"""
+Render blog hero images from declarative specs.
+
+Each hero is described by a JSON spec in data/hero-specs/<slug>.json:
+slug, locale, text (title/subtitle/label), background, a named palette and
+an ordered list of motif layers. This module turns specs into images; see
+hero_batch.py for the command-line entry point.
+
+Specs are written in design pixels of the 1920x1080 hero. Social cards in
+other aspects (CARD_SIZES) are cut from one shared scene plate: the scene
+layers drawn once around that design frame. Layers anchored to the canvas
+edges (FRAME_LAYERS) and the text are then drawn per card at its own scale.
+"""
+
+import json
+import math
+import os
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from PIL import Image, ImageDraw, ImageFilter
+
+from draw_gradients import draw_gradient_circle
+from draw_text_mixed_fonts import draw_text_masked, draw_text_mixed, fit_text
+from hero_compositor import DisplayList
+from hero_trace import span
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SPEC_DIR = os.path.join(REPO_ROOT, 'data', 'hero-specs')
+OUTPUT_DIR = os.path.join(REPO_ROOT, 'public', 'blog-images')
+
+# Bump whenever a change to the drawing code alters rendered pixels, so the
+# incremental build cache (hero_cache.py) re-renders everything
+RENDERER_VERSION = 6
+
+# Canvas setup
+WIDTH = 1920
+HEIGHT = 1080
+MARGIN = 120
+
+# Depth blur: a Gaussian of radius 0.5, applied as a separable 5-tap
+# integer kernel fitted to GaussianBlur(0.5) (within 2 levels per pixel).
+# It spreads a drawn pixel by BLUR_SPREAD px; without NumPy, regions are
+# blurred with GaussianBlur itself, with BLUR_CONTEXT px of context.
+BLUR_RADIUS = 0.5
+BLUR_KERNEL = (1, 13, 100, 13, 1)
+BLUR_SPREAD = len(BLUR_KERNEL) // 2
+BLUR_CONTEXT = 4
+BLUR_TILE = 32  # dirty regions are tracked at this granularity
+
+# Colours every spec can reference without declaring them
+BASE_PALETTE = {
+    'white': (248, 250, 252),
+    'gray': (148, 163, 184),
+    'black': (0, 0, 0),
+}
+
+DEFAULT_TEXT_STYLE = {
+    'title_y': 0.12,         # fraction of canvas height
+    'title_size': 68,
+    'shadow_offset': 2,
+    'shadow_blur': 0,        # px; 0 keeps the hard drop shadow
+    'subtitle_gap': 85,      # px below the title
+    'subtitle_size': 30,
+    'subtitle_color': None,  # palette name; defaults to the first palette entry
+    'label_size': 22,
+    # Auto-fit: long text shrinks down to the min size, then overflows
+    'title_min_size': 44,
+    'title_max_lines': 2,
+    'subtitle_min_size': 22,
+    'subtitle_max_lines': 2,
+    'label_min_size': 16,
+    'line_spacing': 1.2,     # line pitch as a multiple of the font size
+}
+
+# Text blocks auto-fitted by text_layout(); the label always stays on one line
+TEXT_BLOCKS = ('title', 'subtitle', 'label')
+
+# Social cards: name -> output size, all cut from one scene plate
+CARD_SIZES = {
+    'og': (1200, 630),         # 1.91:1 OpenGraph / Twitter large image
+    'square': (1080, 1080),    # 1:1 WeChat share
+    'portrait': (1080, 1350),  # 4:5 mobile feeds
+}
+
+# Layers anchored to the canvas edges rather than the scene; each card draws
+# them itself instead of cropping them off the plate
+FRAME_LAYERS = {'code_lines', 'warning_triangles', 'corners'}
+
+# Layers that draw text, so their pixels also depend on the font files
+TEXT_LAYERS = {'warning_triangles'}
+
+
+def _bounds(xy):
+    """(left, top, right, bottom) of [x0, y0, x1, y1] or [(x, y), ...]"""
+    if isinstance(xy[0], (tuple, list)):
+        xs = [p[0] for p in xy]
+        ys = [p[1] for p in xy]
+    else:
+        xs, ys = xy[0::2], xy[1::2]
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+class DirtyDraw:
+    """
+    ImageDraw wrapper that records the bounding box of everything drawn, so
+    the depth blur only has to touch those regions. Coordinates are shifted
+    by -origin, for images holding only part of the canvas.
+    """
+
+    def __init__(self, draw, dirty, origin=(0, 0)):
+        self._draw = draw
+        self.dirty = dirty
+        self.origin = origin
+
+    def _local(self, xy):
+        dx, dy = self.origin
+        if not (dx or dy):
+            return xy
+        if isinstance(xy[0], (tuple, list)):
+            return [(x - dx, y - dy) for x, y in xy]
+        return [value - (dy if i % 2 else dx) for i, value in enumerate(xy)]
+
+    def text(self, xy, text, font=None, **kwargs):
+        xy = tuple(self._local(xy))
+        self.dirty.append(self._draw.textbbox(xy, text, font=font))
+        self._draw.text(xy, text, font=font, **kwargs)
+
+    def __getattr__(self, name):
+        shape = getattr(self._draw, name)
+
+        def draw(xy, *args, **kwargs):
+            xy = self._local(xy)
+            pad = kwargs.get('width', 1) + 1
+            left, top, right, bottom = _bounds(xy)
+            self.dirty.append((left - pad, top - pad, right + pad, bottom + pad))
+            return shape(xy, *args, **kwargs)
+        return draw
+
+
+class Canvas:
+    """
+    Image plus the spec context layer functions need (palette, geometry).
+
+    Args:
+        spec: Resolved spec
+        size: Image size in px
+        scale: Output px per design px; layers and text size their lengths
+            with px() and dist()
+        frame: (left, top, width, height) of the design frame that 'at'
+            fractions refer to (default: the whole image)
+        region: (left, top, right, bottom) part of the canvas the image
+            holds, e.g. one tile of a large render (default: all of it).
+            Layers draw in canvas coordinates; shapes outside the region
+            are clipped.
+    """
+
+    def __init__(self, spec, size=(WIDTH, HEIGHT), scale=1, frame=None, region=None):
+        self.spec = spec
+        self.width, self.height = size
+        self.scale = scale
+        self.frame = frame or (0, 0, self.width, self.height)
+        self.region = region or (0, 0, self.width, self.height)
+        self.margin = self.px(MARGIN)
+        self.palette = dict(BASE_PALETTE)
+        for name, value in spec.get('palette', {}).items():
+            self.palette[name] = tuple(value)
+        left, top, right, bottom = self.region
+        self.attach(Image.new('RGB', (right - left, bottom - top),
+                              tuple(spec.get('background', (15, 23, 42)))))
+
+    def attach(self, img):
+        """Draw on img from now on, with a fresh dirty list and overlay"""
+        self.img = img
+        origin = self.region[:2]
+        # Regions anything was drawn on, in image px; the depth blur leaves
+        # the rest alone
+        self.dirty = []
+        self.draw = DirtyDraw(ImageDraw.Draw(self.img, 'RGBA'), self.dirty, origin)
+        # Translucent glow primitives, composited after each layer (or
+        # earlier, by layers that draw solid shapes on top of their glow)
+        self.overlay = DisplayList(self.img, self.dirty, origin)
+
+    def local(self, x, y):
+        """Canvas coordinates to image px (they differ when region is set)"""
+        return x - self.region[0], y - self.region[1]
+
+    def px(self, value):
+        """A length in design px at this canvas's scale, rounded (never to 0)"""
+        if self.scale == 1 or not value:
+            return value
+        return round(value * self.scale) or (1 if value > 0 else -1)
+
+    def dist(self, value):
+        """A length in design px at this canvas's scale, unrounded (radii, spacings)"""
+        return value if self.scale == 1 else value * self.scale
+
+    def color(self, ref, alpha=None):
+        """Resolve a palette name or [r, g, b(, a)] list, optionally adding alpha"""
+        if isinstance(ref, str):
+            if ref not in self.palette:
+                raise ValueError(f"{self.spec['slug']}: unknown palette colour '{ref}'")
+            value = self.palette[ref]
+        else:
+            value = tuple(ref)
+        if alpha is not None:
+            value = value[:3] + (alpha,)
+        return value
+
+    def point(self, layer, default=(0.5, 0.5)):
+        """Layer anchor: 'at' as design-frame fractions plus an optional px 'offset'"""
+        left, top, width, height = self.frame
+        fx, fy = layer.get('at', default)
+        dx, dy = layer.get('offset', (0, 0))
+        return left + width * fx + self.dist(dx), top + height * fy + self.dist(dy)
+
+    def center(self, layer):
+        """Integer anchor, as the hand-written scripts used WIDTH // 2 + offset"""
+        left, top, width, height = self.frame
+        fx, fy = layer.get('at', (0.5, 0.5))
+        dx, dy = layer.get('offset', (0, 0))
+        return left + int(width * fx) + self.px(dx), top + int(height * fy) + self.px(dy)
+
+
+# ---------------------------------------------------------------------------
+# Motif layers
+# ---------------------------------------------------------------------------
+
+def draw_orbs(canvas, layer):
+    """Background gradient orbs suggesting energy fields"""
+    for orb in layer['orbs']:
+        x, y = canvas.point(orb)
+        r = canvas.dist(orb['radius'])
+        canvas.dirty.extend(disc_strips(*canvas.local(x, y), r + 1))
+        colors = orb['colors']
+        # Ring spacing scales with the radius, so the ring count and the
+        # falloff stay the same at any scale
+        draw_gradient_circle(
+            canvas.img, canvas.local(int(x), int(y)), r,
+            canvas.color(colors[0]), canvas.color(colors[-1]),
+            orb.get('alpha', 30),
+            alpha_center=orb.get('alpha_center', 0),
+            step=canvas.dist(layer.get('step', 2)),
+            smooth=layer.get('smooth', False),
+        )
+
+
+def draw_rings(canvas, layer):
+    """Concentric orbital rings"""
+    cx, cy = canvas.center(layer)
+    alpha = layer.get('alpha', 120)
+    for ring in layer['rings']:
+        r = canvas.dist(ring['radius'])
+        canvas.draw.ellipse([cx - r, cy - r, cx + r, cy + r],
+                            outline=canvas.color(ring['color'], alpha),
+                            width=canvas.px(ring.get('width', 2)))
+
+
+def _glow(canvas, x, y, glow, color):
+    """Stacked translucent discs fading out towards the rim, recorded on the overlay"""
+    radius = glow['radius']
+    stack = canvas.overlay.stack(canvas.color(color))
+    for r in range(radius, 0, -glow.get('step', 2)):
+        stack.disc(x, y, canvas.dist(r), int(glow['alpha'] * (1 - r / radius)))
+
+
+def draw_nodes(canvas, layer):
+    """Glowing nodes evenly spaced on an orbit, optionally wired to the centre"""
+    cx, cy = canvas.center(layer)
+    color = layer['color']
+    count = layer['count']
+    orbit = canvas.dist(layer['orbit'])
+    start = math.radians(layer.get('start_angle', 0))
+    core = canvas.dist(layer.get('core_radius', 8))
+    stroke = canvas.px(2)
+    nodes = []
+    for i in range(count):
+        angle = (i / count) * 2 * math.pi + start
+        nodes.append((cx + orbit * math.cos(angle), cy + orbit * math.sin(angle)))
+
+    # Spokes, then every glow in one composite, then the solid cores on top
+    for x, y in nodes:
+        if 'spoke_alpha' in layer:
+            canvas.draw.line([x, y, cx, cy], fill=canvas.color(color, layer['spoke_alpha']),
+                             width=stroke)
+        _glow(canvas, x, y, layer['glow'], color)
+    canvas.overlay.composite()
+    for x, y in nodes:
+        canvas.draw.ellipse([x - core, y - core, x + core, y + core],
+                            fill=canvas.color(color), outline=canvas.color('white'), width=stroke)
+
+
+def draw_flow_arrows(canvas, layer):
+    """Curved arrows between orbit positions, suggesting cycles"""
+    cx, cy = canvas.center(layer)
+    count = layer['count']
+    orbit = canvas.dist(layer['orbit'] - layer.get('inset', 40))
+    curve = canvas.dist(layer.get('curve', 20))
+    start = math.radians(layer.get('start_angle', 0))
+    color = layer['color']
+    head = canvas.dist(layer.get('head_size', 8))
+    stroke = canvas.px(2)
+    for i in range(count):
+        angle1 = (i / count) * 2 * math.pi + start
+        angle2 = ((i + 1) / count) * 2 * math.pi + start
+
+        x1 = cx + orbit * math.cos(angle1)
+        y1 = cy + orbit * math.sin(angle1)
+        x2 = cx + orbit * math.cos(angle2)
+        y2 = cy + orbit * math.sin(angle2)
+
+        mid_angle = (angle1 + angle2) / 2
+        mx = cx + (orbit - curve) * math.cos(mid_angle)
+        my = cy + (orbit - curve) * math.sin(mid_angle)
+
+        canvas.draw.line([x1, y1, mx, my], fill=canvas.color(color, 100), width=stroke)
+        canvas.draw.line([mx, my, x2, y2], fill=canvas.color(color, 100), width=stroke)
+
+        arrow_angle = math.atan2(y2 - my, x2 - mx)
+        canvas.draw.polygon([
+            (x2, y2),
+            (x2 - head * math.cos(arrow_angle - 0.5), y2 - head * math.sin(arrow_angle - 0.5)),
+            (x2 - head * math.cos(arrow_angle + 0.5), y2 - head * math.sin(arrow_angle + 0.5)),
+        ], fill=canvas.color(color, 150))
+
+
+def draw_core(canvas, layer):
+    """Central glowing disc"""
+    cx, cy = canvas.center(layer)
+    color = layer['color']
+    _glow(canvas, cx, cy, layer['glow'], color)
+    canvas.overlay.composite()
+    r = canvas.dist(layer['radius'])
+    canvas.draw.ellipse([cx - r, cy - r, cx + r, cy + r],
+                        fill=canvas.color(color), outline=canvas.color('white'),
+                        width=canvas.px(layer.get('outline_width', 3)))
+
+
+def draw_shield(canvas, layer):
+    """Hexagonal shield with an outer glow"""
+    cx, cy = canvas.center(layer)
+    w, h = canvas.dist(layer.get('width', 280)), canvas.dist(layer.get('height', 320))
+    color = layer['color']
+    points = [
+        (cx, cy - h // 2),
+        (cx + w // 2, cy - h // 4),
+        (cx + w // 2, cy + h // 4),
+        (cx, cy + h // 2),
+        (cx - w // 2, cy + h // 4),
+        (cx - w // 2, cy - h // 4),
+    ]
+
+    glow = layer.get('glow', 30)
+    stack = canvas.overlay.stack(canvas.color(color))
+    for offset in range(glow, 0, -2):
+        expanded = [
+            (x + (x - cx) * canvas.dist(offset) / w, y + (y - cy) * canvas.dist(offset) / h)
+            for x, y in points
+        ]
+        stack.polygon(expanded, int(40 * (1 - offset / glow)))
+    canvas.overlay.composite()
+
+    canvas.draw.polygon(points, fill=canvas.color(layer.get('fill', (30, 58, 138, 100))),
+                        outline=canvas.color(color, 200), width=canvas.px(4))
+
+
+def draw_code_lines(canvas, layer):
+    """Faint code-like bars down both sides of the canvas"""
+    left, right = layer['colors']
+    px = canvas.px
+    margin = canvas.margin
+    rows = layer.get('rows', 15)
+    spacing = layer.get('spacing', 60)
+    for i in range(rows):
+        y = margin + px(i * spacing)
+        length = px(200 + (i % 3) * 150)
+        x = margin + px((i % 2) * 100)
+        canvas.draw.rectangle([x, y, x + length, y + px(3)], fill=canvas.color(left, 20 + i * 2))
+
+    for i in range(rows):
+        y = margin + px(i * spacing)
+        length = px(180 + (i % 4) * 120)
+        x = canvas.width - margin - length - px((i % 2) * 80)
+        canvas.draw.rectangle([x, y, x + length, y + px(3)], fill=canvas.color(right, 20 + i * 2))
+
+
+def draw_checklist(canvas, layer):
+    """Checklist rows with ticked boxes and text bars"""
+    cx, cy = canvas.center(layer)
+    px = canvas.px
+    items = layer.get('items', 6)
+    checked = layer.get('checked', 4)
+    item_height = layer.get('item_height', 50)
+    item_width = layer.get('item_width', 500)
+    box_color = layer['color']
+    bar_color = layer.get('bar_color', box_color)
+    box_size = 28
+
+    for i in range(items):
+        y = cy + px(i * item_height - (items * item_height) // 2)
+        box_x = cx - px(item_width // 2)
+        canvas.draw.rectangle([box_x, y, box_x + px(box_size), y + px(box_size)],
+                              outline=canvas.color(box_color, 150), width=px(2))
+
+        if i < checked:
+            canvas.draw.line([box_x + px(6), y + px(14), box_x + px(12), y + px(20)],
+                             fill=canvas.color(box_color), width=px(3))
+            canvas.draw.line([box_x + px(12), y + px(20), box_x + px(22), y + px(8)],
+                             fill=canvas.color(box_color), width=px(3))
+
+        line_x = box_x + px(box_size + 20)
+        line_width = px(item_width - box_size - 30)
+        alpha = 120 if i < checked else 60
+        canvas.draw.rectangle([line_x, y + px(10), line_x + line_width, y + px(18)],
+                              fill=canvas.color(bar_color, alpha))
+
+
+def draw_balance(canvas, layer):
+    """Balance scale: heavy (risk) pan low on the left, safe pan high on the right"""
+    cx, cy = canvas.center(layer)
+    px = canvas.px
+    beam_color = layer['beam_color']
+    pivot_color = layer['pivot_color']
+    left_color, right_color = layer['pan_colors']
+    white = canvas.color('white')
+    draw = canvas.draw
+
+    beam_width = 400
+    beam_height = 8
+    draw.rectangle([cx - px(beam_width // 2), cy - px(beam_height // 2),
+                    cx + px(beam_width // 2), cy + px(beam_height // 2)],
+                   fill=canvas.color(beam_color), outline=white, width=px(2))
+
+    pivot_size = 30
+    draw.polygon([
+        (cx, cy + px(40)),
+        (cx - px(pivot_size), cy),
+        (cx + px(pivot_size), cy)
+    ], fill=canvas.color(pivot_color), outline=white, width=px(2))
+
+    pan_width = 120
+    pan_height = 15
+    for pan_dx, pan_dy, color, fill, glow in [
+        (50 - beam_width // 2, 80, left_color, (60, 20, 20, 100), 40),
+        (beam_width // 2 - 50, -20, right_color, (20, 40, 80, 100), 35),
+    ]:
+        pan_x, pan_y = cx + px(pan_dx), cy + px(pan_dy)
+        draw.line([pan_x, cy, pan_x, pan_y - px(30)], fill=canvas.color(color, 150), width=px(3))
+        draw.ellipse([pan_x - px(pan_width // 2), pan_y - px(pan_height),
+                      pan_x + px(pan_width // 2), pan_y + px(pan_height)],
+                     fill=fill, outline=canvas.color(color), width=px(3))
+        _glow(canvas, pan_x, pan_y, {'radius': glow, 'step': 3, 'alpha': 60}, color)
+
+
+def draw_warning_triangles(canvas, layer):
+    """Outlined warning triangles with an exclamation mark, inset from the top corners"""
+    px = canvas.px
+    size = px(layer.get('size', 40))
+    inset = canvas.margin + px(layer.get('inset', 60))
+    left, right = layer['colors']
+    for x, y, color in [
+        (inset, inset, left),
+        (canvas.width - inset, inset, right),
+    ]:
+        canvas.draw.polygon([
+            (x, y - size),
+            (x - size, y + size // 2),
+            (x + size, y + size // 2)
+        ], outline=canvas.color(color, 150), width=px(3))
+        draw_text_mixed(canvas.draw, (x, y - px(15)), "!", px(32), canvas.color(color), align='center')
+
+
+def draw_corners(canvas, layer):
+    """L-shaped brackets in the top-left and bottom-right corners"""
+    size = canvas.px(layer.get('size', 120))
+    stroke = canvas.px(2)
+    alpha = layer.get('alpha', 100)
+    top_left, bottom_right = layer['colors']
+    m, w, h = canvas.margin, canvas.width, canvas.height
+    tl = canvas.color(top_left, alpha)
+    br = canvas.color(bottom_right, alpha)
+    canvas.draw.line([m, m, m + size, m], fill=tl, width=stroke)
+    canvas.draw.line([m, m, m, m + size], fill=tl, width=stroke)
+    canvas.draw.line([w - m, h - m, w - m - size, h - m], fill=br, width=stroke)
+    canvas.draw.line([w - m, h - m, w - m, h - m - size], fill=br, width=stroke)
+
+
+LAYERS = {
+    'orbs': draw_orbs,
+    'rings': draw_rings,
+    'nodes': draw_nodes,
+    'flow_arrows': draw_flow_arrows,
+    'core': draw_core,
+    'shield': draw_shield,
+    'code_lines': draw_code_lines,
+    'checklist': draw_checklist,
+    'balance': draw_balance,
+    'warning_triangles': draw_warning_triangles,
+    'corners': draw_corners,
+}
+
+
+# ---------------------------------------------------------------------------
+# Specs
+# ---------------------------------------------------------------------------
+
+def load_spec(slug, spec_dir=SPEC_DIR):
+    """
+    Load data/hero-specs/<slug>.json.
+
+    A spec may name another spec in "extends" (e.g. the English twin of a
+    Chinese article) and only override what differs; top-level fields are
+    merged shallowly, "text" and "palette" key by key.
+    """
+    path = os.path.join(spec_dir, f'{slug}.json')
+    with open(path, encoding='utf-8') as f:
+        spec = json.load(f)
+    spec.setdefault('slug', slug)
+    return resolve_spec(spec, spec_dir)
+
+
+def resolve_spec(spec, spec_dir=SPEC_DIR):
+    """
+    Merge a spec dict onto the spec it extends and validate it, as load_spec
+    does for a file. The dict itself is left unchanged.
+    """
+    spec = dict(spec)
+    slug = spec['slug']
+    parent_slug = spec.pop('extends', None)
+    if parent_slug:
+        parent = load_spec(parent_slug, spec_dir)
+        merged = dict(parent)
+        merged.update(spec)
+        for key in ('text', 'palette'):
+            merged[key] = dict(parent.get(key, {}))
+            merged[key].update(spec.get(key, {}))
+        spec = merged
+
+    _check_palette(slug, spec.get('palette'))
+    for layer in spec.get('layers', []):
+        if layer.get('type') not in LAYERS:
+            raise ValueError(f"{slug}: unknown layer type '{layer.get('type')}'")
+    return spec
+
+
+def _check_palette(slug, palette):
+    """The subtitle defaults to the first palette colour, so a spec needs at least one"""
+    if not isinstance(palette, dict) or not palette:
+        raise ValueError(f"{slug}: spec needs a non-empty 'palette' of name -> [r, g, b]")
+    for name, value in palette.items():
+        if (not isinstance(value, list) or len(value) not in (3, 4)
+                or not all(isinstance(c, int) and 0 <= c <= 255 for c in value)):
+            raise ValueError(f"{slug}: palette colour '{name}' must be [r, g, b] or [r, g, b, a], "
+                             f"got {value!r}")
+
+
+def list_specs(spec_dir=SPEC_DIR):
+    """Slugs of every spec in spec_dir, sorted"""
+    return sorted(
+        name[:-len('.json')] for name in os.listdir(spec_dir)
+        if name.endswith('.json')
+    )
+
+
+def output_path(spec, output_dir=OUTPUT_DIR):
+    return os.path.join(output_dir, f"{spec['slug']}-hero.png")
+
+
+# ---------------------------------------------------------------------------
+# Rendering
+# ---------------------------------------------------------------------------
+
+def text_style(text):
+    """DEFAULT_TEXT_STYLE with the spec's text.style overrides applied"""
+    style = dict(DEFAULT_TEXT_STYLE)
+    style.update(text.get('style', {}))
+    return style
+
+
+def text_layout(text, width=WIDTH, margin=MARGIN, scale=1):
+    """
+    Fitted size and lines for each non-empty text block, measured from
+    glyph advances only, so specs can be checked without rendering.
+    scale converts the style's design px sizes to the canvas (see Canvas).
+
+    Returns {block: (size, lines, fits)} for the blocks in TEXT_BLOCKS.
+    """
+    style = text_style(text)
+    max_width = width - 2 * margin
+    layout = {}
+    for block in TEXT_BLOCKS:
+        if text.get(block):
+            size, min_size = style[f'{block}_size'], style[f'{block}_min_size']
+            if scale != 1:
+                size, min_size = max(1, round(size * scale)), max(1, round(min_size * scale))
+            layout[block] = fit_text(text[block], max_width, size, min_size,
+                                     style.get(f'{block}_max_lines', 1))
+    return layout
+
+
+def _draw_lines(img, cx, y, lines, size, pitch, color, shadow=None):
+    for i, line in enumerate(lines):
+        draw_text_masked(img, (cx, y + i * pitch), line, size, color,
+                         align='center', shadow=shadow)
+
+
+def draw_text(canvas, text):
+    """
+    Title (with drop shadow), subtitle and bottom label, centred and fitted
+    to the canvas width (see text_layout). Each line is composited from one
+    glyph-atlas mask; the title's shadow reuses it.
+    """
+    style = text_style(text)
+    layout = text_layout(text, canvas.width, canvas.margin, canvas.scale)
+    img = canvas.img
+    px = canvas.px
+    cx = canvas.width // 2
+
+    title_y = canvas.height * style['title_y']
+    subtitle_y = title_y + px(style['subtitle_gap'])
+    if 'title' in layout:
+        size, lines, _ = layout['title']
+        pitch = size * style['line_spacing']
+        shadow = (0, px(style['shadow_offset']), (0, 0, 0, 120), style['shadow_blur'] * canvas.scale)
+        _draw_lines(img, *canvas.local(cx, title_y), lines, size, pitch, canvas.color('white'),
+                    shadow)
+        # Later title lines push the subtitle down
+        subtitle_y += (len(lines) - 1) * pitch
+
+    if 'subtitle' in layout:
+        size, lines, _ = layout['subtitle']
+        color = style['subtitle_color'] or next(iter(canvas.spec['palette']))
+        _draw_lines(img, *canvas.local(cx, subtitle_y), lines, size, size * style['line_spacing'],
+                    canvas.color(color, 200))
+
+    if 'label' in layout:
+        size = layout['label'][0]
+        draw_text_masked(img, canvas.local(cx, canvas.height - canvas.margin - px(40)), text['label'],
+                         size, canvas.color('gray', 180), align='center')
+
+
+def disc_strips(x, y, r, band=BLUR_TILE):
+    """Boxes covering a disc in horizontal bands, much tighter than its bounding box"""
+    strips = []
+    top = y - r
+    while top < y + r:
+        bottom = min(top + band, y + r)
+        # Widest point of the disc within this band
+        dy = 0 if top <= y <= bottom else min(abs(top - y), abs(bottom - y))
+        half = math.sqrt(max(0, r * r - dy * dy))
+        strips.append((x - half, top, x + half, bottom))
+        top = bottom
+    return strips
+
+
+def dirty_tiles(regions, width, height, grow=0, tile=BLUR_TILE):
+    """
+    Disjoint boxes covering every region grown by grow px: the tiles they
+    touch, joined into runs along each row of tiles
+    """
+    cols = math.ceil(width / tile)
+    rows = math.ceil(height / tile)
+    marked = bytearray(cols * rows)
+    for left, top, right, bottom in regions:
+        x0 = max(0, math.floor(left - grow) // tile)
+        y0 = max(0, math.floor(top - grow) // tile)
+        x1 = min(cols - 1, math.floor(right + grow) // tile)
+        y1 = min(rows - 1, math.floor(bottom + grow) // tile)
+        if x0 > x1 or y0 > y1:
+            continue  # entirely outside the image (e.g. clipped by a tile)
+        for row in range(y0, y1 + 1):
+            marked[row * cols + x0:row * cols + x1 + 1] = b'\x01' * (x1 - x0 + 1)
+
+    boxes = []
+    for row in range(rows):
+        col = 0
+        while col < cols:
+            if not marked[row * cols + col]:
+                col += 1
+                continue
+            start = col
+            while col < cols and marked[row * cols + col]:
+                col += 1
+            boxes.append((start * tile, row * tile,
+                          min(width, col * tile), min(height, (row + 1) * tile)))
+    return boxes
+
+
+def _separable_blur(pixels):
+    """
+    Blur an (h + 2s, w + 2s, 3) uint8 array, s = BLUR_SPREAD, with
+    BLUR_KERNEL horizontally then vertically; returns the (h, w, 3)
+    interior as uint8
+    """
+    pixels = pixels.astype(np.uint32)
+    taps = len(BLUR_KERNEL)
+    height = pixels.shape[0] - taps + 1
+    width = pixels.shape[1] - taps + 1
+    rows = sum(weight * pixels[:, i:i + width] for i, weight in enumerate(BLUR_KERNEL))
+    out = sum(weight * rows[i:i + height] for i, weight in enumerate(BLUR_KERNEL))
+    scale = sum(BLUR_KERNEL) ** 2
+    out += scale // 2
+    out //= scale
+    return out.astype(np.uint8)
+
+
+def _with_context(img, box, context):
+    """
+    Crop box plus context px on every side, replicating the frame edge
+    where the box touches it
+    """
+    left, top, right, bottom = box
+    crop = (max(0, left - context), max(0, top - context),
+            min(img.width, right + context), min(img.height, bottom + context))
+    pixels = np.asarray(img.crop(crop))
+    pad = [(context - (top - crop[1]), context - (crop[3] - bottom)),
+           (context - (left - crop[0]), context - (crop[2] - right)),
+           (0, 0)]
+    if any(pad[0]) or any(pad[1]):
+        pixels = np.pad(pixels, pad, mode='edge')
+    return pixels
+
+
+def depth_blur(img, regions=None, radius=BLUR_RADIUS):
+    """
+    Subtle blur for depth; text goes on top afterwards, unblurred.
+
+    Args:
+        img: RGB image
+        regions: Boxes that were drawn on (e.g. Canvas.dirty). Only those,
+            grown by how far the blur spreads, are blurred, in place; flat
+            background elsewhere is left as it is. None blurs the whole frame
+            with GaussianBlur into a new image.
+        radius: Blur radius in px; BLUR_KERNEL only fits the default, so
+            other radii (scaled canvases) use GaussianBlur per region
+    """
+    blur = ImageFilter.GaussianBlur(radius=radius)
+    if regions is None:
+        return img.filter(blur)
+
+    boxes = dirty_tiles(regions, img.width, img.height, BLUR_SPREAD)
+    if np is not None and radius == BLUR_RADIUS:
+        # Boxes in one row of tiles are far enough apart not to interact, but
+        # each row's context reaches into the next. Read the next row before
+        # writing this one, so no box ever sees already-blurred pixels.
+        bands = {}
+        for box in boxes:
+            bands.setdefault(box[1], []).append(box)
+        rows = [bands[top] for top in sorted(bands)]
+        sources = [_with_context(img, box, BLUR_SPREAD) for box in rows[0]] if rows else []
+        for i, row in enumerate(rows):
+            upcoming = []
+            if i + 1 < len(rows):
+                upcoming = [_with_context(img, box, BLUR_SPREAD) for box in rows[i + 1]]
+            for box, pixels in zip(row, sources):
+                img.paste(Image.fromarray(_separable_blur(pixels)), box[:2])
+            sources = upcoming
+        return img
+
+    # Otherwise: read every region before writing any, for the same reason
+
+    crops = []
+    for left, top, right, bottom in boxes:
+        crop = (max(0, left - BLUR_CONTEXT), max(0, top - BLUR_CONTEXT),
+                min(img.width, right + BLUR_CONTEXT), min(img.height, bottom + BLUR_CONTEXT))
+        crops.append((crop, img.crop(crop)))
+    for (left, top, right, bottom), (crop, source) in zip(boxes, crops):
+        blurred = source.filter(blur)
+        img.paste(blurred.crop((left - crop[0], top - crop[1], right - crop[0], bottom - crop[1])),
+                  (left, top))
+    return img
+
+
+def draw_layer(canvas, layer):
+    """Draw one motif layer and composite the glows it recorded"""
+    with span(f"layer:{layer['type']}", cat='layer', slug=canvas.spec['slug']):
+        LAYERS[layer['type']](canvas, layer)
+        canvas.overlay.composite()
+
+
+def scaled_size(scale):
+    """Hero size in px at scale (1 is the 1920x1080 design size)"""
+    if scale == 1:
+        return WIDTH, HEIGHT
+    return max(1, round(WIDTH * scale)), max(1, round(HEIGHT * scale))
+
+
+def render_background(spec, scale=1):
+    """Render a spec's text-free background: motif layers plus depth blur"""
+    canvas = Canvas(spec, scaled_size(scale), scale)
+    for layer in spec.get('layers', []):
+        draw_layer(canvas, layer)
+    with span('blur', slug=spec['slug']):
+        return depth_blur(canvas.img, canvas.dirty, BLUR_RADIUS * scale)
+
+
+def render_region(spec, box, scale=1):
+    """
+    Render only box (left, top, right, bottom) of the hero at scale: every
+    layer clipped to it, the depth blur and the text. The box's edges are
+    blurred against the background instead of their real neighbours, so
+    callers stitching regions together should render them with a margin
+    (see hero_tiles.py).
+    """
+    canvas = Canvas(spec, scaled_size(scale), scale, region=box)
+    for layer in spec.get('layers', []):
+        draw_layer(canvas, layer)
+    with span('blur', slug=spec['slug']):
+        canvas.img = depth_blur(canvas.img, canvas.dirty, BLUR_RADIUS * scale)
+    with span('text', slug=spec['slug']):
+        draw_text(canvas, spec.get('text', {}))
+    return canvas.img
+
+
+def render_hero(spec, background=None, scale=1):
+    """
+    Render a spec to an RGB PIL Image.
+
+    Args:
+        spec: Resolved spec (see load_spec)
+        background: Pre-rendered render_background(spec, scale) to draw the
+            text on, e.g. from hero_backgrounds.BackgroundCache. It is
+            modified in place.
+        scale: Output px per design px, e.g. 0.25 for a 480x270 draft.
+            Every length (offsets, radii, strokes, font sizes, the blur)
+            scales with it.
+    """
+    canvas = Canvas(spec, scaled_size(scale), scale)
+    canvas.img = background if background is not None else render_background(spec, scale)
+    canvas.draw = ImageDraw.Draw(canvas.img, 'RGBA')
+    with span('text', slug=spec['slug']):
+        draw_text(canvas, spec.get('text', {}))
+    return canvas.img
+
+
+def card_window(size):
+    """
+    (width, height) in design px that a card of this output size shows.
+
+    Wide cards crop the design frame top and bottom; cards between 1:1 and
+    16:9 keep its height and crop the sides; portrait cards keep a square's
+    width and extend above and below it.
+    """
+    width, height = size
+    aspect = width / height
+    if aspect >= WIDTH / HEIGHT:
+        return WIDTH, round(WIDTH / aspect)
+    if aspect >= 1:
+        return round(HEIGHT * aspect), HEIGHT
+    return HEIGHT, round(HEIGHT / aspect)
+
+
+def plate_size(sizes):
+    """Smallest plate (design frame centred in it) covering every card window"""
+    windows = [card_window(size) for size in sizes]
+    return (max([WIDTH] + [w for w, _ in windows]),
+            max([HEIGHT] + [h for _, h in windows]))
+
+
+def render_plate(spec, size):
+    """
+    Scene plate for social cards: every layer but FRAME_LAYERS, drawn in
+    design px around the design frame centred in a size canvas, then blurred
+    """
+    frame = ((size[0] - WIDTH) // 2, (size[1] - HEIGHT) // 2, WIDTH, HEIGHT)
+    canvas = Canvas(spec, size, frame=frame)
+    for layer in spec.get('layers', []):
+        if layer['type'] not in FRAME_LAYERS:
+            draw_layer(canvas, layer)
+    with span('blur', slug=spec['slug']):
+        return depth_blur(canvas.img, canvas.dirty)
+
+
+def render_card(spec, size, plate):
+    """
+    Render one social card of output size from a render_plate() plate:
+    crop the card's window, scale it to size, then draw the frame layers
+    and the text at that scale. The plate is left untouched.
+    """
+    window = card_window(size)
+    left = (plate.width - window[0]) // 2
+    top = (plate.height - window[1]) // 2
+    img = plate.crop((left, top, left + window[0], top + window[1]))
+    if img.size != tuple(size):
+        img = img.resize(size, Image.LANCZOS, reducing_gap=3.0)
+
+    canvas = Canvas(spec, size, scale=size[0] / window[0])
+    canvas.attach(img)
+    for layer in spec.get('layers', []):
+        if layer['type'] in FRAME_LAYERS:
+            draw_layer(canvas, layer)
+    with span('blur', slug=spec['slug']):
+        depth_blur(canvas.img, canvas.dirty, BLUR_RADIUS * canvas.scale)
+    with span('text', slug=spec['slug']):
+        draw_text(canvas, spec.get('text', {}))
+    return canvas.img
+
+
+def render_cards(spec, sizes=CARD_SIZES, plate=None):
+    """name -> card image for every entry of sizes, sharing one plate"""
+    if plate is None:
+        plate = render_plate(spec, plate_size(sizes.values()))
+    return {name: render_card(spec, size, plate) for name, size in sizes.items()}
+
+
+def render_to_file(spec, output_dir=OUTPUT_DIR):
+    """Render a spec and save it as <slug>-hero.png; returns the path"""
+    path = output_path(spec, output_dir)
+    render_hero(spec).save(path, 'PNG')
+    return path
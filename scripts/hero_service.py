@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Long-lived hero rendering service for the article pipeline.
+
+Started once per pipeline run, it loads Pillow and the fonts a single time and
+then answers one JSON request per line on stdin with one JSON response per
+line on stdout. The build cache, the background cache and an encode/write
+pipeline (hero_batch.Pipeline) stay alive across requests.
+
+A request is answered as soon as the hero PNG is on disk: the hero is drawn
+on its cached background and written with fast PNG compression (tens of
+milliseconds). The social cards, the optimized PNG and the placeholder
+entry follow on the pipeline's threads while the next request is read; the
+service waits for them before it exits.
+
+Request:
+    {"id": 1, "slug": "my-article", "locale": "zh", "title": "...",
+     "subtitle": "...", "label": "...", "category": "security",
+     "extends": "other-slug", "palette": {"accent": [59, 130, 246]}}
+
+Only "slug" and "title" are required. Without "extends" the spec extends the
+template spec for the category (see CATEGORY_TEMPLATES). Once it loads (the
+parent exists, the palette is valid) the spec is saved to
+data/hero-specs/<slug>.json, so later batch builds re-render the same image;
+an invalid request leaves nothing on disk.
+
+Response:
+    {"id": 1, "ok": true, "slug": "my-article", "files": [...], "pending": [...],
+     "cached": false, "ms": 48.2}
+    {"id": 1, "ok": false, "error": "..."}
+
+"files" are on disk when the response is sent; "pending" are still being
+written. A failure in the background is logged and leaves the build cache
+unrecorded, so the next hero_batch.py run renders the slug again.
+
+A {"ready": true} line is printed once the fonts are loaded. Log output goes
+to stderr. The service exits when stdin closes.
+
+Usage:
+    python3 scripts/hero_service.py [--specs DIR] [--out DIR]
+"""
+
+import argparse
+import io
+import json
+import os
+import sys
+import threading
+import time
+
+from hero_backgrounds import default_cache
+from hero_batch import Pipeline, _init_worker, card_stage
+from hero_cache import RenderCache, fingerprint, write_atomic, write_if_changed
+from hero_outputs import (
+    PLACEHOLDERS_PATH, check_encoders, load_placeholders, output_names, output_settings,
+    save_placeholders,
+)
+from hero_renderer import OUTPUT_DIR, SPEC_DIR, render_hero, resolve_spec
+
+# zlib level for the PNG written before replying; the pipeline replaces it
+# with the optimized encoding (same pixels) moments later
+REPLY_COMPRESS_LEVEL = 1
+
+# Category (as written by the article pipeline) -> spec whose art is reused
+CATEGORY_TEMPLATES = {
+    'security': 'web3-security-trends-2025',
+    'tutorial': 'smart-contract-audit-guide',
+    'analysis': 'defi-risk-management',
+    'defi': 'defi-risk-management',
+    'research': 'benign-arbitrage-theory',
+    'web3': 'benign-arbitrage-theory',
+    'blockchain': 'benign-arbitrage-theory',
+}
+DEFAULT_TEMPLATE = 'benign-arbitrage-theory'
+
+
+def build_spec(request):
+    """Spec dict for a request; the art comes from the parent spec"""
+    for key in ('slug', 'title'):
+        if not request.get(key):
+            raise ValueError(f"request is missing '{key}'")
+    parent = request.get('extends') or CATEGORY_TEMPLATES.get(
+        request.get('category'), DEFAULT_TEMPLATE)
+    spec = {
+        'slug': request['slug'],
+        'locale': request.get('locale', 'zh'),
+        'extends': parent,
+        'text': {
+            'title': request['title'],
+            'subtitle': request.get('subtitle', ''),
+            'label': request.get('label', ''),
+        },
+    }
+    if request.get('palette'):
+        spec['palette'] = request['palette']
+    return spec
+
+
+def save_spec(spec, spec_dir):
+    path = os.path.join(spec_dir, f"{spec['slug']}.json")
+    data = json.dumps(spec, ensure_ascii=False, indent=2) + '\n'
+    write_atomic(path, data.encode('utf-8'))
+    return path
+
+
+def _log(line):
+    print(line, file=sys.stderr, flush=True)
+
+
+class HeroService:
+    """
+    Renders requests in one warm process.
+
+    Args:
+        spec_dir: Where request specs are saved and loaded from
+        output_dir: Directory outputs are written to
+        placeholders_path: Blur placeholder / colour sidecar JSON
+    """
+
+    def __init__(self, spec_dir=SPEC_DIR, output_dir=OUTPUT_DIR,
+                 placeholders_path=PLACEHOLDERS_PATH):
+        self.spec_dir = spec_dir
+        self.output_dir = output_dir
+        self.placeholders_path = placeholders_path
+        check_encoders()
+        os.makedirs(output_dir, exist_ok=True)
+        self.cache = RenderCache(output_dir)
+        self.placeholders = load_placeholders(placeholders_path)
+        self.backgrounds = default_cache()
+        self.lock = threading.Lock()  # cache and placeholders, shared with the writer
+        self.in_flight = {}           # slug -> (digest, Event set once it's written)
+        self.pipeline = Pipeline(output_dir, self._written)
+
+    def handle(self, request):
+        """
+        Save the request's spec, write its hero PNG and return the response
+        dict plus the rendered (spec, image, digest) to pass to finish(), or
+        None when the outputs are already up to date
+        """
+        start = time.perf_counter()
+        request_spec = build_spec(request)
+        # Validated before it's saved: a spec that fails to load would
+        # otherwise break every later batch run
+        spec = resolve_spec(request_spec, self.spec_dir)
+        save_spec(request_spec, self.spec_dir)
+        slug = spec['slug']
+        filenames = output_names(slug)
+        digest = fingerprint(spec, output_settings())
+
+        # A previous request for this slug must land before this one's hero
+        previous = self.in_flight.get(slug)
+        if previous:
+            previous[1].wait()
+        with self.lock:
+            fresh = slug in self.placeholders and self.cache.is_fresh(filenames, digest)
+        response = {'slug': slug, 'cached': fresh}
+        if fresh:
+            rendered = None
+            response.update(files=[os.path.join(self.output_dir, name) for name in filenames],
+                            pending=[])
+        else:
+            img = render_hero(spec, self.backgrounds.background_for(spec))
+            buffer = io.BytesIO()
+            img.save(buffer, 'PNG', compress_level=REPLY_COMPRESS_LEVEL)
+            write_if_changed(os.path.join(self.output_dir, filenames[0]), buffer.getvalue())
+            rendered = (spec, img, digest, time.perf_counter() - start)
+            response.update(files=[os.path.join(self.output_dir, filenames[0])],
+                            pending=[os.path.join(self.output_dir, name) for name in filenames[1:]])
+        response['ms'] = round((time.perf_counter() - start) * 1000, 1)
+        return response, rendered
+
+    def finish(self, rendered):
+        """Render the cards for handle()'s hero and queue every output for writing"""
+        spec, img, digest, seconds = rendered
+        start = time.perf_counter()
+        cards = card_stage(spec, self.backgrounds)
+        self.in_flight[spec['slug']] = (digest, threading.Event())
+        self.pipeline.submit(spec, (img, cards), seconds + time.perf_counter() - start)
+
+    def _written(self, spec, result, error):
+        """Pipeline callback (writer thread): record a finished job"""
+        slug = spec['slug']
+        digest, done = self.in_flight.pop(slug)
+        try:
+            if error is not None:
+                _log(f"✗ {slug}: {type(error).__name__}: {error}")
+                return
+            _, seconds, written, entry, _ = result
+            with self.lock:
+                self.cache.record(output_names(slug), digest)
+                self.placeholders[slug] = entry
+                self.cache.save()
+                save_placeholders(self.placeholders_path, self.placeholders)
+            _log(f"✓ {slug} ({seconds:.2f}s, {written} files written)")
+        finally:
+            done.set()
+
+    def close(self):
+        """Wait for every queued output to be written"""
+        self.pipeline.close()
+
+
+def serve(stdin, stdout, spec_dir=SPEC_DIR, output_dir=OUTPUT_DIR,
+          placeholders_path=PLACEHOLDERS_PATH):
+    """Answer JSON-lines requests from stdin until it closes"""
+    def reply(message):
+        stdout.write(json.dumps(message, ensure_ascii=False) + '\n')
+        stdout.flush()
+
+    _init_worker()
+    service = HeroService(spec_dir, output_dir, placeholders_path)
+    reply({'ready': True})
+    try:
+        for line in stdin:
+            if not line.strip():
+                continue
+            request_id = None
+            try:
+                request = json.loads(line)
+                request_id = request.get('id')
+                response, rendered = service.handle(request)
+            except Exception as error:
+                reply({'id': request_id, 'ok': False, 'error': f'{type(error).__name__}: {error}'})
+                continue
+            reply({'id': request_id, 'ok': True, **response})
+            if rendered:
+                try:
+                    service.finish(rendered)
+                except Exception as error:
+                    _log(f"✗ {response['slug']}: {type(error).__name__}: {error}")
+    finally:
+        service.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Serve hero renders over stdin/stdout')
+    parser.add_argument('--specs', default=SPEC_DIR, help='Spec directory')
+    parser.add_argument('--out', default=OUTPUT_DIR, help='Output directory')
+    parser.add_argument('--placeholders', default=PLACEHOLDERS_PATH,
+                        help='Blur placeholder / colour sidecar JSON')
+    args = parser.parse_args(argv)
+    serve(sys.stdin, sys.stdout, args.specs, args.out, args.placeholders)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
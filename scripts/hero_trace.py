@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Opt-in tracing for hero rendering, written as Chrome trace-event JSON.
+
+The renderer wraps each layer, the depth blur, the text pass, every encode
+and every font load in span(). Spans only record when tracing is enabled
+(hero_batch.py --trace). When it is disabled, span() just returns a shared
+no-op context manager.
+
+Each process buffers its events and flush() appends them to
+<trace>.<pid>.part, so pool workers need no channel back to the parent.
+finish() merges the parts into one trace for chrome://tracing or
+https://ui.perfetto.dev, with one track per process/thread, and writes a
+flat per-span summary next to it. With memory=True, each span also records
+its tracemalloc allocation delta.
+"""
+
+import glob
+import json
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import nullcontext
+
+_NOOP = nullcontext()
+
+_path = None
+_memory = False
+_events = []
+
+
+def enable(path, memory=False, clean=False):
+    """
+    Start recording spans in this process (call in every worker too).
+
+    Args:
+        path: Trace JSON to write in finish()
+        memory: Also record tracemalloc allocation deltas (slower)
+        clean: Remove part files left by an interrupted earlier run; only
+            the parent should pass this
+    """
+    global _path, _memory
+    if clean:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        for part in glob.glob(f'{glob.escape(path)}.*.part'):
+            os.remove(part)
+    _path = path
+    _memory = memory
+    if memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+
+
+def enabled():
+    return _path is not None
+
+
+class _Span:
+    __slots__ = ('name', 'cat', 'args', 'start', 'memory')
+
+    def __init__(self, name, cat, args):
+        self.name = name
+        self.cat = cat
+        self.args = args
+
+    def __enter__(self):
+        if _memory:
+            self.memory = tracemalloc.get_traced_memory()[0]
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        end = time.perf_counter_ns()
+        if _memory:
+            self.args['alloc_kb'] = round((tracemalloc.get_traced_memory()[0] - self.memory) / 1024, 1)
+        _events.append({
+            'name': self.name,
+            'cat': self.cat,
+            'ph': 'X',
+            'ts': self.start / 1000,
+            'dur': (end - self.start) / 1000,
+            'pid': os.getpid(),
+            'tid': threading.get_ident(),
+            'args': self.args,
+        })
+
+
+def span(name, cat='render', **args):
+    """
+    Context manager timing a block as a complete ("X") trace event.
+
+    Args:
+        name: Event name, e.g. 'layer:orbs'; the summary groups by it
+        cat: Trace category
+        **args: Extra details shown in the trace viewer (slug, size, ...)
+    """
+    if _path is None:
+        return _NOOP
+    return _Span(name, cat, args)
+
+
+def flush():
+    """Append this process's buffered events to its part file"""
+    if _path is None or not _events:
+        return
+    with open(f'{_path}.{os.getpid()}.part', 'a', encoding='utf-8') as f:
+        for event in _events:
+            f.write(json.dumps(event, ensure_ascii=False) + '\n')
+    _events.clear()
+
+
+def summarize(events):
+    """name -> {count, total_ms, mean_ms, max_ms[, alloc_kb]}, slowest first"""
+    rows = {}
+    for event in events:
+        row = rows.setdefault(event['name'], {'count': 0, 'total_ms': 0.0, 'max_ms': 0.0})
+        ms = event['dur'] / 1000
+        row['count'] += 1
+        row['total_ms'] += ms
+        row['max_ms'] = max(row['max_ms'], ms)
+        if 'alloc_kb' in event['args']:
+            row['alloc_kb'] = row.get('alloc_kb', 0) + event['args']['alloc_kb']
+    for row in rows.values():
+        row['mean_ms'] = row['total_ms'] / row['count']
+        for key in ('total_ms', 'max_ms', 'mean_ms'):
+            row[key] = round(row[key], 3)
+        if 'alloc_kb' in row:
+            row['alloc_kb'] = round(row['alloc_kb'], 1)
+    return dict(sorted(rows.items(), key=lambda item: -item[1]['total_ms']))
+
+
+def finish():
+    """
+    Merge every process's part file into the trace and write the summary.
+
+    Returns (trace path, summary path, summary), or None if tracing is off.
+    """
+    if _path is None:
+        return None
+    flush()
+    events = []
+    for part in sorted(glob.glob(f'{glob.escape(_path)}.*.part')):
+        with open(part, encoding='utf-8') as f:
+            events.extend(json.loads(line) for line in f if line.strip())
+        os.remove(part)
+
+    origin = min((event['ts'] for event in events), default=0)
+    for event in events:
+        event['ts'] -= origin
+    names = [
+        {'name': 'process_name', 'ph': 'M', 'pid': pid, 'args': {'name': f'hero worker {pid}'}}
+        for pid in sorted({event['pid'] for event in events})
+    ]
+    with open(_path, 'w', encoding='utf-8') as f:
+        json.dump({'traceEvents': names + events, 'displayTimeUnit': 'ms'}, f, ensure_ascii=False)
+
+    summary = summarize(events)
+    summary_path = os.path.splitext(_path)[0] + '.summary.json'
+    with open(summary_path, 'w', encoding='utf-8') as f:
+        json.dump(summary, f, ensure_ascii=False, indent=2)
+        f.write('\n')
+    return _path, summary_path, summary
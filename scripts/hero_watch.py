@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+Watch hero specs and re-render a preview each time one is saved.
+
+One warm process keeps the fonts, the glyph atlas and rendered backgrounds
+loaded, and polls data/hero-specs for changes. Saving a spec re-renders that
+slug, plus any spec that extends it, to .cache/hero-previews/<slug>.jpg.
+
+Only what an edit touched is redrawn:
+
+- text-only edits draw on the spec's last background, skipping the orbs,
+  motifs and depth blur;
+- layer edits restart from a snapshot of the canvas taken before the first
+  changed layer, so the layers above an edited one are the only ones drawn
+  again (the blur then runs over every layer's dirty regions, as usual);
+- palette or background edits redraw everything.
+
+Each preview also runs the dry-run text checks (see hero_lint.py), so
+overflowing or shrunk text is reported as you type. Previews are JPEGs
+without chroma subsampling: close enough to judge text and colour, and
+several times faster to encode than a PNG. They aren't published files; run
+hero_batch.py for those.
+
+Usage:
+    python3 scripts/hero_watch.py                    # watch every spec
+    python3 scripts/hero_watch.py my-article         # watch one, render it now
+    python3 scripts/hero_watch.py my-article --cards # social cards too
+"""
+
+import argparse
+import io
+import json
+import os
+import sys
+import time
+from collections import OrderedDict
+
+from draw_text_mixed_fonts import default_atlas
+from hero_backgrounds import background_key, default_cache
+from hero_batch import GLYPH_ATLAS_PATH, _init_worker
+from hero_cache import write_atomic
+from hero_lint import check_text
+from hero_renderer import (
+    CARD_SIZES, RENDERER_VERSION, REPO_ROOT, SPEC_DIR, Canvas, depth_blur, draw_layer,
+    list_specs, load_spec, plate_size, render_cards, render_hero,
+)
+from hero_trace import span
+
+PREVIEW_DIR = os.path.join(REPO_ROOT, '.cache', 'hero-previews')
+POLL_INTERVAL = 0.05      # seconds between scans of the spec directory
+PREVIEW_QUALITY = 90
+# Specs whose layer snapshots stay in memory (~6 MB per layer each)
+SNAPSHOT_SPECS = 2
+
+
+class LayerSnapshots:
+    """
+    Pre-blur canvas after each layer of one spec's background, so an edit
+    to layer i only redraws layers i and up.
+
+    Args:
+        cache: BackgroundCache consulted before the first full render
+    """
+
+    def __init__(self, cache=None):
+        self.cache = cache
+        self.base = None        # background and palette the snapshots were drawn with
+        self.layers = []        # layers drawn so far
+        self.snapshots = []     # (img, dirty) after 0..len(layers) layers
+        self.background = None  # blurred background of self.layers
+
+    def _base(self, spec):
+        return json.dumps({
+            'background': spec.get('background'),
+            'palette': spec.get('palette'),
+            'renderer': RENDERER_VERSION,
+        }, sort_keys=True)
+
+    def render(self, spec):
+        """
+        Background for spec (caller owns it) and how many layers were drawn
+        to get it
+        """
+        base = self._base(spec)
+        layers = spec.get('layers', [])
+        if base == self.base and layers == self.layers and self.background is not None:
+            return self.background.copy(), 0
+
+        if base != self.base:
+            self.base, self.layers, self.snapshots = base, [], []
+            # A fresh spec starts from the background cache when it can; the
+            # snapshots are only built once a layer is actually edited
+            cached = self.cache.get(background_key(spec)) if self.cache else None
+            if cached is not None:
+                self.layers, self.background = list(layers), cached
+                return cached.copy(), 0
+
+        start = 0
+        while (start < len(self.snapshots) - 1 and start < len(layers)
+               and layers[start] == self.layers[start]):
+            start += 1
+
+        canvas = Canvas(spec)
+        if start:
+            img, dirty = self.snapshots[start]
+            canvas.attach(img.copy())
+            canvas.dirty.extend(dirty)
+        # Keep the snapshot just resumed from: snapshots[i] is the canvas after i layers
+        self.snapshots = self.snapshots[:start + 1] if start else [(canvas.img.copy(), [])]
+        for layer in layers[start:]:
+            draw_layer(canvas, layer)
+            self.snapshots.append((canvas.img.copy(), list(canvas.dirty)))
+        self.layers = list(layers)
+        with span('blur', slug=spec['slug']):
+            self.background = depth_blur(canvas.img, canvas.dirty)
+        return self.background.copy(), len(layers) - start
+
+
+class Watcher:
+    """
+    Polls a spec directory and renders previews of changed specs.
+
+    Args:
+        spec_dir: Directory of <slug>.json specs
+        preview_dir: Where previews are written
+        slugs: Specs to watch (default: all)
+        cards: Also write social-card previews
+        report: Called with one line per event
+    """
+
+    def __init__(self, spec_dir=SPEC_DIR, preview_dir=PREVIEW_DIR, slugs=None, cards=False,
+                 report=print):
+        self.spec_dir = spec_dir
+        self.preview_dir = preview_dir
+        self.slugs = set(slugs) if slugs else None
+        self.cards = cards
+        self.report = report
+        self.mtimes = {}
+        self.parents = {}
+        self.snapshots = OrderedDict()
+        self.cache = default_cache()
+
+    def scan(self):
+        """Slugs whose spec file was added or modified since the last scan"""
+        mtimes = {}
+        for entry in os.scandir(self.spec_dir):
+            if entry.name.endswith('.json'):
+                try:
+                    mtimes[entry.name[:-len('.json')]] = entry.stat().st_mtime_ns
+                except FileNotFoundError:
+                    continue  # replaced mid-scan; picked up next time
+        changed = {slug for slug, mtime in mtimes.items() if self.mtimes.get(slug) != mtime}
+        for slug in changed:
+            self.parents[slug] = self._parent(slug)
+        for slug in set(self.mtimes) - set(mtimes):
+            self.parents.pop(slug, None)
+            self.snapshots.pop(slug, None)
+        self.mtimes = mtimes
+        return changed
+
+    def _parent(self, slug):
+        try:
+            with open(os.path.join(self.spec_dir, f'{slug}.json'), encoding='utf-8') as f:
+                return json.load(f).get('extends')
+        except (OSError, ValueError):
+            return None  # half-saved; reported when it's rendered
+
+    def affected(self, changed):
+        """Watched slugs in changed plus every spec extending one of them"""
+        affected = set()
+        for slug in self.parents:
+            seen = set()
+            node = slug
+            while node is not None and node not in seen:
+                if node in changed:
+                    affected.add(slug)
+                    break
+                seen.add(node)
+                node = self.parents.get(node)
+        if self.slugs is not None:
+            affected &= self.slugs
+        return sorted(affected)
+
+    def _snapshots_for(self, slug):
+        if slug in self.snapshots:
+            self.snapshots.move_to_end(slug)
+        else:
+            self.snapshots[slug] = LayerSnapshots(self.cache)
+            while len(self.snapshots) > SNAPSHOT_SPECS:
+                self.snapshots.popitem(last=False)
+        return self.snapshots[slug]
+
+    def _write(self, img, name):
+        buffer = io.BytesIO()
+        img.save(buffer, 'JPEG', quality=PREVIEW_QUALITY, subsampling=0)
+        path = os.path.join(self.preview_dir, name)
+        write_atomic(path, buffer.getvalue())
+        return path
+
+    def render(self, slug):
+        """Render slug's preview(s), reporting the result and any text issues"""
+        start = time.perf_counter()
+        try:
+            spec = load_spec(slug, self.spec_dir)
+            with span('watch:render', cat='job', slug=slug):
+                background, drawn = self._snapshots_for(slug).render(spec)
+                img = render_hero(spec, background)
+                cards = {}
+                if self.cards:
+                    plate = self.cache.plate_for(spec, plate_size(CARD_SIZES.values()))
+                    cards = render_cards(spec, CARD_SIZES, plate)
+            rendered = time.perf_counter() - start
+            os.makedirs(self.preview_dir, exist_ok=True)
+            path = self._write(img, f'{slug}.jpg')
+            for card, card_img in cards.items():
+                self._write(card_img, f'{slug}-{card}.jpg')
+        except Exception as error:
+            self.report(f"✗ {slug}: {type(error).__name__}: {error}")
+            return False
+
+        total = time.perf_counter() - start
+        layers = f"{drawn} layer{'s' if drawn != 1 else ''}" if drawn else 'text only'
+        self.report(f"✓ {slug}: {layers}, rendered in {rendered * 1000:.0f} ms, "
+                    f"{total * 1000:.0f} ms total -> {path}")
+        for issue in check_text(spec):
+            mark = '✗' if issue['severity'] == 'error' else '!'
+            self.report(f"  {mark} [{issue['check']}] {issue['message']}")
+        atlas = default_atlas()
+        if atlas.added:
+            atlas.save(GLYPH_ATLAS_PATH)
+        return True
+
+    def poll(self):
+        """Render every spec affected by changes since the last poll"""
+        for slug in self.affected(self.scan()):
+            self.render(slug)
+
+    def run(self, interval=POLL_INTERVAL):
+        """Poll until interrupted"""
+        self.scan()
+        if self.slugs:
+            for slug in sorted(self.slugs):
+                self.render(slug)
+        self.report(f"Watching {self.spec_dir} (Ctrl-C to stop)")
+        try:
+            while True:
+                time.sleep(interval)
+                self.poll()
+        except KeyboardInterrupt:
+            pass
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Re-render hero previews as specs are saved')
+    parser.add_argument('slugs', nargs='*', help='Specs to watch (default: all)')
+    parser.add_argument('--specs', default=SPEC_DIR, help='Spec directory')
+    parser.add_argument('--out', default=PREVIEW_DIR, help='Preview directory')
+    parser.add_argument('--cards', action='store_true', help='Also preview the social cards')
+    parser.add_argument('--interval', type=float, default=POLL_INTERVAL,
+                        help='Seconds between scans of the spec directory')
+    args = parser.parse_args(argv)
+
+    known = set(list_specs(args.specs))
+    for slug in args.slugs:
+        if slug not in known:
+            print(f"✗ no spec named {slug} in {args.specs}")
+            return 1
+    _init_worker()
+    Watcher(args.specs, args.out, args.slugs, args.cards).run(args.interval)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())